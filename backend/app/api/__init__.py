@@ -0,0 +1,24 @@
+"""
+API routers, registered explicitly
+
+Each entry is the module that defines a `router`; modules are imported
+only when include_routers runs, so importing app.api stays cheap and a
+subset of routes can be mounted (benchmarks, tools) without the rest.
+"""
+from importlib import import_module
+from typing import Iterable
+from fastapi import FastAPI
+
+ROUTER_MODULES = (
+    "app.api.attendance",
+    "app.api.employees",
+    "app.api.events",
+    "app.api.jobs",
+    "app.api.system",
+)
+
+
+def include_routers(app: FastAPI, modules: Iterable[str] = ROUTER_MODULES) -> None:
+    """Import each router module and mount its router on the app"""
+    for module_name in modules:
+        app.include_router(import_module(module_name).router)
@@ -1,11 +1,31 @@
-from fastapi import APIRouter, Depends, status
+from datetime import date
+from typing import Literal
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
-from app.schemas.attendance import Attendance, AttendanceCreate
-from app.services.attendance_service import AttendanceService
+from app.core.replicas import get_read_db, read_session_factory
+from app.schemas.attendance import (
+    Attendance,
+    AttendanceCreate,
+    AttendancePage,
+    AttendanceWithEmployee,
+    AttendanceWithEmployeePage,
+    AttendanceBulkCreate,
+    AttendanceBulkResult,
+)
+from app.schemas.report import AttendanceCalendar, AttendanceSummary
+from app.services.attendance_service import AttendanceService, EXPORT_COLUMNS
+from app.services.report_service import ReportService
+from app.utils.export import ExportFormat, export_response
+from app.utils.etag import is_not_modified, make_etag, not_modified, set_validators
+from app.utils.fast_json import json_response
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/attendance", tags=["Attendance"])
 
+EmbedOption = Literal["employee"] | None
+EMBED_DESCRIPTION = "Include each record's employee summary, joined in the same query"
+
 
 @router.post("/", response_model=Attendance, status_code=status.HTTP_201_CREATED)
 async def mark_attendance(record: AttendanceCreate, db: AsyncSession = Depends(get_db)):
@@ -13,19 +33,124 @@ async def mark_attendance(record: AttendanceCreate, db: AsyncSession = Depends(g
     return await AttendanceService.mark_attendance(db, record)
 
 
-@router.get("/", response_model=list[Attendance])
-async def get_all_attendance(db: AsyncSession = Depends(get_db)):
-    """Get all attendance records"""
-    return await AttendanceService.get_all_attendance(db)
+@router.post("/bulk", response_model=AttendanceBulkResult)
+async def bulk_mark_attendance(payload: AttendanceBulkCreate, db: AsyncSession = Depends(get_db)):
+    """Mark attendance for many employees in one request"""
+    return await AttendanceService.bulk_mark_attendance(db, payload)
+
+
+@router.get("/", response_model=AttendancePage | AttendanceWithEmployeePage)
+async def get_all_attendance(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    employee_id: int | None = None,
+    status: Literal["Present", "Absent"] | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    department: str | None = None,
+    embed: EmbedOption = Query(None, description=EMBED_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get a page of attendance records, optionally filtered"""
+    filters = dict(
+        employee_id=employee_id,
+        status=status,
+        date_from=date_from,
+        date_to=date_to,
+        department=department,
+    )
+    embed_employee = embed == "employee"
+    version = await AttendanceService.get_collection_version(db, embed_employee or department is not None)
+    etag = make_etag("attendance", version, request.url.query)
+    if is_not_modified(request.headers, etag):
+        return not_modified(etag)
+    response = json_response(
+        await AttendanceService.get_all_attendance(db, limit, after, embed_employee, **filters)
+    )
+    set_validators(response.headers, etag)
+    return response
+
+
+@router.get("/summary", response_model=AttendanceSummary)
+async def get_attendance_summary(
+    month: str = Query(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Month as YYYY-MM"),
+    group_by: Literal["employee", "department"] = "department",
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get present/absent counts and attendance rates for a month"""
+    year, month_number = (int(part) for part in month.split("-"))
+    return await ReportService.get_summary(db, date(year, month_number, 1), group_by)
+
 
+@router.get("/export")
+async def export_attendance(
+    request: Request,
+    format: ExportFormat = "csv",
+    employee_id: int | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    department: str | None = None,
+):
+    """Stream attendance records as CSV or NDJSON"""
+    sessions = read_session_factory(request)
 
-@router.get("/{employee_id}", response_model=list[Attendance])
-async def get_attendance(employee_id: int, db: AsyncSession = Depends(get_db)):
+    async def rows():
+        # The request-scoped session is closed before the body streams,
+        # so the export owns its session for the life of the response
+        async with sessions() as db:
+            async for row in AttendanceService.stream_attendance(
+                db,
+                employee_id=employee_id,
+                date_from=date_from,
+                date_to=date_to,
+                department=department,
+            ):
+                yield row
+
+    return export_response(rows(), EXPORT_COLUMNS, format, "attendance")
+
+
+@router.get("/{employee_id}", response_model=list[Attendance] | list[AttendanceWithEmployee])
+async def get_attendance(
+    employee_id: int,
+    request: Request,
+    embed: EmbedOption = Query(None, description=EMBED_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
+):
     """Get all attendance records for a specific employee"""
-    return await AttendanceService.get_attendance(db, employee_id)
+    embed_employee = embed == "employee"
+    count, last_modified = await AttendanceService.get_attendance_version(db, employee_id, embed_employee)
+    etag = make_etag("attendance", employee_id, count, last_modified, request.url.query)
+    if is_not_modified(request.headers, etag):
+        return not_modified(etag)
+    response = json_response(await AttendanceService.get_attendance(db, employee_id, embed_employee))
+    set_validators(response.headers, etag)
+    return response
+
+
+@router.get("/{employee_id}/calendar", response_model=AttendanceCalendar)
+async def get_attendance_calendar(
+    employee_id: int,
+    year: int = Query(..., ge=1900, le=9998),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get a year of attendance for an employee as compact per-month day bitsets"""
+    return await ReportService.get_calendar(db, employee_id, year)
 
 
 @router.get("/{employee_id}/{date}", response_model=Attendance)
-async def get_attendance_by_date(employee_id: int, date: str, db: AsyncSession = Depends(get_db)):
+async def get_attendance_by_date(
+    employee_id: int,
+    date: date,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+):
     """Get attendance record for a specific employee on a specific date"""
-    return await AttendanceService.get_attendance_by_date(db, employee_id, date)
+    record = await AttendanceService.get_attendance_by_date(db, employee_id, date)
+    etag = make_etag("attendance", record.id, record.updated_at)
+    if is_not_modified(request.headers, etag, record.updated_at):
+        return not_modified(etag, record.updated_at)
+    set_validators(response.headers, etag, record.updated_at)
+    return record
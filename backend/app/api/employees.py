@@ -1,8 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
-from app.schemas.employee import Employee, EmployeeCreate
-from app.services.employee_service import EmployeeService
+from app.core.replicas import get_read_db, read_session_factory
+from app.schemas.employee import (
+    Employee,
+    EmployeeBatch,
+    EmployeeBatchRequest,
+    EmployeeCreate,
+    EmployeePage,
+    EmployeeSearchPage,
+)
+from app.services.employee_service import EmployeeService, EXPORT_COLUMNS
+from app.utils.export import ExportFormat, export_response
+from app.utils.etag import is_not_modified, make_etag, not_modified, set_validators
+from app.utils.fast_json import json_response
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/employees", tags=["Employees"])
 
@@ -13,16 +25,65 @@ async def create_employee(employee: EmployeeCreate, db: AsyncSession = Depends(g
     return await EmployeeService.create_employee(db, employee)
 
 
-@router.get("/", response_model=list[Employee])
-async def list_employees(db: AsyncSession = Depends(get_db)):
-    """Get all employees"""
-    return await EmployeeService.get_employees(db)
+@router.get("/", response_model=EmployeePage)
+async def list_employees(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    department: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get a page of employees"""
+    version = await EmployeeService.get_collection_version(db)
+    etag = make_etag("employees", version, request.url.query)
+    if is_not_modified(request.headers, etag):
+        return not_modified(etag)
+    response = json_response(await EmployeeService.get_employees(db, limit, after, department))
+    set_validators(response.headers, etag)
+    return response
+
+
+@router.post("/batch", response_model=EmployeeBatch)
+async def get_employees_batch(payload: EmployeeBatchRequest, db: AsyncSession = Depends(get_read_db)):
+    """Get many employees by ID in one request"""
+    return json_response(await EmployeeService.get_employees_by_ids(db, payload.ids))
+
+
+@router.get("/export")
+async def export_employees(request: Request, format: ExportFormat = "csv", department: str | None = None):
+    """Stream employees as CSV or NDJSON"""
+    sessions = read_session_factory(request)
+
+    async def rows():
+        # The request-scoped session is closed before the body streams,
+        # so the export owns its session for the life of the response
+        async with sessions() as db:
+            async for row in EmployeeService.stream_employees(db, department):
+                yield row
+
+    return export_response(rows(), EXPORT_COLUMNS, format, "employees")
+
+
+@router.get("/search", response_model=EmployeeSearchPage)
+async def search_employees(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix or approximate word of a name, email or department"),
+    limit: int = Query(20, ge=1, le=100),
+    after: str | None = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Search employees, best matches first"""
+    return json_response(await EmployeeService.search_employees(db, q, limit, after))
 
 
 @router.get("/{id}", response_model=Employee)
-async def get_employee(id: int, db: AsyncSession = Depends(get_db)):
+async def get_employee(id: int, request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
     """Get a specific employee by ID"""
-    return await EmployeeService.get_employee(db, id)
+    employee, last_modified = await EmployeeService.get_employee(db, id)
+    etag = make_etag("employee", id, last_modified)
+    if is_not_modified(request.headers, etag, last_modified):
+        return not_modified(etag, last_modified)
+    set_validators(response.headers, etag, last_modified)
+    return employee
 
 
 @router.put("/{id}", response_model=Employee)
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from starlette.responses import StreamingResponse
+from app.core.config import settings
+from app.core.events import TOPICS, broadcaster
+
+router = APIRouter(tags=["Events"])
+
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    topics: str | None = Query(None, description="Comma-separated topics to receive: employee, attendance"),
+    last_event_id: str | None = Query(
+        None, description="Resume after this event id; browser reconnects send Last-Event-ID instead"
+    ),
+):
+    """Stream employee and attendance changes as server-sent events"""
+    wanted = frozenset(topic.strip() for topic in (topics or "").split(",") if topic.strip())
+    unknown = wanted - TOPICS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown topics: {', '.join(sorted(unknown))}"
+        )
+    return StreamingResponse(
+        broadcaster.stream(
+            wanted,
+            request.headers.get("last-event-id") or last_event_id,
+            settings.EVENTS_HEARTBEAT_SECONDS,
+        ),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
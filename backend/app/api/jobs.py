@@ -0,0 +1,72 @@
+from dataclasses import asdict
+from fastapi import APIRouter, Body, HTTPException, Path, Request, Response, status
+from starlette.responses import FileResponse
+from app.core.jobs import Job, JobQueueFull, jobs
+from app.core.replicas import wrote_recently
+from app.schemas.job import JobCreate, JobStatus
+from app.services import job_service  # noqa: F401  registers the job types
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+JOB_ID = Path(..., pattern=r"^[0-9a-f]{32}$")
+
+# Seconds a client is asked to wait when the queue is full
+QUEUE_FULL_RETRY_AFTER = 30
+
+
+def _job_status(job: Job) -> JobStatus:
+    result_url = f"/jobs/{job.id}/result" if job.state == "succeeded" else None
+    return JobStatus.model_validate({**asdict(job), "result_url": result_url})
+
+
+def _get_job(job_id: str) -> Job:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+@router.post("/", response_model=JobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(request: Request, response: Response, payload: JobCreate = Body(...)):
+    """Queue a report or export; poll its status and download the result when it succeeds"""
+    try:
+        job = jobs.submit(
+            payload.type,
+            payload.model_dump(mode="json", exclude={"type"}),
+            read_primary=wrote_recently(request),
+        )
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many jobs are waiting; try again later",
+            headers={"Retry-After": str(QUEUE_FULL_RETRY_AFTER)},
+        )
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return _job_status(job)
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str = JOB_ID):
+    """Get a job's state, and its result URL once it has succeeded"""
+    return _job_status(_get_job(job_id))
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str = JOB_ID):
+    """Download a finished job's result file"""
+    job = _get_job(job_id)
+    if job.state != "succeeded":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job has not succeeded (state: {job.state})"
+        )
+    path = jobs.result_path(job)
+    if not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job result has expired"
+        )
+    return FileResponse(path, media_type=job.media_type, filename=job.filename)
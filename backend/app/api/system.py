@@ -1,8 +1,18 @@
 """
 System endpoints for health checks and logging
 """
-from fastapi import APIRouter, Request, Body
+import secrets
+from fastapi import APIRouter, HTTPException, Request, Response, Body, status
+from prometheus_client import CONTENT_TYPE_LATEST
+from starlette.responses import FileResponse
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.db import pool_stats
 from app.core.logging import app_logger
+from app.core.metrics import render_metrics
+from app.core.profiling import profiles
+from app.schemas.log import LogIngestionResult
+from app.services.log_service import LogIngestionService
 from typing import Any
 
 router = APIRouter(tags=["System"])
@@ -15,24 +25,100 @@ async def health_check():
     return {"status": "ok"}
 
 
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics, across all workers when running under gunicorn"""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+@router.get("/api/db/pool")
+async def db_pool_stats():
+    """Connection pool utilization for this worker"""
+    return pool_stats()
+
+
+@router.get("/api/cache/stats")
+async def cache_stats():
+    """Cache hit/miss counters for this worker"""
+    return cache.stats()
+
+
+def _check_profile_token(request: Request) -> None:
+    # Profiles show code paths and SQL, so reading them always needs the
+    # token; sampling alone stores profiles but leaves them unreadable here
+    if not settings.PROFILE_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Reading profiles requires PROFILE_TOKEN to be configured"
+        )
+    if not secrets.compare_digest(request.headers.get("x-profile", "").encode(), settings.PROFILE_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="X-Profile token required"
+        )
+
+
+@router.get("/api/profiles")
+async def list_profiles(request: Request):
+    """Summaries of stored request profiles, newest first"""
+    _check_profile_token(request)
+    return profiles.summaries()
+
+
+@router.get("/api/profiles/{correlation_id}")
+async def get_profile(correlation_id: str, request: Request):
+    """A stored profile: top functions by self time and every SQL statement"""
+    _check_profile_token(request)
+    record = profiles.get(correlation_id)
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return record
+
+
+@router.get("/api/profiles/{correlation_id}/pstats")
+async def download_profile(correlation_id: str, request: Request):
+    """Download the full cProfile data for pstats or snakeviz"""
+    _check_profile_token(request)
+    path = profiles.pstats_path(correlation_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{correlation_id}.prof")
+
+
+def _client_key(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
 @router.post("/api/logs")
-async def receive_frontend_logs(log_entry: dict = Body(...)):
+async def receive_frontend_logs(request: Request, log_entry: dict = Body(...)):
     """Receive logs from frontend for centralized aggregation"""
     try:
-        # Forward frontend logs to backend logger
-        level = log_entry.get("level", "info").lower()
-        message = log_entry.get("message", "Frontend log")
-        
-        if level == "error":
-            app_logger.error(f"[Frontend] {message}", extra=log_entry)
-        elif level == "warn":
-            app_logger.warning(f"[Frontend] {message}", extra=log_entry)
-        elif level == "debug":
-            app_logger.debug(f"[Frontend] {message}", extra=log_entry)
-        else:
-            app_logger.info(f"[Frontend] {message}", extra=log_entry)
-            
+        # Strict validation applies to /api/logs/batch only; this endpoint
+        # keeps accepting the loosely shaped entries it always has
+        result = LogIngestionService.ingest(_client_key(request), [LogIngestionService.lenient_entry(log_entry)])
+        if result.invalid:
+            return {"success": False, "error": "Invalid log entry"}
         return {"success": True}
+    except HTTPException:
+        raise
     except Exception as e:
         app_logger.error(f"Failed to process frontend log: {str(e)}")
         return {"success": False, "error": str(e)}
+
+
+@router.post("/api/logs/batch", response_model=LogIngestionResult)
+async def receive_frontend_log_batch(request: Request):
+    """Receive a batch of frontend logs as a JSON array or NDJSON, optionally gzip-compressed"""
+    body = await request.body()
+    entries = LogIngestionService.decode_batch(
+        body,
+        request.headers.get("content-type", ""),
+        request.headers.get("content-encoding", ""),
+    )
+    return LogIngestionService.ingest(_client_key(request), entries)
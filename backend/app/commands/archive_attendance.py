@@ -0,0 +1,87 @@
+"""
+Archive attendance partitions older than the retention window
+
+Partitions whose whole month falls before the first day of the month
+`--retention-months` ago are optionally exported to CSV, then detached
+from the attendance table. Detached partitions remain as standalone
+tables unless --drop is given. Monthly rollups are kept, so summaries for
+archived months stay available.
+
+Usage (from backend/):
+    python -m app.commands.archive_attendance --retention-months 24 --export-dir /backups --drop
+    python -m app.commands.archive_attendance --dry-run
+"""
+import argparse
+import asyncio
+import csv
+import os
+from datetime import date
+from sqlalchemy import text
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.db import engine
+from app.core.partitions import add_months, is_partitioned, list_partitions
+from app.services.attendance_service import ATTENDANCE_VERSION, EXPORT_COLUMNS, EXPORT_YIELD_PER
+
+
+async def export_partition(name: str, export_dir: str) -> str:
+    """Write every row of a partition to <export_dir>/<name>.csv"""
+    path = os.path.join(export_dir, f"{name}.csv")
+    async with engine.connect() as conn:
+        result = await conn.stream(
+            text(f"SELECT {', '.join(EXPORT_COLUMNS)} FROM {name} ORDER BY date, id")
+            .execution_options(yield_per=EXPORT_YIELD_PER)
+        )
+        with open(path, "w", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(EXPORT_COLUMNS)
+            async for partition in result.partitions():
+                writer.writerows(partition)
+    return path
+
+
+async def archive(retention_months: int, export_dir: str | None, drop: bool, dry_run: bool) -> list[str]:
+    cutoff = add_months(date.today().replace(day=1), -retention_months)
+    async with engine.connect() as conn:
+        if not await is_partitioned(conn):
+            print("attendance is not a partitioned table; nothing to archive")
+            return []
+        expired = [name for name, _, upper in await list_partitions(conn) if upper <= cutoff]
+
+    print(f"Cutoff {cutoff.isoformat()}: {len(expired)} partition(s) to archive")
+    for name in expired:
+        if dry_run:
+            print(f"  would archive {name}")
+            continue
+        if export_dir:
+            print(f"  exported {name} to {await export_partition(name, export_dir)}")
+        async with engine.begin() as conn:
+            await conn.execute(text(f"ALTER TABLE attendance DETACH PARTITION {name}"))
+            if drop:
+                await conn.execute(text(f"DROP TABLE {name}"))
+        print(f"  {'dropped' if drop else 'detached'} {name}")
+    if expired and not dry_run:
+        # Reaches running workers through a shared (Redis) cache; local
+        # caches pick up the change when their version entry expires
+        await cache.bump_version(ATTENDANCE_VERSION)
+    await engine.dispose()
+    return expired
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive old attendance partitions")
+    parser.add_argument("--retention-months", type=int, default=settings.ATTENDANCE_RETENTION_MONTHS)
+    parser.add_argument("--export-dir", help="Export each partition to CSV here before detaching it")
+    parser.add_argument("--drop", action="store_true", help="Drop partitions after detaching them")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the partitions that would be archived")
+    args = parser.parse_args()
+
+    if args.drop and not args.export_dir and not args.dry_run:
+        parser.error("--drop without --export-dir would discard data; pass --export-dir")
+    if args.export_dir:
+        os.makedirs(args.export_dir, exist_ok=True)
+    asyncio.run(archive(args.retention_months, args.export_dir, args.drop, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Admission control for database-bound requests
+
+Requests are classified by method and path into route classes. Each
+class has a concurrency limit under a shared limit sized to the
+connection pool, so a burst of full-table lists or exports cannot take
+every connection. A request over its limit waits in its class's bounded
+queue; when a slot frees, waiting classes are served in priority order
+(light before write before heavy), so single-record reads keep flowing
+while heavy requests back up. A full queue or a wait longer than
+ADMISSION_QUEUE_TIMEOUT ends in 503 with Retry-After, as does a pool
+checkout that times out anyway, instead of requests piling up behind the
+pool until every client times out.
+
+Health, metrics, the event stream and diagnostics are exempt: they hold no
+connection, or are needed most while the service is overloaded.
+"""
+import asyncio
+import math
+import re
+import time
+from collections import Counter, deque
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.config import settings
+from app.core.logging import api_logger
+from app.core.metrics import ADMISSION_REJECTIONS, ADMISSION_WAIT, register_stats
+
+EXEMPT = "exempt"
+LIGHT = "light"  # single-record reads and cheap endpoints
+WRITE = "write"
+HEAVY = "heavy"  # lists, search, exports, batch lookups
+
+# Waiting classes are admitted in this order
+PRIORITY = (LIGHT, WRITE, HEAVY)
+
+# First match wins; other GET and HEAD requests are heavy, other methods writes
+ROUTE_CLASSES = [
+    (EXEMPT, {"GET", "HEAD"}, r"/health|/metrics|/events|/api/db/pool|/api/cache/stats|/api/profiles(/.*)?"),
+    # GET /attendance/{employee_id} is an employee's whole, unpaginated history: heavy
+    (LIGHT, {"GET", "HEAD"}, r"/employees/\d+|/attendance/\d+/(calendar|\d{4}-\d{2}-\d{2})"),
+    (LIGHT, {"GET", "HEAD"}, r"/jobs/[0-9a-f]{32}(/result)?"),
+    # Jobs run under their own limits; log ingestion is rate limited and writes no rows
+    (LIGHT, {"POST"}, r"/jobs/?|/api/logs(/batch)?"),
+    (HEAVY, {"POST"}, r"/employees/batch"),
+]
+_ROUTE_CLASSES = [(name, methods, re.compile(pattern)) for name, methods, pattern in ROUTE_CLASSES]
+
+
+def route_class(method: str, path: str) -> str:
+    for name, methods, pattern in _ROUTE_CLASSES:
+        if method in methods and pattern.fullmatch(path):
+            return name
+    return HEAVY if method in ("GET", "HEAD") else WRITE
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionController:
+    """Per-class and shared concurrency limits with bounded, prioritized wait queues"""
+
+    def __init__(self, limit: int, class_limits: dict[str, int], queue_size: int, timeout: float):
+        self.limit = limit
+        self.class_limits = class_limits
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.running: Counter[str] = Counter()
+        self._queues: dict[str, deque[asyncio.Future]] = {name: deque() for name in PRIORITY}
+        self.admitted = 0
+        self.rejected: Counter[str] = Counter()
+
+    def _has_room(self, name: str) -> bool:
+        return self.active < self.limit and self.running[name] < self.class_limits.get(name, self.limit)
+
+    def _admit(self, name: str) -> None:
+        self.active += 1
+        self.running[name] += 1
+        self.admitted += 1
+
+    async def acquire(self, name: str) -> None:
+        """Wait for a slot; raises AdmissionRejected when the queue is full or the wait times out"""
+        queue = self._queues[name]
+        # Waiters of the same class go first; waiters of other classes can
+        # only be waiting while the shared limit is reached
+        if not queue and self._has_room(name):
+            self._admit(name)
+            ADMISSION_WAIT.labels(name).observe(0)
+            return
+        if len(queue) >= self.queue_size:
+            self._reject(name, "queue_full")
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        start = time.perf_counter()
+        try:
+            # Not wait_for: before Python 3.12 it swallows a cancellation
+            # that arrives once the slot is granted
+            async with asyncio.timeout(self.timeout):
+                await waiter
+        except TimeoutError:
+            self._discard(queue, waiter)
+            self._reject(name, "timeout")
+        except asyncio.CancelledError:
+            # Client went away while waiting; hand on a slot granted meanwhile
+            if waiter.cancelled():
+                self._discard(queue, waiter)
+            else:
+                self.release(name)
+            raise
+        ADMISSION_WAIT.labels(name).observe(time.perf_counter() - start)
+
+    @staticmethod
+    def _discard(queue: deque, waiter: asyncio.Future) -> None:
+        # Removed now so dead waiters do not count towards a full queue
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            pass
+
+    def _reject(self, name: str, reason: str) -> None:
+        self.rejected[reason] += 1
+        ADMISSION_REJECTIONS.labels(name, reason).inc()
+        raise AdmissionRejected(reason)
+
+    def release(self, name: str) -> None:
+        self.active -= 1
+        self.running[name] -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        for name in PRIORITY:
+            queue = self._queues[name]
+            while queue and self._has_room(name):
+                waiter = queue.popleft()
+                # Cancelled by a timeout or disconnect that has not removed it yet
+                if waiter.done():
+                    continue
+                self._admit(name)
+                waiter.set_result(None)
+
+    def stats(self) -> dict:
+        stats = {"active": self.active, "admitted": self.admitted}
+        for name in PRIORITY:
+            stats[f"{name}_running"] = self.running[name]
+            stats[f"{name}_waiting"] = len(self._queues[name])
+        for reason in ("queue_full", "timeout", "pool_timeout"):
+            stats[f"rejected_{reason}"] = self.rejected[reason]
+        return stats
+
+
+admission = AdmissionController(
+    settings.ADMISSION_MAX_CONCURRENT,
+    {HEAVY: settings.ADMISSION_HEAVY_LIMIT, WRITE: settings.ADMISSION_WRITE_LIMIT},
+    settings.ADMISSION_QUEUE_SIZE,
+    settings.ADMISSION_QUEUE_TIMEOUT,
+)
+register_stats("admission", "Admission control", admission.stats)
+
+# Roughly how long a queue takes to drain, rounded up to whole seconds
+RETRY_AFTER = str(max(math.ceil(settings.ADMISSION_QUEUE_TIMEOUT), 1))
+
+
+def overloaded_response(detail: str) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=503,
+        headers={"Retry-After": RETRY_AFTER},
+    )
+
+
+class AdmissionMiddleware:
+    """Admit requests by route class, answering 503 with Retry-After when overloaded"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = route_class(scope["method"], scope["path"])
+        if name == EXEMPT:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await admission.acquire(name)
+        except AdmissionRejected as exc:
+            api_logger.warning(
+                "Request rejected by admission control",
+                extra={
+                    "correlation_id": scope.get("state", {}).get("correlation_id"),
+                    "path": scope["path"],
+                    "route_class": name,
+                    "reason": exc.reason,
+                },
+            )
+            await overloaded_response("Server is busy; try again later")(scope, receive, send)
+            return
+        try:
+            # Held until the response is sent, since streamed exports keep
+            # their connection for the whole body
+            await self.app(scope, receive, send)
+        finally:
+            admission.release(name)
+
+
+async def pool_timeout_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Answer a connection pool checkout timeout with 503 rather than 500"""
+    admission.rejected["pool_timeout"] += 1
+    ADMISSION_REJECTIONS.labels(route_class(request.method, request.url.path), "pool_timeout").inc()
+    return overloaded_response("Database is busy; try again later")
@@ -0,0 +1,217 @@
+"""
+Read-through cache with pluggable backends
+
+Besides cached values, the cache holds a version token per collection for
+list ETags. Writes replace the token, so a conditional list GET answers
+from the cache instead of recomputing a count and latest row version over
+the whole table on every request. Tokens describe the primary's rows only;
+replica reads compute their own.
+"""
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from app.core.config import settings
+from app.core.logging import app_logger
+from app.core.metrics import register_stats
+
+
+VERSION_PREFIX = "version:"
+
+
+class CacheBackend(ABC):
+    """Storage interface for cached, JSON-compatible values"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Set a value only when the key holds none; returns whether it was set"""
+        ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        ...
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        ...
+
+
+class LocalCacheBackend(CacheBackend):
+    """In-process bounded LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        if await self.get(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache shared across workers through a Redis-compatible server"""
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from exc
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._client.set(key, json.dumps(value), px=int(ttl * 1000))
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        return bool(await self._client.set(key, json.dumps(value), px=int(ttl * 1000), nx=True))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*keys)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        batch = []
+        async for key in self._client.scan_iter(match=f"{prefix}*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                await self._client.delete(*batch)
+                batch.clear()
+        if batch:
+            await self._client.delete(*batch)
+
+
+class Cache:
+    """Read-through cache front end with hit/miss accounting
+
+    Backend failures are logged and treated as misses so a cache outage
+    degrades to direct database reads instead of failing requests.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            value = await self.backend.get(key)
+        except Exception as exc:
+            self._record_error("get", exc)
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        try:
+            await self.backend.set(key, value, self.ttl)
+        except Exception as exc:
+            self._record_error("set", exc)
+
+    async def invalidate(self, *keys: str, prefixes: tuple[str, ...] = ()) -> None:
+        try:
+            await self.backend.delete(*keys)
+            for prefix in prefixes:
+                await self.backend.delete_prefix(prefix)
+        except Exception as exc:
+            self._record_error("invalidate", exc)
+
+    async def version(self, name: str, load: Callable[[], Awaitable[str]]) -> str:
+        """Version token of a collection, loaded from the primary database on a miss
+
+        The loaded token is stored only if no write has stored one
+        meanwhile, so a load that started before a write cannot replace
+        the write's token with one clients hold for the old rows.
+        """
+        key = VERSION_PREFIX + name
+        version = await self.get(key)
+        if version is None:
+            version = await load()
+            try:
+                await self.backend.add(key, version, self.ttl)
+            except Exception as exc:
+                self._record_error("add", exc)
+        return version
+
+    async def bump_version(self, *names: str) -> None:
+        """Give collections a new version token after a committed write"""
+        for name in names:
+            try:
+                await self.backend.set(VERSION_PREFIX + name, uuid.uuid4().hex, self.ttl)
+            except Exception as exc:
+                self._record_error("bump_version", exc)
+                # A token that outlives the write would answer 304 for changed data
+                await self.invalidate(VERSION_PREFIX + name)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _record_error(self, operation: str, exc: Exception) -> None:
+        self.errors += 1
+        app_logger.warning(
+            "Cache operation failed",
+            extra={"operation": operation, "error": str(exc), "error_type": type(exc).__name__},
+        )
+
+
+def _build_cache() -> Cache:
+    if settings.CACHE_BACKEND == "redis":
+        backend = RedisCacheBackend(settings.CACHE_URL)
+    else:
+        backend = LocalCacheBackend(settings.CACHE_MAX_ENTRIES)
+    return Cache(backend, settings.CACHE_TTL_SECONDS)
+
+
+cache = _build_cache()
+register_stats("cache", "Read-through cache", cache.stats)
@@ -1,17 +1,104 @@
 import os
-from dotenv import load_dotenv
+import tempfile
+from pathlib import Path
 
-load_dotenv()
+
+def _load_env_file() -> None:
+    """Load the nearest .env above this file, as load_dotenv() would
+
+    Deployments pass real environment variables and ship no .env, so
+    python-dotenv is only imported when there is a file to read.
+    """
+    for directory in Path(__file__).resolve().parents:
+        path = directory / ".env"
+        if path.is_file():
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return
+
+
+_load_env_file()
 
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
     PORT: int = int(os.getenv("PORT", "8000"))
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
     FRONTEND_URL_PROD: str = os.getenv("FRONTEND_URL_PROD", "https://mvphrm-frontend.vercel.app")
-    
+
+    # Database connection pool
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds, -1 disables
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_WARMUP: int = int(os.getenv("DB_POOL_WARMUP", "2"))  # connections opened at startup
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))  # 0 disables
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+
+    # Admission control (see app/core/admission.py); limits default to shares of the pool
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_MAX_CONCURRENT: int = int(os.getenv("ADMISSION_MAX_CONCURRENT", str(DB_POOL_SIZE + DB_MAX_OVERFLOW)))
+    ADMISSION_HEAVY_LIMIT: int = int(os.getenv("ADMISSION_HEAVY_LIMIT", str(max(ADMISSION_MAX_CONCURRENT // 3, 1))))  # lists, search, exports
+    ADMISSION_WRITE_LIMIT: int = int(os.getenv("ADMISSION_WRITE_LIMIT", str(max(ADMISSION_MAX_CONCURRENT * 2 // 3, 1))))
+    ADMISSION_QUEUE_SIZE: int = int(os.getenv("ADMISSION_QUEUE_SIZE", "100"))  # waiting requests per route class
+    ADMISSION_QUEUE_TIMEOUT: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "5"))  # seconds before a waiting request gets 503
+
+    # Read replicas (comma-separated URLs); GET routes read from them when healthy
+    DATABASE_READ_REPLICA_URLS: list[str] = [
+        url.strip() for url in os.getenv("DATABASE_READ_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    DB_REPLICA_CHECK_INTERVAL: float = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))  # seconds between health checks
+    DB_REPLICA_MAX_LAG_SECONDS: float = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "30"))  # replay lag before a replica is skipped
+    DB_READ_YOUR_WRITES_SECONDS: float = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))  # reads stay on the primary after a write
+
+    # Attendance partitioning (PostgreSQL)
+    ATTENDANCE_PARTITION_MONTHS_AHEAD: int = int(os.getenv("ATTENDANCE_PARTITION_MONTHS_AHEAD", "3"))
+    ATTENDANCE_RETENTION_MONTHS: int = int(os.getenv("ATTENDANCE_RETENTION_MONTHS", "24"))
+
     # Logging configuration
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # json or text
     ENABLE_REQUEST_LOGGING: bool = os.getenv("ENABLE_REQUEST_LOGGING", "true").lower() == "true"
+    LOG_ASYNC: bool = os.getenv("LOG_ASYNC", "false").lower() == "true"  # format and write logs off the event loop
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_QUEUE_POLICY: str = os.getenv("LOG_QUEUE_POLICY", "drop")  # drop or block when the queue is full
+    LOG_QUEUE_BLOCK_TIMEOUT: float = float(os.getenv("LOG_QUEUE_BLOCK_TIMEOUT", "0.05"))
+    LOG_BATCH_SIZE: int = int(os.getenv("LOG_BATCH_SIZE", "256"))
+
+    # Request profiling (see app/core/profiling.py)
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # share of requests profiled at random
+    PROFILE_TOKEN: str = os.getenv("PROFILE_TOKEN", "")  # X-Profile header value that profiles a request; empty disables
+    PROFILE_SLOW_MS: float = float(os.getenv("PROFILE_SLOW_MS", "500"))  # profiled requests at least this slow are reported
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "mvphrm-profiles"))
+    PROFILE_KEEP: int = int(os.getenv("PROFILE_KEEP", "100"))  # stored profiles; the oldest are deleted
+
+    # Frontend log ingestion
+    FRONTEND_LOG_RATE: float = float(os.getenv("FRONTEND_LOG_RATE", "20"))  # entries per second per client
+    FRONTEND_LOG_BURST: int = int(os.getenv("FRONTEND_LOG_BURST", "200"))
+    FRONTEND_LOG_SAMPLE_RATE: float = float(os.getenv("FRONTEND_LOG_SAMPLE_RATE", "1.0"))  # kept share of debug/info
+    FRONTEND_LOG_MAX_BATCH: int = int(os.getenv("FRONTEND_LOG_MAX_BATCH", "1000"))
+    FRONTEND_LOG_MAX_BYTES: int = int(os.getenv("FRONTEND_LOG_MAX_BYTES", str(1024 * 1024)))
+
+    # Cache configuration
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "local")  # local or redis
+    CACHE_URL: str = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+
+    # Change feed (server-sent events)
+    EVENTS_BACKEND: str = os.getenv("EVENTS_BACKEND", "local")  # local or postgres (LISTEN/NOTIFY across workers)
+    EVENTS_BUFFER_SIZE: int = int(os.getenv("EVENTS_BUFFER_SIZE", "1000"))  # events kept for Last-Event-ID resume
+    EVENTS_QUEUE_SIZE: int = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))  # per-connection backlog before disconnecting
+    EVENTS_HEARTBEAT_SECONDS: float = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+    # Background jobs (reports and exports run off the request path)
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "4"))  # jobs running at once per process
+    JOB_QUEUE_SIZE: int = int(os.getenv("JOB_QUEUE_SIZE", "100"))  # waiting jobs before submissions are refused
+    JOB_PROCESS_WORKERS: int = int(os.getenv("JOB_PROCESS_WORKERS", "1"))  # processes for CPU-bound aggregation, 0 runs it in a thread
+    JOB_TYPE_LIMITS: str = os.getenv("JOB_TYPE_LIMITS", "")  # per-type overrides, e.g. "attendance_report=1,attendance_export=2"
+    JOB_TIMEOUT_SECONDS: float = float(os.getenv("JOB_TIMEOUT_SECONDS", "600"))
+    JOB_RESULT_DIR: str = os.getenv("JOB_RESULT_DIR", os.path.join(tempfile.gettempdir(), "mvphrm-jobs"))
+    JOB_RESULT_TTL_SECONDS: float = float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))  # results are deleted after this
+    JOB_CLEANUP_INTERVAL: float = float(os.getenv("JOB_CLEANUP_INTERVAL", "60"))
 
 settings = Settings()
@@ -1,12 +1,71 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import asyncio
+import time
+from datetime import datetime, timezone
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncConnection
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.logging import db_logger
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT, instrument_engine, register_stats
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waits for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
 
 # Base class for models
 Base = declarative_base()
 
+
+def utcnow() -> datetime:
+    """Current UTC time with microseconds, used for row version timestamps"""
+    return datetime.now(timezone.utc)
+
+
+def engine_options(database_url: str) -> dict:
+    """Pool and driver options for the configured database"""
+    url = make_url(database_url)
+    options = {
+        "echo": settings.DB_ECHO,
+        "future": True,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    if url.get_backend_name() == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
 # Async SQLAlchemy engine
-engine = create_async_engine(settings.DATABASE_URL, echo=True, future=True)
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+instrument_engine(engine.sync_engine)
+
+if engine.dialect.name == "sqlite":
+    # SQLite only enforces foreign keys when asked to, per connection
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
 
 # Session factory
 AsyncSessionLocal = sessionmaker(
@@ -19,3 +78,65 @@ AsyncSessionLocal = sessionmaker(
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def warm_up_pool(count: int) -> int:
+    """Open and validate `count` pooled connections so first requests skip connection setup"""
+    if isinstance(engine.pool, QueuePool):
+        # Connections beyond pool_size are overflow and are closed on return
+        count = min(count, engine.pool.size())
+    if count <= 0:
+        return 0
+
+    async def open_connection() -> AsyncConnection:
+        connection = await engine.connect()
+        await connection.execute(text("SELECT 1"))
+        return connection
+
+    results = await asyncio.gather(*(open_connection() for _ in range(count)), return_exceptions=True)
+    opened = 0
+    for result in results:
+        if isinstance(result, BaseException):
+            db_logger.error(
+                "Connection pool warm-up failed",
+                extra={"error": str(result), "error_type": type(result).__name__},
+            )
+        else:
+            await result.close()
+            opened += 1
+    db_logger.info("Connection pool warmed up", extra={"connections": opened, "requested": count})
+    return opened
+
+
+async def dispose_engine() -> None:
+    """Close every pooled connection"""
+    await engine.dispose()
+
+
+def reset_engine_after_fork() -> None:
+    """Give a forked worker a fresh pool instead of the parent's connections
+
+    The parent's connections are dropped without being closed, since
+    closing a shared socket from the child would end the parent's session.
+    """
+    engine.sync_engine.dispose(close=False)
+
+
+def pool_stats() -> dict:
+    """Current utilization of the connection pool"""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    capacity = pool.size() + settings.DB_MAX_OVERFLOW
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "utilization": round(pool.checkedout() / capacity, 4) if capacity else 0.0,
+    }
+
+
+register_stats("db_pool", "Connection pool", pool_stats)
@@ -0,0 +1,262 @@
+"""
+Change feed for employee and attendance writes
+
+Services publish events after their transaction commits. The broadcaster
+keeps the most recent events in a replay buffer so server-sent event
+clients can resume from the last id they saw, and fans each event out to
+per-connection queues.
+
+With EVENTS_BACKEND=postgres, events travel through LISTEN/NOTIFY so that
+every worker process delivers every write; each worker's buffer then holds
+events in the same (commit) order, which is what makes ids resumable
+against any worker.
+"""
+import asyncio
+import itertools
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Optional
+import orjson
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from app.core.config import settings
+from app.core.db import engine
+from app.core.logging import app_logger
+from app.core.metrics import register_stats
+
+TOPICS = frozenset({"employee", "attendance"})
+
+NOTIFY_CHANNEL = "mvphrm_changes"
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_BYTES = 7900
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    id: str
+    type: str  # "<topic>.<action>", e.g. "attendance.created"
+    data: dict
+
+    @property
+    def topic(self) -> str:
+        return self.type.split(".", 1)[0]
+
+    def encode(self) -> str:
+        """Server-sent event frame"""
+        frame = f"id: {self.id}\n" if self.id else ""
+        return frame + f"event: {self.type}\ndata: {orjson.dumps(self.data).decode()}\n\n"
+
+
+def _reset_event(reason: str) -> ChangeEvent:
+    # No id, so the client's Last-Event-ID is left as it was
+    return ChangeEvent("", "reset", {"reason": reason})
+
+
+class _Subscriber:
+    def __init__(self, topics: frozenset[str], queue_size: int):
+        self.topics = topics
+        self.queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    def wants(self, event: ChangeEvent) -> bool:
+        return event.type == "reset" or not self.topics or event.topic in self.topics
+
+
+class EventBroadcaster:
+    """In-process fan-out of change events with a replay buffer"""
+
+    def __init__(self, buffer_size: int, queue_size: int):
+        self._buffer: deque[ChangeEvent] = deque(maxlen=buffer_size)
+        self._subscribers: set[_Subscriber] = set()
+        self._queue_size = queue_size
+        # Unique across processes without coordination
+        self._id_prefix = uuid.uuid4().hex[:8]
+        self._ids = itertools.count(1)
+        self.published = 0
+        self.disconnected = 0
+
+    def _new_event(self, event_type: str, data: dict) -> ChangeEvent:
+        return ChangeEvent(f"{self._id_prefix}-{next(self._ids)}", event_type, data)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, event_type: str, data: dict) -> None:
+        self.deliver(self._new_event(event_type, data))
+
+    def deliver(self, event: ChangeEvent) -> None:
+        """Buffer an event and hand it to every interested subscriber"""
+        self._buffer.append(event)
+        self.published += 1
+        self._fan_out(event)
+
+    def _fan_out(self, event: ChangeEvent) -> None:
+        for subscriber in self._subscribers:
+            if subscriber.overflowed or not subscriber.wants(event):
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client is cut off after its queued events; it
+                # reconnects with Last-Event-ID and resumes from the buffer
+                subscriber.overflowed = True
+                self.disconnected += 1
+
+    def reset(self, reason: str) -> None:
+        """Tell subscribers to refetch, e.g. after events may have been missed"""
+        # Ids from before the gap can no longer be resumed from
+        self._buffer.clear()
+        self._fan_out(_reset_event(reason))
+
+    def _replay(self, last_event_id: str) -> Optional[list[ChangeEvent]]:
+        """Buffered events after the given id, or None if it is no longer buffered"""
+        events = list(self._buffer)
+        for index, event in enumerate(events):
+            if event.id == last_event_id:
+                return events[index + 1:]
+        return None
+
+    async def stream(
+        self,
+        topics: frozenset[str],
+        last_event_id: Optional[str] = None,
+        heartbeat: float = 15.0,
+    ) -> AsyncIterator[str]:
+        """Server-sent event frames for one client, starting after last_event_id"""
+        subscriber = _Subscriber(topics, self._queue_size)
+        self._subscribers.add(subscriber)
+        try:
+            # Registered and snapshotted without awaiting in between, so no
+            # event is both replayed and queued, or missed by both
+            if last_event_id:
+                replay = self._replay(last_event_id)
+                if replay is None:
+                    yield _reset_event("last event id is no longer buffered").encode()
+                else:
+                    for event in replay:
+                        if subscriber.wants(event):
+                            yield event.encode()
+
+            while not (subscriber.overflowed and subscriber.queue.empty()):
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield event.encode()
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self).__name__,
+            "subscribers": len(self._subscribers),
+            "buffered": len(self._buffer),
+            "published": self.published,
+            "disconnected": self.disconnected,
+        }
+
+
+class PostgresEventBroadcaster(EventBroadcaster):
+    """Broadcaster that routes events through LISTEN/NOTIFY to every worker"""
+
+    def __init__(self, engine: AsyncEngine, buffer_size: int, queue_size: int, check_interval: float = 5.0):
+        super().__init__(buffer_size, queue_size)
+        self._engine = engine
+        self._check_interval = check_interval
+        self._conn: Optional[AsyncConnection] = None
+        self._driver_conn = None
+        self._supervisor: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        try:
+            await self._listen()
+        except Exception as exc:
+            app_logger.error("Change feed listener failed to start", extra={"error": str(exc)})
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        await self._close()
+
+    async def publish(self, event_type: str, data: dict) -> None:
+        event = self._new_event(event_type, data)
+        payload = orjson.dumps(asdict(event))
+        if len(payload) > MAX_NOTIFY_BYTES:
+            # Large batches go out without their data; clients refetch
+            event = ChangeEvent(event.id, event.type, {"truncated": True})
+            payload = orjson.dumps(asdict(event))
+        try:
+            async with self._engine.connect() as conn:
+                await conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": NOTIFY_CHANNEL, "payload": payload.decode()},
+                )
+                await conn.commit()
+        except Exception as exc:
+            # Other workers miss this event; local subscribers still get it
+            app_logger.error("Change event NOTIFY failed", extra={"error": str(exc), "event_type": event_type})
+            self.deliver(event)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.deliver(ChangeEvent(**orjson.loads(payload)))
+        except (TypeError, ValueError) as exc:
+            app_logger.warning("Malformed change event payload", extra={"error": str(exc)})
+
+    async def _listen(self) -> None:
+        # A dedicated connection held for the process lifetime; SQLAlchemy
+        # never runs a statement on it, so it stays outside a transaction
+        # and notifications are delivered as soon as they arrive
+        self._conn = await self._engine.connect()
+        raw = await self._conn.get_raw_connection()
+        self._driver_conn = raw.driver_connection
+        await self._driver_conn.add_listener(NOTIFY_CHANNEL, self._on_notify)
+
+    async def _close(self) -> None:
+        if self._driver_conn is not None and not self._driver_conn.is_closed():
+            try:
+                await self._driver_conn.remove_listener(NOTIFY_CHANNEL, self._on_notify)
+            except Exception:
+                pass
+        if self._conn is not None:
+            try:
+                await self._conn.invalidate()
+            except Exception:
+                pass
+        self._conn = None
+        self._driver_conn = None
+
+    async def _supervise(self) -> None:
+        """Re-establish the listener after its connection drops"""
+        while True:
+            await asyncio.sleep(self._check_interval)
+            if self._driver_conn is not None and not self._driver_conn.is_closed():
+                continue
+            await self._close()
+            try:
+                await self._listen()
+            except Exception as exc:
+                app_logger.warning("Change feed listener reconnect failed", extra={"error": str(exc)})
+                continue
+            app_logger.info("Change feed listener reconnected")
+            self.reset("change feed reconnected; events may have been missed")
+
+
+def _build_broadcaster() -> EventBroadcaster:
+    if settings.EVENTS_BACKEND == "postgres":
+        if engine.dialect.name == "postgresql":
+            return PostgresEventBroadcaster(engine, settings.EVENTS_BUFFER_SIZE, settings.EVENTS_QUEUE_SIZE)
+        app_logger.warning("EVENTS_BACKEND=postgres needs a PostgreSQL database; using the local broadcaster")
+    return EventBroadcaster(settings.EVENTS_BUFFER_SIZE, settings.EVENTS_QUEUE_SIZE)
+
+
+broadcaster = _build_broadcaster()
+register_stats("events", "Change feed broadcaster", broadcaster.stats)
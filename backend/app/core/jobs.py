@@ -0,0 +1,311 @@
+"""
+Background jobs for reports and exports
+
+Job types are registered with a handler and a concurrency limit. Submitted
+jobs wait in a bounded in-process queue and are started as asyncio tasks,
+at most JOB_WORKERS at once and never more of one type than its limit; a
+job whose type is saturated keeps its place without holding up jobs of
+other types. Handlers write their result to a file in JOB_RESULT_DIR and
+hand CPU-bound work to a process pool through run_cpu.
+
+Each job's status is also written as JSON next to its result, so under
+gunicorn any worker on the host can report a job and serve its result,
+not only the worker running it. Results and status files are deleted
+JOB_RESULT_TTL_SECONDS after the job finishes.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+import uuid
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+import orjson
+from app.core.config import settings
+from app.core.logging import app_logger
+from app.core.metrics import register_stats
+
+UNFINISHED_STATES = ("queued", "running")
+
+
+@dataclass
+class Job:
+    id: str
+    type: str
+    params: dict
+    created_at: float
+    state: str = "queued"  # queued, running, succeeded or failed
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    error: Optional[str] = None
+    filename: Optional[str] = None  # download name of the result
+    media_type: Optional[str] = None
+    size: Optional[int] = None
+    read_primary: bool = False  # submitted right after a write, so replicas may lag behind it
+    owner: int = field(default_factory=os.getpid)
+
+
+@dataclass(frozen=True)
+class JobOutput:
+    filename: str
+    media_type: str
+
+
+# Writes the job's result to the given path
+JobHandler = Callable[[Job, Path], Awaitable[JobOutput]]
+
+
+@dataclass(frozen=True)
+class JobType:
+    name: str
+    handler: JobHandler
+    limit: int
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while JOB_QUEUE_SIZE jobs are already waiting"""
+
+
+def _type_limits(spec: str) -> dict[str, int]:
+    """Parse "type=limit,type=limit" overrides"""
+    limits = {}
+    for item in spec.split(","):
+        name, _, limit = item.partition("=")
+        if name.strip() and limit.strip():
+            limits[name.strip()] = int(limit)
+    return limits
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class JobManager:
+    """Queue, concurrency limits, result files and process pool for background jobs"""
+
+    def __init__(self):
+        self.result_dir = Path(settings.JOB_RESULT_DIR)
+        self.workers = settings.JOB_WORKERS
+        self.queue_size = settings.JOB_QUEUE_SIZE
+        self.process_workers = settings.JOB_PROCESS_WORKERS
+        self._limit_overrides = _type_limits(settings.JOB_TYPE_LIMITS)
+        self._types: dict[str, JobType] = {}
+        self._jobs: dict[str, Job] = {}
+        self._pending: deque[Job] = deque()
+        self._running: dict[str, asyncio.Task] = {}
+        self._running_by_type: Counter[str] = Counter()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def register(self, name: str, handler: JobHandler, limit: int) -> None:
+        """Add a job type; JOB_TYPE_LIMITS overrides its concurrency limit"""
+        self._types[name] = JobType(name, handler, self._limit_overrides.get(name, limit))
+
+    async def start(self) -> None:
+        self._stopping = False
+        self.result_dir.mkdir(parents=True, exist_ok=True)
+        self._new_pool()
+        self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            self._cleanup_task = None
+        while self._pending:
+            self._finish(self._pending.popleft(), "Server shut down before the job started")
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _new_pool(self) -> None:
+        if self.process_workers > 0:
+            # Spawned rather than forked: forking a process that runs an event
+            # loop and logging threads can leave the child holding their locks
+            self._pool = ProcessPoolExecutor(
+                self.process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def submit(self, job_type: str, params: dict, read_primary: bool = False) -> Job:
+        """Queue a job and start it as soon as its type and the pool have room"""
+        if job_type not in self._types:
+            raise ValueError(f"Unknown job type: {job_type}")
+        if len(self._pending) >= self.queue_size:
+            self.rejected += 1
+            raise JobQueueFull(f"{len(self._pending)} jobs are already waiting")
+        job = Job(uuid.uuid4().hex, job_type, params, created_at=time.time(), read_primary=read_primary)
+        self._jobs[job.id] = job
+        self._save(job)
+        self._pending.append(job)
+        self.submitted += 1
+        self._dispatch()
+        return job
+
+    def _dispatch(self) -> None:
+        if self._stopping:
+            return
+        for job in list(self._pending):
+            if len(self._running) >= self.workers:
+                break
+            if self._running_by_type[job.type] >= self._types[job.type].limit:
+                continue
+            self._pending.remove(job)
+            self._running_by_type[job.type] += 1
+            self._running[job.id] = asyncio.create_task(self._run(job))
+
+    async def _run(self, job: Job) -> None:
+        job.state = "running"
+        job.started_at = time.time()
+        self._save(job)
+        partial = self.result_dir / f"{job.id}.part"
+        error = None
+        try:
+            async with asyncio.timeout(settings.JOB_TIMEOUT_SECONDS):
+                output = await self._types[job.type].handler(job, partial)
+            result = self.result_path(job)
+            partial.replace(result)
+            job.filename = output.filename
+            job.media_type = output.media_type
+            job.size = result.stat().st_size
+        except asyncio.CancelledError:
+            error = "Server shut down while the job was running"
+            raise
+        except TimeoutError:
+            error = f"Timed out after {settings.JOB_TIMEOUT_SECONDS:g}s"
+        except Exception as exc:
+            error = getattr(exc, "detail", None) or str(exc) or type(exc).__name__
+            app_logger.exception("Background job failed", extra={"job_id": job.id, "job_type": job.type})
+        finally:
+            partial.unlink(missing_ok=True)
+            self._finish(job, error)
+            del self._running[job.id]
+            self._running_by_type[job.type] -= 1
+            self._dispatch()
+
+    def _finish(self, job: Job, error: Optional[str]) -> None:
+        job.state = "failed" if error else "succeeded"
+        job.error = error
+        job.finished_at = time.time()
+        job.expires_at = job.finished_at + settings.JOB_RESULT_TTL_SECONDS
+        if error:
+            self.failed += 1
+        else:
+            self.succeeded += 1
+        self._save(job)
+
+    async def run_cpu(self, fn: Callable, *args):
+        """Run a CPU-bound function in the process pool, or in a thread without one
+
+        Arguments and the return value cross a process boundary, so keep
+        them to plain picklable values and send work in batches.
+        """
+        if self._pool is None:
+            return await asyncio.to_thread(fn, *args)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+        except BrokenProcessPool:
+            # A pool process died (e.g. killed for memory); later jobs get a new pool
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._new_pool()
+            raise
+
+    def result_path(self, job: Job) -> Path:
+        return self.result_dir / f"{job.id}.result"
+
+    def _meta_path(self, job_id: str) -> Path:
+        return self.result_dir / f"{job_id}.json"
+
+    def _save(self, job: Job) -> None:
+        # Written then renamed so other workers never read a partial file
+        path = self._meta_path(job.id)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(orjson.dumps(asdict(job)))
+        temporary.replace(path)
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        try:
+            return Job(**orjson.loads(self._meta_path(job_id).read_bytes()))
+        except (OSError, orjson.JSONDecodeError, TypeError):
+            return None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """A job from this worker or, under gunicorn, another worker on the host"""
+        job = self._jobs.get(job_id) or self._load(job_id)
+        if job is None or (job.expires_at is not None and job.expires_at < time.time()):
+            return None
+        return job
+
+    async def _cleanup_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.JOB_CLEANUP_INTERVAL)
+            now = time.time()
+            for job_id in [job.id for job in self._jobs.values() if job.expires_at and job.expires_at < now]:
+                del self._jobs[job_id]
+            try:
+                await asyncio.to_thread(self._sweep, now)
+            except Exception as exc:
+                app_logger.error("Job result cleanup failed", extra={"error": str(exc)})
+
+    def _abandoned(self, job: Job, now: float) -> bool:
+        """Whether an unfinished job has no worker left to finish it"""
+        if job.owner == os.getpid():
+            # A previous process with this PID, e.g. before a container restart
+            return job.id not in self._jobs
+        if job.state == "running" and job.started_at is not None:
+            # Jobs are cancelled at their timeout, so a PID still alive past
+            # it (and a sweep) has been reused by another process
+            if job.started_at + settings.JOB_TIMEOUT_SECONDS + settings.JOB_CLEANUP_INTERVAL < now:
+                return True
+        return not _process_alive(job.owner)
+
+    def _sweep(self, now: float) -> None:
+        """Delete expired results, whichever worker ran them, and fail jobs whose worker has exited"""
+        for meta in self.result_dir.glob("*.json"):
+            job = self._load(meta.stem)
+            if job is None:
+                continue
+            if job.expires_at is not None and job.expires_at < now:
+                self.result_path(job).unlink(missing_ok=True)
+                meta.unlink(missing_ok=True)
+            elif job.state in UNFINISHED_STATES and self._abandoned(job, now):
+                (self.result_dir / f"{job.id}.part").unlink(missing_ok=True)
+                job.state = "failed"
+                job.error = "Worker process exited before the job finished"
+                job.finished_at = now
+                job.expires_at = now + settings.JOB_RESULT_TTL_SECONDS
+                self._save(job)
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._pending),
+            "running": len(self._running),
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+jobs = JobManager()
+register_stats("jobs", "Background jobs", jobs.stats)
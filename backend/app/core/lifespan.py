@@ -1,10 +1,30 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from app.core.config import settings
+from app.core.db import engine, warm_up_pool, dispose_engine
+from app.core.events import broadcaster
+from app.core.jobs import jobs
+from app.core.logging import shutdown_logging, db_logger
+from app.core.partitions import ensure_attendance_partitions
+from app.core.replicas import replica_set
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic (DB pool, queues, caches)
     print("Starting MVPHRM backend...")
+    await warm_up_pool(settings.DB_POOL_WARMUP)
+    try:
+        await ensure_attendance_partitions(engine, settings.ATTENDANCE_PARTITION_MONTHS_AHEAD)
+    except Exception as exc:
+        db_logger.error("Attendance partition maintenance failed", extra={"error": str(exc)})
+    await replica_set.start()
+    await broadcaster.start()
+    await jobs.start()
     yield
     # Shutdown logic (close DB, flush queues)
     print("Shutting down MVPHRM backend...")
+    await jobs.stop()
+    await broadcaster.stop()
+    await replica_set.stop()
+    await dispose_engine()
+    shutdown_logging()
@@ -2,12 +2,17 @@
 Logging configuration for MVPHRM backend using structured logging
 """
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import Any
+import threading
+from typing import Any, Optional, TextIO
 from pythonjsonlogger import jsonlogger
 from functools import lru_cache
 import json
 from datetime import datetime
+from app.core.config import settings
+from app.core.metrics import register_stats
 
 
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
@@ -22,6 +27,118 @@ class CustomJsonFormatter(jsonlogger.JsonFormatter):
             log_record["exception"] = self.formatException(record.exc_info)
 
 
+_STOP = object()
+
+
+class BatchingQueueListener:
+    """Drain queued log records on a background thread and write them in batches"""
+
+    def __init__(self, log_queue: queue.Queue, stream: TextIO, formatter: logging.Formatter, batch_size: int):
+        self.queue = log_queue
+        self.stream = stream
+        self.formatter = formatter
+        self.batch_size = batch_size
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush everything queued so far and stop the writer thread"""
+        if not self.running:
+            return
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def write(self, records: list[logging.LogRecord]) -> None:
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                lines.append(json.dumps({"level": "ERROR", "message": "Failed to format log record", "logger": record.name}))
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception:
+            pass
+
+    def _run(self) -> None:
+        while True:
+            record = self.queue.get()
+            if record is _STOP:
+                return
+            batch = [record]
+            stopping = False
+            while len(batch) < self.batch_size:
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+            self.write(batch)
+            if stopping:
+                return
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler with a drop or block policy for a full buffer
+
+    When the listener is not running (before start, after shutdown or in a
+    forked child) records are written synchronously so none are lost.
+    """
+
+    def __init__(self, log_queue: queue.Queue, listener: BatchingQueueListener, policy: str, block_timeout: float):
+        super().__init__(log_queue)
+        self.listener = listener
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Records stay in-process, so exc_info and extra fields are kept for the
+        # listener's formatter; only the message is resolved eagerly
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if not self.listener.running:
+            self.listener.write([record])
+            return
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+@lru_cache
+def _get_queue_handler() -> BoundedQueueHandler:
+    """Shared handler feeding the single background log writer"""
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    listener = BatchingQueueListener(
+        log_queue, sys.stderr, CustomJsonFormatter("%(message)s"), settings.LOG_BATCH_SIZE
+    )
+    handler = BoundedQueueHandler(
+        log_queue, listener, settings.LOG_QUEUE_POLICY, settings.LOG_QUEUE_BLOCK_TIMEOUT
+    )
+    handler.setLevel(logging.DEBUG)
+    listener.start()
+    return handler
+
+
 @lru_cache
 def get_logger(name: str) -> logging.Logger:
     """Get or create a logger with structured JSON output"""
@@ -36,12 +153,16 @@ def get_logger(name: str) -> logging.Logger:
     # Remove any existing handlers
     logger.handlers.clear()
 
-    # JSON handler for stderr
-    json_handler = logging.StreamHandler(sys.stderr)
-    json_handler.setLevel(logging.DEBUG)
-    json_formatter = CustomJsonFormatter("%(message)s")
-    json_handler.setFormatter(json_formatter)
-    logger.addHandler(json_handler)
+    if settings.LOG_ASYNC:
+        # Queue records for the background writer
+        logger.addHandler(_get_queue_handler())
+    else:
+        # JSON handler for stderr
+        json_handler = logging.StreamHandler(sys.stderr)
+        json_handler.setLevel(logging.DEBUG)
+        json_formatter = CustomJsonFormatter("%(message)s")
+        json_handler.setFormatter(json_formatter)
+        logger.addHandler(json_handler)
 
     # Prevent propagation to root logger
     logger.propagate = False
@@ -64,6 +185,44 @@ def setup_logging() -> None:
     get_logger("mvphrm")
 
 
+def log_pipeline_stats() -> dict[str, Any]:
+    """Queue depth and drop count of the asynchronous log pipeline"""
+    if not settings.LOG_ASYNC:
+        return {"mode": "sync"}
+    handler = _get_queue_handler()
+    return {
+        "mode": "async",
+        "policy": handler.policy,
+        "queued": handler.queue.qsize(),
+        "capacity": handler.queue.maxsize,
+        "dropped": handler.dropped,
+    }
+
+
+def reinit_logging_after_fork() -> None:
+    """Restart the background log writer in a forked worker"""
+    if not settings.LOG_ASYNC or not _get_queue_handler.cache_info().currsize:
+        return
+    handler = _get_queue_handler()
+    # The writer thread does not survive fork, and the inherited queue's
+    # lock may have been held by it at the time, so both are replaced
+    handler.queue = handler.listener.queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    handler.listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued log records and stop the background writer"""
+    if not settings.LOG_ASYNC:
+        return
+    handler = _get_queue_handler()
+    handler.listener.stop()
+    # Written synchronously now that the listener has stopped
+    if handler.dropped:
+        app_logger.warning("Log records dropped due to a full queue", extra={"dropped": handler.dropped})
+
+
+register_stats("log_pipeline", "Asynchronous log pipeline", log_pipeline_stats)
+
 # Module-level logger instances
 app_logger = get_logger("mvphrm.app")
 db_logger = get_logger("mvphrm.db")
@@ -0,0 +1,156 @@
+"""
+Prometheus metrics for HTTP requests, database queries and the connection pool
+
+Under gunicorn with several workers, PROMETHEUS_MULTIPROC_DIR is set (see
+gunicorn.conf.py) and request and query metrics are aggregated across
+workers at scrape time. Stats collectors (pool, cache, log queue) still
+describe only the worker that serves the scrape.
+"""
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duration of individual SQL statements",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+DB_QUERY_ERRORS = Counter(
+    "db_query_errors_total",
+    "SQL statements that raised an error",
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Total SQL time per HTTP request",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection, including new connection setup",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+ADMISSION_WAIT = Histogram(
+    "http_admission_wait_seconds",
+    "Time requests waited for admission, by route class",
+    ["route_class"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+ADMISSION_REJECTIONS = Counter(
+    "http_admission_rejections_total",
+    "Requests refused with 503 by admission control",
+    ["route_class", "reason"],
+)
+
+
+@dataclass
+class RequestDbStats:
+    queries: int = 0
+    duration: float = 0.0
+    statements: Optional[list] = None  # (statement, seconds) pairs, collected while the request is profiled
+
+
+_request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+
+def start_request_db_stats() -> RequestDbStats:
+    """Start accumulating SQL statistics for the current request context"""
+    stats = RequestDbStats()
+    _request_db_stats.set(stats)
+    return stats
+
+
+def current_request_db_stats() -> Optional[RequestDbStats]:
+    return _request_db_stats.get()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every SQL statement executed through `engine`"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_times"].pop()
+        DB_QUERY_DURATION.observe(elapsed)
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.duration += elapsed
+            if stats.statements is not None:
+                stats.statements.append((statement, elapsed))
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        start_times = exception_context.connection.info.get("query_start_times") if exception_context.connection else None
+        if start_times:
+            start_times.pop()
+        DB_QUERY_ERRORS.inc()
+
+
+def observe_request(method: str, route: str, status: int, duration: float, db_stats: RequestDbStats) -> None:
+    REQUEST_LATENCY.labels(method, route, str(status)).observe(duration)
+    DB_QUERIES_PER_REQUEST.labels(route).observe(db_stats.queries)
+    DB_TIME_PER_REQUEST.labels(route).observe(db_stats.duration)
+
+
+class StatsCollector:
+    """Expose dictionaries of numeric stats (pool, cache, log queue) as gauges at scrape time"""
+
+    def __init__(self, prefix: str, documentation: str, source: Callable[[], dict]):
+        self.prefix = prefix
+        self.documentation = documentation
+        self.source = source
+
+    def collect(self) -> Iterable[GaugeMetricFamily]:
+        for name, value in self.source().items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            yield GaugeMetricFamily(f"{self.prefix}_{name}", f"{self.documentation}: {name}", value=value)
+
+
+_stats_collectors: list[StatsCollector] = []
+
+
+def register_stats(prefix: str, documentation: str, source: Callable[[], dict]) -> None:
+    collector = StatsCollector(prefix, documentation, source)
+    _stats_collectors.append(collector)
+    REGISTRY.register(collector)
+
+
+def render_metrics() -> bytes:
+    """Metrics in the Prometheus text format, summed over workers in multiprocess mode"""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return generate_latest()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in _stats_collectors:
+        registry.register(collector)
+    return generate_latest(registry)
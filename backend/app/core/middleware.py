@@ -1,81 +1,136 @@
 """
-FastAPI middleware for logging requests and responses
+ASGI middleware for logging requests and responses
 """
 import time
 import uuid
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import StreamingResponse
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.core.logging import api_logger
+from app.core.metrics import REQUESTS_IN_FLIGHT, observe_request, start_request_db_stats
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log HTTP requests and responses with correlation IDs"""
+class LoggingMiddleware:
+    """Middleware to log HTTP requests and responses with correlation IDs
+
+    Implemented as a raw ASGI middleware: it observes the receive/send
+    channels as messages pass through instead of buffering bodies, so
+    request and response sizes are the bytes actually transferred.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # Generate or retrieve correlation ID
-        correlation_id = request.headers.get("X-Correlation-ID", str(uuid.uuid4()))
-        request.state.correlation_id = correlation_id
-
-        # Log request
-        start_time = time.time()
-        
-        request_body = ""
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                request_body = await request.body()
-                # Reset request body for actual processing
-                async def receive():
-                    return {"type": "http.request", "body": request_body}
-                request._receive = receive
-            except Exception:
-                pass
+        headers = Headers(scope=scope)
+        correlation_id = headers.get("x-correlation-id") or str(uuid.uuid4())
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
 
+        client = scope.get("client")
         api_logger.info(
-            f"Request started",
+            "Request started",
             extra={
                 "correlation_id": correlation_id,
-                "method": request.method,
-                "path": request.url.path,
-                "query_params": dict(request.query_params),
-                "client": request.client.host if request.client else None,
-                "user_agent": request.headers.get("user-agent"),
+                "method": scope["method"],
+                "path": scope["path"],
+                "query_params": dict(QueryParams(scope.get("query_string", b""))),
+                "client": client[0] if client else None,
+                "user_agent": headers.get("user-agent"),
             }
         )
 
+        start_time = time.perf_counter()
+        request_size = 0
+        response_size = 0
+        status_code = None
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_size, status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add correlation ID to response headers
+                MutableHeaders(scope=message).append("X-Correlation-ID", correlation_id)
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
         try:
-            response = await call_next(request)
+            await self.app(scope, receive_wrapper, send_wrapper)
         except Exception as exc:
-            duration = time.time() - start_time
             api_logger.error(
-                f"Request failed with exception",
+                "Request failed with exception",
                 extra={
                     "correlation_id": correlation_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "duration_ms": duration * 1000,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "duration_ms": (time.perf_counter() - start_time) * 1000,
                     "error": str(exc),
                     "error_type": type(exc).__name__,
                 }
             )
             raise
 
-        # Add correlation ID to response headers
-        response.headers["X-Correlation-ID"] = correlation_id
-
-        # Log response
-        duration = time.time() - start_time
         api_logger.info(
-            f"Request completed",
+            "Request completed",
             extra={
                 "correlation_id": correlation_id,
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "duration_ms": duration * 1000,
-                "response_size": response.headers.get("content-length", "unknown"),
+                "method": scope["method"],
+                "path": scope["path"],
+                "status_code": status_code,
+                "duration_ms": (time.perf_counter() - start_time) * 1000,
+                "request_size": request_size,
+                "response_size": response_size,
             }
         )
 
-        return response
+
+class MetricsMiddleware:
+    """Middleware recording per-route latency, in-flight requests and SQL usage per request"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        db_stats = start_request_db_stats()
+        status_code = 500
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            # The router stores the matched route in the scope; label by its
+            # template so /employees/1 and /employees/2 share a series
+            route = scope.get("route")
+            observe_request(
+                method,
+                getattr(route, "path", "unmatched"),
+                status_code,
+                time.perf_counter() - start_time,
+                db_stats,
+            )
@@ -0,0 +1,85 @@
+"""
+Monthly range partitions of the attendance table (PostgreSQL only)
+"""
+import re
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from app.core.logging import db_logger
+
+_BOUND = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"attendance_p{month:%Y%m}"
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    """Whether the attendance table exists as a partitioned table"""
+    if conn.dialect.name != "postgresql":
+        return False
+    return await conn.scalar(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'attendance' AND pg_table_is_visible(c.oid))"
+    ))
+
+
+async def list_partitions(conn: AsyncConnection) -> list[tuple[str, date, date]]:
+    """Monthly partitions of attendance as (name, from, to); the default partition is omitted"""
+    result = await conn.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+        "FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'attendance' AND pg_table_is_visible(p.oid) "
+        "ORDER BY c.relname"
+    ))
+    partitions = []
+    for name, bound in result:
+        match = _BOUND.search(bound or "")
+        if match:
+            partitions.append((name, date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))))
+    return partitions
+
+
+async def ensure_attendance_partitions(engine: AsyncEngine, months_ahead: int, today: date | None = None) -> list[str]:
+    """Create partitions for the current month and `months_ahead` following months
+
+    Returns the names of partitions created. Each partition is created in its
+    own transaction under an advisory lock so concurrently starting workers do
+    not race, and one failure (e.g. rows for that month already sitting in the
+    default partition) does not prevent the others.
+    """
+    created = []
+    current = (today or date.today()).replace(day=1)
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        try:
+            async with engine.begin() as conn:
+                if not await is_partitioned(conn):
+                    return created
+                await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('attendance_partitions'))"))
+                exists = await conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+                if exists:
+                    continue
+                await conn.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF attendance "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                ))
+                created.append(name)
+        except DBAPIError as exc:
+            db_logger.error(
+                "Failed to create attendance partition",
+                extra={"partition": name, "error": str(exc.orig), "error_type": type(exc.orig).__name__},
+            )
+    if created:
+        db_logger.info("Created attendance partitions", extra={"partitions": created})
+    return created
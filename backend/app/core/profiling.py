@@ -0,0 +1,247 @@
+"""
+Opt-in profiling of individual requests
+
+A request is profiled when its X-Profile header equals PROFILE_TOKEN, or
+at random with probability PROFILE_SAMPLE_RATE. Profiling records a
+cProfile call-stack profile and every SQL statement the request ran with
+its duration. When a profiled request took at least PROFILE_SLOW_MS, or
+asked to be profiled, a compact summary is logged and the profile is
+stored in PROFILE_DIR under the request's correlation ID, from where
+/api/profiles serves it to clients sending the token; the .prof file
+opens with pstats or snakeviz.
+
+cProfile hooks the whole thread, so a worker profiles one request at a
+time and the profile also holds whatever other requests ran on the event
+loop meanwhile. The SQL list is exact: statements are collected through
+the request's own context. Keep the sample rate low in production.
+"""
+import asyncio
+import cProfile
+import os
+import pstats
+import random
+import re
+import sysconfig
+import time
+from pathlib import Path
+from typing import Optional
+import orjson
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.logging import api_logger
+from app.core.metrics import current_request_db_stats, register_stats, start_request_db_stats
+
+# Correlation IDs come from clients, so only plain ones name files
+_SAFE_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+# Not worth profiling, and reading profiles with the token must not store new ones
+EXEMPT_PATHS = ("/api/profiles", "/metrics")
+
+# Rows kept in a stored profile, and in the logged summary
+TOP_FUNCTIONS = 40
+SUMMARY_FUNCTIONS = 5
+MAX_STATEMENTS = 1000
+SUMMARY_STATEMENTS = 3
+STATEMENT_CHARS = 1000
+SUMMARY_STATEMENT_CHARS = 200
+
+_APP_ROOT = str(Path(__file__).resolve().parents[2]) + os.sep
+_STDLIB = sysconfig.get_paths()["stdlib"] + os.sep
+
+
+def _short_path(filename: str) -> str:
+    _, found, rest = filename.rpartition("site-packages" + os.sep)
+    if found:
+        return rest
+    for root in (_APP_ROOT, _STDLIB):
+        if filename.startswith(root):
+            return filename[len(root):]
+    return filename
+
+
+def _top_functions(profiler: cProfile.Profile, count: int) -> list[dict]:
+    """Functions with the most self time, which is where the request actually spent it"""
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:count]
+    return [
+        {
+            "function": f"{_short_path(filename)}:{line}({name})",
+            "calls": calls,
+            "self_ms": round(self_time * 1000, 3),
+            "cumulative_ms": round(cumulative * 1000, 3),
+        }
+        for (filename, line, name), (_, calls, self_time, cumulative, _) in rows
+    ]
+
+
+def _statements(statements: list[tuple[str, float]]) -> list[dict]:
+    return [
+        {"statement": " ".join(statement.split())[:STATEMENT_CHARS], "ms": round(elapsed * 1000, 3)}
+        for statement, elapsed in statements[:MAX_STATEMENTS]
+    ]
+
+
+class ProfileStore:
+    """Stored profiles in PROFILE_DIR, shared by the workers on a host"""
+
+    def __init__(self, directory: str, keep: int):
+        self.directory = Path(directory)
+        self.keep = keep
+        self.active = False  # a request is being profiled in this worker
+        self.profiled = 0
+        self.reported = 0
+        self.skipped_busy = 0
+        self._tasks: set[asyncio.Task] = set()
+
+    def report(self, profiler: cProfile.Profile, summary: dict, statements: list) -> None:
+        """Log and store a profile after the response, off the request's critical path"""
+        self.reported += 1
+        task = asyncio.create_task(self._report(profiler, summary, statements))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _report(self, profiler: cProfile.Profile, summary: dict, statements: list) -> None:
+        try:
+            record = await asyncio.to_thread(self._save, profiler, summary, statements)
+        except Exception as exc:
+            api_logger.error("Failed to store request profile", extra={"error": str(exc)})
+            return
+        slowest = sorted(record["statements"], key=lambda item: item["ms"], reverse=True)[:SUMMARY_STATEMENTS]
+        api_logger.warning(
+            "Request profile",
+            extra={
+                **summary,
+                "top_functions": [
+                    f"{row['self_ms']:.1f}ms {row['function']}" for row in record["functions"][:SUMMARY_FUNCTIONS]
+                ],
+                "slowest_sql": [
+                    f"{row['ms']:.1f}ms {row['statement'][:SUMMARY_STATEMENT_CHARS]}" for row in slowest
+                ],
+            },
+        )
+
+    def _save(self, profiler: cProfile.Profile, summary: dict, statements: list) -> dict:
+        profiler.create_stats()
+        record = {
+            **summary,
+            "functions": _top_functions(profiler, TOP_FUNCTIONS),
+            "statements": _statements(statements),
+        }
+        correlation_id = summary["correlation_id"]
+        if correlation_id and _SAFE_ID.match(correlation_id):
+            self.directory.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(self.directory / f"{correlation_id}.prof")
+            temporary = self.directory / f"{correlation_id}.tmp"
+            temporary.write_bytes(orjson.dumps(record))
+            temporary.replace(self.directory / f"{correlation_id}.json")
+            self._prune()
+        return record
+
+    def _prune(self) -> None:
+        records = sorted(self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+        for path in records[self.keep:]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".prof").unlink(missing_ok=True)
+
+    def summaries(self) -> list[dict]:
+        """Summaries of stored profiles, newest first"""
+        summaries = []
+        for path in self.directory.glob("*.json"):
+            record = self.get(path.stem)
+            if record is not None:
+                record.pop("functions", None)
+                record.pop("statements", None)
+                summaries.append(record)
+        return sorted(summaries, key=lambda record: record["started_at"], reverse=True)
+
+    def get(self, correlation_id: str) -> Optional[dict]:
+        if not _SAFE_ID.match(correlation_id):
+            return None
+        try:
+            return orjson.loads((self.directory / f"{correlation_id}.json").read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def pstats_path(self, correlation_id: str) -> Optional[Path]:
+        if not _SAFE_ID.match(correlation_id):
+            return None
+        path = self.directory / f"{correlation_id}.prof"
+        return path if path.is_file() else None
+
+    def stats(self) -> dict:
+        return {
+            "profiled": self.profiled,
+            "reported": self.reported,
+            "skipped_busy": self.skipped_busy,
+        }
+
+
+profiles = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_KEEP)
+register_stats("request_profiles", "Request profiling", profiles.stats)
+
+
+def profiling_enabled() -> bool:
+    return settings.PROFILE_SAMPLE_RATE > 0 or bool(settings.PROFILE_TOKEN)
+
+
+class ProfilingMiddleware:
+    """Profile requests that ask for it or are sampled, and report the slow ones
+
+    Runs inside LoggingMiddleware, whose correlation ID keys the profile.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        requested = bool(settings.PROFILE_TOKEN) and Headers(scope=scope).get("x-profile") == settings.PROFILE_TOKEN
+        if not requested and random.random() >= settings.PROFILE_SAMPLE_RATE:
+            await self.app(scope, receive, send)
+            return
+        if profiles.active:
+            profiles.skipped_busy += 1
+            await self.app(scope, receive, send)
+            return
+
+        db_stats = current_request_db_stats() or start_request_db_stats()
+        db_stats.statements = []
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profiles.active = True
+        profiles.profiled += 1
+        profiler = cProfile.Profile()
+        started_at = time.time()
+        start_time = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            profiles.active = False
+            statements, db_stats.statements = db_stats.statements, None
+            if requested or duration_ms >= settings.PROFILE_SLOW_MS:
+                summary = {
+                    "correlation_id": scope.get("state", {}).get("correlation_id"),
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(scope.get("route"), "path", None),
+                    "status_code": status_code,
+                    "started_at": started_at,
+                    "duration_ms": round(duration_ms, 3),
+                    "sql_count": len(statements),
+                    "sql_ms": round(sum(elapsed for _, elapsed in statements) * 1000, 3),
+                    "requested": requested,
+                }
+                profiles.report(profiler, summary, statements)
@@ -0,0 +1,32 @@
+"""
+Token bucket rate limiting keyed by client
+"""
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets refilled at a fixed rate, bounded to max_keys buckets"""
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def acquire(self, key: str, tokens: int = 1) -> int:
+        """Take up to `tokens` tokens for `key` and return how many were granted"""
+        now = time.monotonic()
+        available, updated_at = self._buckets.get(key, (float(self.burst), now))
+        available = min(float(self.burst), available + (now - updated_at) * self.rate)
+        granted = min(tokens, int(available))
+        self._buckets[key] = (available - granted, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return granted
+
+    def retry_after(self, key: str) -> float:
+        """Seconds until `key` has at least one token again"""
+        available, _ = self._buckets.get(key, (float(self.burst), 0.0))
+        return max(0.0, (1 - available) / self.rate) if self.rate else 60.0
@@ -0,0 +1,231 @@
+"""
+Read-replica routing for read-only routes
+
+Routes that only read take their session from get_read_db instead of
+get_db. It hands out a session on a healthy replica, round robin, and
+falls back to the primary when no replica is configured or healthy.
+Clients that wrote within DB_READ_YOUR_WRITES_SECONDS also read from the
+primary, so they see their own changes despite replication lag. The time
+of their last write travels with the client, which keeps stickiness
+working across workers: ReadYourWritesMiddleware returns it in an
+X-Last-Write response header and the client sends it back on later
+requests. A header rather than a cookie, because the frontend calls the
+API cross-site, where browsers neither store nor send SameSite=Lax
+cookies and increasingly block third-party ones.
+
+Replicas are checked in the background; on PostgreSQL the check also
+measures replay lag, and a replica further behind than
+DB_REPLICA_MAX_LAG_SECONDS is skipped like an unreachable one.
+"""
+import asyncio
+import itertools
+import time
+from typing import Optional
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.core.db import AsyncSessionLocal, engine_options
+from app.core.logging import db_logger
+from app.core.metrics import instrument_engine, register_stats
+
+LAST_WRITE_HEADER = "X-Last-Write"
+
+# Unsafe requests that do not change database rows and so do not make the
+# client sticky: the frontend posts logs continuously, batch lookups and
+# job submissions only read
+STICKY_EXEMPT_PATHS = ("/api/logs", "/employees/batch", "/jobs")
+
+# Zero when the replica has replayed everything it received, so an idle
+# primary does not look like lag
+_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def is_replica_session(db: AsyncSession) -> bool:
+    """Whether a session reads from a replica, whose rows may be behind the primary"""
+    return db.info.get("replica", False)
+
+
+class Replica:
+    """One read replica: its engine, session factory and last health check"""
+
+    def __init__(self, url: str):
+        self.name = make_url(url).render_as_string(hide_password=True)
+        self.engine = create_async_engine(url, **engine_options(url))
+        instrument_engine(self.engine.sync_engine)
+        self.sessions = sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            info={"replica": True},
+        )
+        self.healthy = False
+        self.lag: Optional[float] = None
+
+        @event.listens_for(self.engine.sync_engine, "handle_error")
+        def _on_error(context):
+            # Stop routing to a replica that dropped a connection mid-request
+            # instead of waiting for the next check
+            if context.is_disconnect and self.healthy:
+                self._mark(False, "connection lost")
+
+    async def check(self, timeout: float, max_lag: float) -> None:
+        try:
+            async with asyncio.timeout(timeout):
+                async with self.engine.connect() as conn:
+                    if self.engine.dialect.name == "postgresql":
+                        self.lag = float(await conn.scalar(_LAG_SQL))
+                    else:
+                        await conn.execute(text("SELECT 1"))
+                        self.lag = 0.0
+        except Exception as exc:
+            self.lag = None
+            self._mark(False, str(exc) or type(exc).__name__)
+            return
+        if self.lag > max_lag:
+            self._mark(False, f"replication lag {self.lag:.1f}s")
+        else:
+            self._mark(True)
+
+    def _mark(self, healthy: bool, reason: Optional[str] = None) -> None:
+        if healthy == self.healthy:
+            return
+        self.healthy = healthy
+        if healthy:
+            db_logger.info("Read replica healthy", extra={"replica": self.name, "lag_seconds": self.lag})
+        else:
+            db_logger.warning("Read replica unavailable", extra={"replica": self.name, "reason": reason})
+
+
+class ReplicaSet:
+    """The configured replicas, their health checks and read routing counters"""
+
+    def __init__(self, urls: list[str], check_interval: float, max_lag: float):
+        self.replicas = [Replica(url) for url in urls]
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self._turn = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self.replica_reads = 0
+        self.primary_reads = 0  # no healthy replica
+        self.sticky_reads = 0  # client wrote recently
+
+    async def start(self) -> None:
+        if not self.replicas:
+            return
+        # Route to replicas only once they have passed a check
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def check(self) -> None:
+        await asyncio.gather(*(replica.check(self.check_interval, self.max_lag) for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
+
+    def choose(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    def session_factory(self, request: Request) -> sessionmaker:
+        """Session factory for a read-only request"""
+        return self.reader(sticky=bool(self.replicas) and wrote_recently(request))
+
+    def reader(self, sticky: bool = False) -> sessionmaker:
+        """Session factory for reads, on the primary when sticky or no replica is healthy"""
+        if not self.replicas:
+            return AsyncSessionLocal
+        if sticky:
+            self.sticky_reads += 1
+            return AsyncSessionLocal
+        replica = self.choose()
+        if replica is None:
+            self.primary_reads += 1
+            return AsyncSessionLocal
+        self.replica_reads += 1
+        return replica.sessions
+
+    def reset_after_fork(self) -> None:
+        """Drop connections inherited from the parent process, as the primary's are"""
+        for replica in self.replicas:
+            replica.engine.sync_engine.dispose(close=False)
+
+    def stats(self) -> dict:
+        return {
+            "configured": len(self.replicas),
+            "healthy": sum(replica.healthy for replica in self.replicas),
+            "max_lag_seconds": max((replica.lag or 0.0 for replica in self.replicas), default=0.0),
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+        }
+
+
+def wrote_recently(request: Request) -> bool:
+    """Whether the client's last write falls inside the read-your-writes window"""
+    try:
+        last_write = float(request.headers.get(LAST_WRITE_HEADER, ""))
+    except ValueError:
+        return False
+    return time.time() - last_write < settings.DB_READ_YOUR_WRITES_SECONDS
+
+
+replica_set = ReplicaSet(
+    settings.DATABASE_READ_REPLICA_URLS,
+    settings.DB_REPLICA_CHECK_INTERVAL,
+    settings.DB_REPLICA_MAX_LAG_SECONDS,
+)
+register_stats("db_replicas", "Read replica routing", replica_set.stats)
+
+
+def read_session_factory(request: Request) -> sessionmaker:
+    """Session factory for reads made outside a dependency, e.g. streamed exports"""
+    return replica_set.session_factory(request)
+
+
+# Dependency for read-only FastAPI routes
+async def get_read_db(request: Request):
+    async with read_session_factory(request)() as session:
+        yield session
+
+
+class ReadYourWritesMiddleware:
+    """Stamp successful writes with the time the client sends back to keep its reads on the primary"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in ("GET", "HEAD", "OPTIONS")
+            or scope["path"].startswith(STICKY_EXEMPT_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message)[LAST_WRITE_HEADER] = f"{time.time():.3f}"
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
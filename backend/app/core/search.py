@@ -0,0 +1,177 @@
+"""
+In-memory employee search index for databases without pg_trgm
+
+Mirrors the PostgreSQL search ranking closely enough for the SQLite
+stand-in: a field-level prefix match scores 1, plus the best trigram word
+similarity of the query against any word of name, email or department.
+The index is loaded on first use and kept current by EmployeeService
+writes, so it only sees changes made through this process.
+"""
+import asyncio
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.metrics import register_stats
+
+SEARCH_FIELDS = ("name", "email", "department")
+
+# Same default as pg_trgm.word_similarity_threshold
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(word: str) -> set[str]:
+    """pg_trgm-style trigrams of a single lowercase word"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def words(value: str) -> set[str]:
+    return set(_WORD.findall(value.lower()))
+
+
+class EmployeeSearchIndex:
+    """Trigram and prefix index over employee name, email and department"""
+
+    def __init__(self):
+        self.loaded = False
+        self._lock = asyncio.Lock()
+        # Writes made while the initial load runs, replayed once it finishes
+        self._pending: Optional[list[tuple[int, Optional[dict]]]] = None
+        self._records: dict[int, dict] = {}
+        self._word_ids: dict[str, set[int]] = defaultdict(set)
+        self._trigram_words: dict[str, set[str]] = defaultdict(set)
+        self._word_trigrams: dict[str, frozenset[str]] = {}
+        # Sorted (lowercase value, id) pairs per field for prefix lookups
+        self._prefixes: dict[str, list[tuple[str, int]]] = {field: [] for field in SEARCH_FIELDS}
+
+    async def ensure_loaded(self, db: AsyncSession, model) -> None:
+        if self.loaded:
+            return
+        async with self._lock:
+            if self.loaded:
+                return
+            self._pending = []
+            try:
+                result = await db.execute(select(model.id, *(getattr(model, field) for field in SEARCH_FIELDS)))
+                rows = [(row.id, {field: getattr(row, field) for field in SEARCH_FIELDS}) for row in result]
+                # Seconds of work at 100k employees; keep it off the event loop
+                await asyncio.to_thread(self._build, rows)
+                self.loaded = True
+                for employee_id, record in self._pending:
+                    if record is None:
+                        self.remove(employee_id)
+                    else:
+                        self.upsert(employee_id, record)
+            finally:
+                self._pending = None
+
+    def _build(self, rows: list[tuple[int, dict]]) -> None:
+        for employee_id, record in rows:
+            self._add(employee_id, record)
+        for entries in self._prefixes.values():
+            entries.sort()
+
+    def upsert(self, employee_id: int, record: dict) -> None:
+        """Apply a committed create or update; a no-op until the index is loaded"""
+        if not self.loaded:
+            if self._pending is not None:
+                self._pending.append((employee_id, record))
+            return
+        self.remove(employee_id)
+        self._add(employee_id, record, keep_sorted=True)
+
+    def remove(self, employee_id: int) -> None:
+        if not self.loaded:
+            if self._pending is not None:
+                self._pending.append((employee_id, None))
+            return
+        record = self._records.pop(employee_id, None)
+        if record is None:
+            return
+        for field in SEARCH_FIELDS:
+            value = record[field]
+            if value is None:
+                continue
+            entries = self._prefixes[field]
+            index = bisect_left(entries, (value.lower(), employee_id))
+            if index < len(entries) and entries[index] == (value.lower(), employee_id):
+                del entries[index]
+            for word in words(value):
+                ids = self._word_ids[word]
+                ids.discard(employee_id)
+                if not ids:
+                    # Trigrams of unused words are left in place and
+                    # skipped at query time
+                    del self._word_ids[word]
+
+    def _add(self, employee_id: int, record: dict, keep_sorted: bool = False) -> None:
+        self._records[employee_id] = {"id": employee_id, **{field: record[field] for field in SEARCH_FIELDS}}
+        for field in SEARCH_FIELDS:
+            value = record[field]
+            if value is None:
+                continue
+            entry = (value.lower(), employee_id)
+            if keep_sorted:
+                entries = self._prefixes[field]
+                entries.insert(bisect_left(entries, entry), entry)
+            else:
+                self._prefixes[field].append(entry)
+            for word in words(value):
+                if word not in self._word_trigrams:
+                    self._word_trigrams[word] = frozenset(trigrams(word))
+                    for trigram in self._word_trigrams[word]:
+                        self._trigram_words[trigram].add(word)
+                self._word_ids[word].add(employee_id)
+
+    def search(self, query: str, count: int) -> list[tuple[float, dict]]:
+        """The best `count` matches as (score, record), best first and then by id"""
+        query = query.lower()
+        scores: dict[int, float] = defaultdict(float)
+
+        for entries in self._prefixes.values():
+            index = bisect_left(entries, (query, -1))
+            while index < len(entries) and entries[index][0].startswith(query):
+                scores[entries[index][1]] = 1.0
+                index += 1
+
+        # Word similarity of the query's words against indexed words
+        best: dict[int, float] = {}
+        for query_word in words(query):
+            query_trigrams = trigrams(query_word)
+            required = math.ceil(WORD_SIMILARITY_THRESHOLD * len(query_trigrams))
+            # A word sharing `required` trigrams with the query contains at
+            # least one of any len - required + 1 of them, so only that many
+            # of the rarest trigrams are probed for candidates
+            probes = sorted(query_trigrams, key=lambda trigram: len(self._trigram_words.get(trigram, ())))
+            candidates: set[str] = set()
+            for trigram in probes[:len(query_trigrams) - required + 1]:
+                candidates.update(self._trigram_words.get(trigram, ()))
+            for word in candidates:
+                ids = self._word_ids.get(word)
+                if not ids:
+                    continue
+                similarity = len(query_trigrams & self._word_trigrams[word]) / len(query_trigrams)
+                if similarity < WORD_SIMILARITY_THRESHOLD:
+                    continue
+                for employee_id in ids:
+                    if similarity > best.get(employee_id, 0.0):
+                        best[employee_id] = similarity
+
+        for employee_id, similarity in best.items():
+            scores[employee_id] += similarity
+        top = heapq.nsmallest(count, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(round(score, 4), self._records[employee_id]) for employee_id, score in top]
+
+    def stats(self) -> dict:
+        return {"loaded": int(self.loaded), "records": len(self._records), "words": len(self._word_ids)}
+
+
+employee_index = EmployeeSearchIndex()
+register_stats("employee_search_index", "In-memory employee search index", employee_index.stats)
@@ -0,0 +1,23 @@
+"""
+Gunicorn worker class for serving the app on uvicorn
+
+Used by gunicorn.conf.py; see that file for the process model.
+"""
+from uvicorn_worker import UvicornWorker as _UvicornWorker
+
+# Seconds kept back from gunicorn's graceful_timeout for the lifespan
+# shutdown (log flush, pool disposal) after open connections are cancelled
+SHUTDOWN_MARGIN = 5
+
+
+class UvicornWorker(_UvicornWorker):
+    """Uvicorn worker pinned to uvloop and httptools instead of auto-detection"""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Without a limit uvicorn waits for every open connection, and change
+        # feed streams never finish, so gunicorn would SIGKILL the worker
+        # before the lifespan shutdown ran
+        self.config.timeout_graceful_shutdown = max(self.cfg.graceful_timeout - SHUTDOWN_MARGIN, 1)
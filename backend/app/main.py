@@ -1,12 +1,15 @@
-import importlib
-import pkgutil
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import configure_mappers
+from app.core.admission import AdmissionMiddleware, pool_timeout_handler
 from app.core.lifespan import lifespan
 from app.core.config import settings
 from app.core.logging import setup_logging, app_logger
-from app.core.middleware import LoggingMiddleware
-import app.api as api_pkg
+from app.core.middleware import LoggingMiddleware, MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware, profiling_enabled
+from app.core.replicas import LAST_WRITE_HEADER, ReadYourWritesMiddleware
+from app.api import include_routers
 
 # Setup logging
 setup_logging()
@@ -19,6 +22,13 @@ app = FastAPI(
 # # Add logging middleware first (so it wraps all other middleware)
 # app.add_middleware(LoggingMiddleware)
 
+if settings.ADMISSION_ENABLED:
+    # Innermost, so 503s from admission control still get CORS headers
+    app.add_middleware(AdmissionMiddleware)
+
+# A pool checkout that times out means overload, not a server error
+app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
+
 # Add CORS middleware using Settings
 origins = [
     # settings.FRONTEND_URL,
@@ -33,13 +43,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Read by the frontend and sent back so its reads after a write skip lagging replicas
+    expose_headers=[LAST_WRITE_HEADER],
 )
 
+if settings.DATABASE_READ_REPLICA_URLS:
+    # Keeps a client's reads on the primary briefly after it writes
+    app.add_middleware(ReadYourWritesMiddleware)
+
+if profiling_enabled():
+    # Inside LoggingMiddleware, which assigns the correlation ID profiles are stored under
+    app.add_middleware(ProfilingMiddleware)
+
 # Add logging middleware after CORS
 app.add_middleware(LoggingMiddleware)
 
-# Dynamically discover and register all routers in app/api
-for _, module_name, _ in pkgutil.iter_modules(api_pkg.__path__):
-    module = importlib.import_module(f"app.api.{module_name}")
-    if hasattr(module, "router"):
-        app.include_router(module.router)
+# Outermost, so latency covers the full middleware stack
+app.add_middleware(MetricsMiddleware)
+
+# Routers are listed in app/api/__init__.py
+include_routers(app)
+
+# Configure ORM mappers now rather than in the first request that queries;
+# under gunicorn this runs once in the master before workers fork
+configure_mappers()
@@ -0,0 +1,23 @@
+"""Add indexes backing keyset pagination
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index("ix_attendance_date_id", "attendance", ["date", "id"])
+    op.create_index("ix_employees_department_id", "employees", ["department", "id"])
+
+def downgrade():
+    op.drop_index("ix_employees_department_id", table_name="employees")
+    op.drop_index("ix_attendance_date_id", table_name="attendance")
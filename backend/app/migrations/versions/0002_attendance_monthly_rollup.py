@@ -0,0 +1,43 @@
+"""Add attendance monthly rollup table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "attendance_monthly_rollup",
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("employees.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("present_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("absent_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("employee_id", "month", name="pk_attendance_monthly_rollup"),
+    )
+    op.create_index("ix_attendance_monthly_rollup_month", "attendance_monthly_rollup", ["month"])
+
+    # Backfill from existing attendance history
+    op.execute(
+        """
+        INSERT INTO attendance_monthly_rollup (employee_id, month, present_count, absent_count)
+        SELECT employee_id,
+               date_trunc('month', date)::date,
+               count(*) FILTER (WHERE status = 'Present'),
+               count(*) FILTER (WHERE status = 'Absent')
+        FROM attendance
+        GROUP BY employee_id, date_trunc('month', date)
+        """
+    )
+
+def downgrade():
+    op.drop_index("ix_attendance_monthly_rollup_month", table_name="attendance_monthly_rollup")
+    op.drop_table("attendance_monthly_rollup")
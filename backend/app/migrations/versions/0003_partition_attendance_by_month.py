@@ -0,0 +1,99 @@
+"""Range-partition attendance by month
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:00:00
+
+Rebuilds attendance as a table partitioned by RANGE (date) with one
+partition per month covering existing data through three months ahead, plus
+a default partition. Rows are copied in the same transaction, so expect the
+migration to take as long as a full table copy.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Index names are schema-wide, so move the old ones out of the way
+    op.execute("ALTER TABLE attendance RENAME TO attendance_unpartitioned")
+    op.execute("ALTER INDEX IF EXISTS attendance_pkey RENAME TO attendance_unpartitioned_pkey")
+    op.execute("ALTER INDEX IF EXISTS unique_employee_date RENAME TO attendance_unpartitioned_employee_date")
+    op.execute("ALTER INDEX IF EXISTS ix_attendance_date_id RENAME TO attendance_unpartitioned_date_id")
+    op.execute("ALTER INDEX IF EXISTS ix_attendance_id RENAME TO attendance_unpartitioned_id")
+
+    op.execute(
+        """
+        CREATE TABLE attendance (
+            id INTEGER NOT NULL DEFAULT nextval('attendance_id_seq'),
+            employee_id INTEGER NOT NULL REFERENCES employees(id) ON DELETE CASCADE,
+            date DATE NOT NULL,
+            status VARCHAR(20) NOT NULL CHECK (status IN ('Present', 'Absent')),
+            CONSTRAINT attendance_pkey PRIMARY KEY (id, date),
+            CONSTRAINT unique_employee_date UNIQUE (employee_id, date)
+        ) PARTITION BY RANGE (date)
+        """
+    )
+    op.execute("ALTER SEQUENCE attendance_id_seq OWNED BY attendance.id")
+    op.execute("CREATE INDEX ix_attendance_date_id ON attendance (date, id)")
+    op.execute("CREATE INDEX ix_attendance_id ON attendance (id)")
+
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month DATE;
+            last_month DATE;
+        BEGIN
+            SELECT date_trunc('month', COALESCE(min(date), now()))::date INTO month FROM attendance_unpartitioned;
+            last_month := (date_trunc('month', now()) + interval '3 months')::date;
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF attendance FOR VALUES FROM (%L) TO (%L)',
+                    'attendance_p' || to_char(month, 'YYYYMM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+                month := (month + interval '1 month')::date;
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute("CREATE TABLE attendance_default PARTITION OF attendance DEFAULT")
+
+    op.execute(
+        "INSERT INTO attendance (id, employee_id, date, status) "
+        "SELECT id, employee_id, date, status FROM attendance_unpartitioned"
+    )
+    op.execute("DROP TABLE attendance_unpartitioned")
+
+def downgrade():
+    op.execute("ALTER TABLE attendance RENAME TO attendance_partitioned")
+    op.execute("ALTER INDEX attendance_pkey RENAME TO attendance_partitioned_pkey")
+    op.execute("ALTER INDEX unique_employee_date RENAME TO attendance_partitioned_employee_date")
+    op.execute("ALTER INDEX ix_attendance_date_id RENAME TO attendance_partitioned_date_id")
+    op.execute("ALTER INDEX ix_attendance_id RENAME TO attendance_partitioned_id")
+
+    op.execute(
+        """
+        CREATE TABLE attendance (
+            id INTEGER NOT NULL DEFAULT nextval('attendance_id_seq') PRIMARY KEY,
+            employee_id INTEGER NOT NULL REFERENCES employees(id) ON DELETE CASCADE,
+            date DATE NOT NULL,
+            status VARCHAR(20) NOT NULL CHECK (status IN ('Present', 'Absent')),
+            CONSTRAINT unique_employee_date UNIQUE (employee_id, date)
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE attendance_id_seq OWNED BY attendance.id")
+    op.execute("CREATE INDEX ix_attendance_date_id ON attendance (date, id)")
+    op.execute("CREATE INDEX ix_attendance_id ON attendance (id)")
+    op.execute(
+        "INSERT INTO attendance (id, employee_id, date, status) "
+        "SELECT id, employee_id, date, status FROM attendance_partitioned"
+    )
+    op.execute("DROP TABLE attendance_partitioned")
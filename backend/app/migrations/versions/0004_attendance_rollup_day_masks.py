@@ -0,0 +1,41 @@
+"""Add present/absent day bitsets to the attendance monthly rollup
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("attendance_monthly_rollup", sa.Column("present_mask", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("attendance_monthly_rollup", sa.Column("absent_mask", sa.Integer(), nullable=False, server_default="0"))
+
+    # Backfill from existing attendance history
+    op.execute(
+        """
+        UPDATE attendance_monthly_rollup r
+        SET present_mask = m.present_mask,
+            absent_mask = m.absent_mask
+        FROM (
+            SELECT employee_id,
+                   date_trunc('month', date)::date AS month,
+                   coalesce(bit_or(1 << (extract(day FROM date)::int - 1)) FILTER (WHERE status = 'Present'), 0) AS present_mask,
+                   coalesce(bit_or(1 << (extract(day FROM date)::int - 1)) FILTER (WHERE status = 'Absent'), 0) AS absent_mask
+            FROM attendance
+            GROUP BY employee_id, date_trunc('month', date)
+        ) m
+        WHERE r.employee_id = m.employee_id AND r.month = m.month
+        """
+    )
+
+def downgrade():
+    op.drop_column("attendance_monthly_rollup", "absent_mask")
+    op.drop_column("attendance_monthly_rollup", "present_mask")
@@ -0,0 +1,28 @@
+"""Add updated_at row versions to employees and attendance
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 16:00:00
+
+Existing rows get the migration time as their version. On the partitioned
+attendance table the column is added to every partition.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    for table in ("employees", "attendance"):
+        op.add_column(
+            table,
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        )
+
+def downgrade():
+    for table in ("attendance", "employees"):
+        op.drop_column(table, "updated_at")
@@ -0,0 +1,39 @@
+"""Add trigram and prefix indexes for employee search
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 18:00:00
+
+Requires the pg_trgm extension (shipped with PostgreSQL's contrib package).
+The GIN trigram indexes serve fuzzy word matches and prefixes of three or
+more characters; the text_pattern_ops indexes serve short prefixes.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = {
+    "ix_employees_name_trgm": "name",
+    "ix_employees_email_trgm": "email",
+    "ix_employees_department_trgm": "department",
+}
+
+PREFIX_INDEXES = {
+    "ix_employees_name_prefix": "name",
+    "ix_employees_email_prefix": "email",
+}
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in TRIGRAM_INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON employees USING gin (lower({column}) gin_trgm_ops)")
+    for name, column in PREFIX_INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON employees (lower({column}) text_pattern_ops)")
+
+def downgrade():
+    for name in (*PREFIX_INDEXES, *TRIGRAM_INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
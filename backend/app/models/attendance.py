@@ -1,17 +1,43 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, UniqueConstraint, Index, PrimaryKeyConstraint
 from sqlalchemy.orm import relationship
-from app.core.db import Base
+from app.core.db import Base, utcnow
 
 class Attendance(Base):
+    # On PostgreSQL the table is range-partitioned by month on `date`
+    # (migration 0003), which makes its physical primary key (id, date).
+    # Ids still come from a single sequence, so the mapper keeps `id` as
+    # the identity and SQLite stand-ins get a plain table.
     __tablename__ = "attendance"
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
     date = Column(Date, nullable=False)  # Date object
     status = Column(String, nullable=False)  # "Present" or "Absent"
+    # Row version for conditional GETs; set by the services on every write
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
 
     employee = relationship("Employee", backref="attendance_records")
 
     __table_args__ = (
         UniqueConstraint("employee_id", "date", name="unique_employee_date"),
+        # Keyset pagination walks attendance in (date, id) order
+        Index("ix_attendance_date_id", "date", "id"),
+    )
+
+
+class AttendanceMonthlyRollup(Base):
+    """Per-employee monthly attendance counts and day bitsets, maintained on every attendance write"""
+    __tablename__ = "attendance_monthly_rollup"
+
+    employee_id = Column(Integer, ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
+    month = Column(Date, nullable=False)  # First day of the month
+    present_count = Column(Integer, nullable=False, default=0)
+    absent_count = Column(Integer, nullable=False, default=0)
+    # Day bitsets: bit d-1 is set when day d of the month has that status
+    present_mask = Column(Integer, nullable=False, default=0)
+    absent_mask = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("employee_id", "month", name="pk_attendance_monthly_rollup"),
+        Index("ix_attendance_monthly_rollup_month", "month"),
     )
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String
-from app.core.db import Base
+from sqlalchemy import Column, Integer, String, Index, DateTime
+from app.core.db import Base, utcnow
 
 class Employee(Base):
     __tablename__ = "employees"
@@ -8,3 +8,12 @@ class Employee(Base):
     name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     department = Column(String, nullable=True)
+    # Row version for conditional GETs; set by the services on every write
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+
+    __table_args__ = (
+        # Department-filtered pages are walked in id order
+        Index("ix_employees_department_id", "department", "id"),
+        # Search uses expression indexes on lower(name/email/department)
+        # that exist only on PostgreSQL (migration 0006)
+    )
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, field_validator, field_serializer, ConfigDict
-from typing import Literal
+from pydantic import BaseModel, Field, field_validator, field_serializer, ConfigDict
+from typing import Literal, Optional
 from datetime import date
+from app.schemas.common import Page
+from app.schemas.employee import EmployeeSummary
 
 class AttendanceBase(BaseModel):
     employee_id: int
@@ -35,5 +37,33 @@ class Attendance(AttendanceBase):
         return str(value)
 
 
+AttendancePage = Page[Attendance]
 
 
+class AttendanceWithEmployee(Attendance):
+    employee: EmployeeSummary
+
+
+AttendanceWithEmployeePage = Page[AttendanceWithEmployee]
+
+
+class AttendanceBulkCreate(BaseModel):
+    records: list[AttendanceCreate] = Field(..., min_length=1, max_length=5000)
+    # "skip" keeps existing marks, "update" overwrites their status
+    on_conflict: Literal["skip", "update"] = "skip"
+
+
+class AttendanceBulkOutcome(BaseModel):
+    index: int
+    employee_id: int
+    date: date
+    outcome: Literal["created", "updated", "skipped", "employee_not_found", "duplicate_in_batch"]
+    id: Optional[int] = None
+
+
+class AttendanceBulkResult(BaseModel):
+    created: int
+    updated: int
+    skipped: int
+    rejected: int
+    results: list[AttendanceBulkOutcome]
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """A single page of a keyset-paginated collection"""
+    items: list[T]
+    next_cursor: Optional[str] = None
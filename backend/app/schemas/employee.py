@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, Field
 from typing import Optional
+from app.schemas.common import Page
 
 class EmployeeBase(BaseModel):
     name: str
@@ -12,3 +13,32 @@ class EmployeeCreate(EmployeeBase):
 class Employee(EmployeeBase):
     id: int
     model_config = ConfigDict(from_attributes=True)
+
+
+EmployeePage = Page[Employee]
+
+# Upper bound on ids per batch lookup; one bind parameter each
+MAX_BATCH_IDS = 5000
+
+
+class EmployeeBatchRequest(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+
+
+class EmployeeBatch(BaseModel):
+    items: list[Employee]  # In request order, without duplicates
+    missing: list[int]  # Requested ids with no employee
+
+
+class EmployeeSummary(BaseModel):
+    """Employee fields embedded in attendance lists"""
+    id: int
+    name: str
+    department: Optional[str] = None
+
+
+class EmployeeSearchHit(Employee):
+    score: float  # 1 for a prefix match plus the best word similarity
+
+
+EmployeeSearchPage = Page[EmployeeSearchHit]
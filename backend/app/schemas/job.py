@@ -0,0 +1,66 @@
+from datetime import date, datetime
+from pydantic import BaseModel, Field, model_validator
+from typing import Annotated, Literal, Optional, Union
+from app.utils.export import ExportFormat
+
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+class AttendanceExportParams(BaseModel):
+    format: ExportFormat = "csv"
+    employee_id: Optional[int] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    department: Optional[str] = None
+
+
+class EmployeeExportParams(BaseModel):
+    format: ExportFormat = "csv"
+    department: Optional[str] = None
+
+
+class AttendanceReportParams(BaseModel):
+    """Per-employee totals and longest streaks over a range of months"""
+    format: ExportFormat = "csv"
+    month_from: str = Field(..., pattern=MONTH_PATTERN, description="First month as YYYY-MM")
+    month_to: str = Field(..., pattern=MONTH_PATTERN, description="Last month as YYYY-MM, inclusive")
+    department: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_range(self):
+        # Zero-padded YYYY-MM strings order like the months they name
+        if self.month_from > self.month_to:
+            raise ValueError("month_from must not be after month_to")
+        return self
+
+
+class AttendanceExportJob(AttendanceExportParams):
+    type: Literal["attendance_export"]
+
+
+class EmployeeExportJob(EmployeeExportParams):
+    type: Literal["employee_export"]
+
+
+class AttendanceReportJob(AttendanceReportParams):
+    type: Literal["attendance_report"]
+
+
+JobCreate = Annotated[
+    Union[AttendanceExportJob, EmployeeExportJob, AttendanceReportJob],
+    Field(discriminator="type"),
+]
+
+
+class JobStatus(BaseModel):
+    id: str
+    type: str
+    state: Literal["queued", "running", "succeeded", "failed"]
+    params: dict
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None  # Results and status are deleted after this
+    error: Optional[str] = None
+    size: Optional[int] = None  # Result size in bytes
+    result_url: Optional[str] = None  # Set once the job has succeeded
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Literal, Optional
+
+
+class FrontendLogEntry(BaseModel):
+    """A structured log entry produced by the frontend StructuredLogger"""
+    model_config = ConfigDict(extra="allow")
+
+    timestamp: Optional[str] = None
+    level: Literal["debug", "info", "warn", "error"] = "info"
+    logger: str = Field("frontend", max_length=100)
+    message: str = Field(..., max_length=4096)
+    correlationId: Optional[str] = Field(None, max_length=100)
+
+
+class LogIngestionResult(BaseModel):
+    accepted: int
+    sampled_out: int
+    rate_limited: int
+    invalid: int
@@ -0,0 +1,44 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+
+class AttendanceSummaryRow(BaseModel):
+    employee_id: Optional[int] = None
+    name: Optional[str] = None
+    department: Optional[str] = None
+    present: int
+    absent: int
+    attendance_rate: float
+
+
+class AttendanceSummary(BaseModel):
+    month: str  # YYYY-MM
+    group_by: Literal["employee", "department"]
+    rows: list[AttendanceSummaryRow]
+    present: int
+    absent: int
+    attendance_rate: float
+
+
+class AttendanceCalendarMonth(BaseModel):
+    """Day bitsets for one month: bit d-1 is set when day d falls in the set"""
+    month: str  # YYYY-MM
+    days: int
+    present: int
+    absent: int
+    unmarked: int
+
+
+class AttendanceCalendarStats(BaseModel):
+    present: int
+    absent: int
+    attendance_rate: float
+    longest_present_streak: int
+    longest_absent_streak: int
+
+
+class AttendanceCalendar(BaseModel):
+    employee_id: int
+    year: int
+    months: list[AttendanceCalendarMonth]  # Months without any marks are omitted
+    stats: AttendanceCalendarStats
@@ -1,4 +1,6 @@
 from app.services.employee_service import EmployeeService
 from app.services.attendance_service import AttendanceService
+from app.services.report_service import ReportService
+from app.services.log_service import LogIngestionService
 
-__all__ = ["EmployeeService", "AttendanceService"]
+__all__ = ["EmployeeService", "AttendanceService", "ReportService", "LogIngestionService"]
@@ -1,33 +1,80 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func, tuple_
+from datetime import date as date_type, datetime
+from typing import AsyncIterator, Optional
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
+from app.core.cache import cache
+from app.core.db import utcnow
+from app.core.events import broadcaster
+from app.core.replicas import is_replica_session
 from app.models.attendance import Attendance as AttendanceModel
 from app.models.employee import Employee as EmployeeModel
-from app.schemas.attendance import AttendanceCreate, Attendance
+from app.schemas.employee import EmployeeSummary
+from app.schemas.attendance import (
+    AttendanceCreate,
+    Attendance,
+    AttendanceBulkCreate,
+    AttendanceBulkOutcome,
+    AttendanceBulkResult,
+)
+from app.services.employee_service import EmployeeService
+from app.services.report_service import ReportService
+from app.utils.fast_json import row_dicts
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.upsert import upsert_insert
+
+
+# Rows per INSERT statement; 3 bind parameters per row keeps each statement
+# well under asyncpg's 32767 parameter limit
+BULK_CHUNK_SIZE = 1000
+
+# Rows fetched per round trip from the server-side cursor during exports
+EXPORT_YIELD_PER = 1000
+
+EXPORT_COLUMNS = ("id", "employee_id", "date", "status")
+
+# Collection version bumped by every attendance write
+ATTENDANCE_VERSION = "attendance"
+
+# Columns selected for list responses, in Attendance schema field order
+LIST_COLUMNS = tuple(getattr(AttendanceModel, name) for name in Attendance.model_fields)
+
+# Employee columns joined in for ?embed=employee, keyed by EmployeeSummary field
+EMBED_COLUMNS = {
+    name: getattr(EmployeeModel, name).label(f"employee_{name}")
+    for name in EmployeeSummary.model_fields
+    if name != "id"
+}
+
+
+def _embedded_rows(rows) -> list[dict]:
+    """Attendance dicts with the joined employee columns nested as employee"""
+    items = []
+    for row in rows:
+        item = {name: getattr(row, name) for name in Attendance.model_fields}
+        item["employee"] = {"id": row.employee_id}
+        for name, column in EMBED_COLUMNS.items():
+            item["employee"][name] = getattr(row, column.key)
+        items.append(item)
+    return items
 
 
 class AttendanceService:
     """Service layer for attendance business logic"""
 
     @staticmethod
-    async def _employee_exists(db: AsyncSession, employee_id: int) -> bool:
-        """Check if an employee exists"""
-        result = await db.execute(
-            select(EmployeeModel).where(EmployeeModel.id == employee_id)
-        )
-        return result.scalar_one_or_none() is not None
+    def _is_foreign_key_violation(exc: IntegrityError) -> bool:
+        """Whether an IntegrityError was raised by the employee foreign key"""
+        if getattr(exc.orig, "sqlstate", None) == "23503":
+            return True
+        return "foreign key" in str(exc.orig).lower()
 
     @staticmethod
     async def mark_attendance(db: AsyncSession, record_data: AttendanceCreate) -> Attendance:
         """Create an attendance record"""
-        # Validate employee exists
-        if not await AttendanceService._employee_exists(db, record_data.employee_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Employee not found"
-            )
-
+        # The employee foreign key doubles as the existence check
         new_record = AttendanceModel(
             employee_id=record_data.employee_id,
             date=record_data.date,
@@ -35,48 +82,209 @@ class AttendanceService:
         )
         db.add(new_record)
         try:
+            await db.flush()
+            await ReportService.refresh_rollup(db, [(new_record.employee_id, new_record.date)])
             await db.commit()
-            await db.refresh(new_record)
-        except IntegrityError:
+        except IntegrityError as exc:
             await db.rollback()
+            if AttendanceService._is_foreign_key_violation(exc):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Employee not found"
+                )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Attendance record already exists for this employee on this date."
             )
+        await cache.bump_version(ATTENDANCE_VERSION)
+        await broadcaster.publish("attendance.created", Attendance.model_validate(new_record).model_dump(mode="json"))
         return new_record
 
     @staticmethod
-    async def get_attendance(db: AsyncSession, employee_id: int) -> list[Attendance]:
-        """Get all attendance records for an employee"""
-        # Validate employee exists
-        if not await AttendanceService._employee_exists(db, employee_id):
+    async def bulk_mark_attendance(db: AsyncSession, payload: AttendanceBulkCreate) -> AttendanceBulkResult:
+        """Create or update many attendance records with set-based statements"""
+        records = payload.records
+        update = payload.on_conflict == "update"
+
+        # Validate every referenced employee in a single query
+        employee_ids = {record.employee_id for record in records}
+        result = await db.execute(
+            select(EmployeeModel.id).where(EmployeeModel.id.in_(employee_ids))
+        )
+        known_ids = set(result.scalars().all())
+
+        # ON CONFLICT cannot touch the same row twice in one statement, so the
+        # last occurrence of an (employee_id, date) pair wins
+        outcomes: dict[int, str] = {}
+        latest: dict[tuple, int] = {}
+        for index, record in enumerate(records):
+            if record.employee_id not in known_ids:
+                outcomes[index] = "employee_not_found"
+                continue
+            key = (record.employee_id, record.date)
+            if key in latest:
+                outcomes[latest[key]] = "duplicate_in_batch"
+            latest[key] = index
+
+        insert = upsert_insert(db)
+        written_ids: dict[tuple, int] = {}
+        now = utcnow()
+        keys = list(latest)
+        try:
+            for start in range(0, len(keys), BULK_CHUNK_SIZE):
+                chunk = keys[start:start + BULK_CHUNK_SIZE]
+                existing: set[tuple] = set()
+                if update:
+                    # RETURNING cannot tell inserted rows from updated ones on a
+                    # partitioned table (xmax is unavailable), so look them up first
+                    found = await db.execute(
+                        select(AttendanceModel.employee_id, AttendanceModel.date).where(
+                            AttendanceModel.employee_id.in_({k[0] for k in chunk}),
+                            AttendanceModel.date.in_({k[1] for k in chunk}),
+                        )
+                    )
+                    existing = {tuple(row) for row in found} & set(chunk)
+
+                stmt = insert(AttendanceModel).values([
+                    {
+                        "employee_id": records[latest[key]].employee_id,
+                        "date": records[latest[key]].date,
+                        "status": records[latest[key]].status,
+                        "updated_at": now,
+                    }
+                    for key in chunk
+                ])
+                if update:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["employee_id", "date"],
+                        set_={"status": stmt.excluded.status, "updated_at": stmt.excluded.updated_at},
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=["employee_id", "date"])
+
+                result = await db.execute(stmt.returning(
+                    AttendanceModel.id, AttendanceModel.employee_id, AttendanceModel.date
+                ))
+                for row in result:
+                    key = (row.employee_id, row.date)
+                    written_ids[key] = row.id
+                    outcomes[latest[key]] = "updated" if key in existing else "created"
+            await ReportService.refresh_rollup(db, written_ids.keys())
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Employee not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Bulk attendance could not be written; no records were saved."
             )
 
+        results = []
+        for index, record in enumerate(records):
+            key = (record.employee_id, record.date)
+            # Rows that hit an existing mark under "skip" are not returned
+            outcome = outcomes.get(index, "skipped")
+            results.append(AttendanceBulkOutcome(
+                index=index,
+                employee_id=record.employee_id,
+                date=record.date,
+                outcome=outcome,
+                id=written_ids.get(key) if outcome in ("created", "updated") else None,
+            ))
+
+        counts = {name: 0 for name in ("created", "updated", "skipped")}
+        for item in results:
+            if item.outcome in counts:
+                counts[item.outcome] += 1
+
+        if written_ids:
+            await cache.bump_version(ATTENDANCE_VERSION)
+            # One event per request rather than per row keeps large imports
+            # from flushing the change feed's replay buffer
+            await broadcaster.publish("attendance.bulk", {
+                "created": counts["created"],
+                "updated": counts["updated"],
+                "records": [
+                    {
+                        "employee_id": employee_id,
+                        "date": day.isoformat(),
+                        "status": records[latest[(employee_id, day)]].status,
+                        "id": record_id,
+                    }
+                    for (employee_id, day), record_id in written_ids.items()
+                ],
+            })
+        return AttendanceBulkResult(
+            **counts,
+            rejected=len(records) - sum(counts.values()),
+            results=results,
+        )
+
+    @staticmethod
+    async def get_attendance(db: AsyncSession, employee_id: int, embed_employee: bool = False) -> list[dict]:
+        """Get all attendance records for an employee as plain column dicts"""
+        # Outer join from the employee so existence and records come back in
+        # one statement; an employee without records yields a single row
+        # whose attendance columns are all None
+        columns = (*LIST_COLUMNS, *EMBED_COLUMNS.values()) if embed_employee else LIST_COLUMNS
         result = await db.execute(
-            select(AttendanceModel).where(AttendanceModel.employee_id == employee_id)
+            select(*columns)
+            .select_from(EmployeeModel)
+            .outerjoin(AttendanceModel, AttendanceModel.employee_id == EmployeeModel.id)
+            .where(EmployeeModel.id == employee_id)
+            .order_by(AttendanceModel.date)
         )
-        return result.scalars().all()
+        rows = result.all()
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Employee not found"
+            )
+        rows = [row for row in rows if row.id is not None]
+        return _embedded_rows(rows) if embed_employee else row_dicts(rows)
 
     @staticmethod
-    async def get_attendance_by_date(db: AsyncSession, employee_id: int, date: str) -> Attendance:
-        """Get attendance record for a specific employee on a specific date"""
-        # Validate employee exists
-        if not await AttendanceService._employee_exists(db, employee_id):
+    async def get_attendance_version(
+        db: AsyncSession, employee_id: int, embed_employee: bool = False
+    ) -> tuple[int, Optional[datetime]]:
+        """Get the record count and latest row version of an employee's attendance"""
+        columns = [func.count(AttendanceModel.id), func.max(AttendanceModel.updated_at)]
+        if embed_employee:
+            columns.append(EmployeeModel.updated_at)
+        result = await db.execute(
+            select(*columns)
+            .select_from(EmployeeModel)
+            .outerjoin(AttendanceModel, AttendanceModel.employee_id == EmployeeModel.id)
+            .where(EmployeeModel.id == employee_id)
+            .group_by(EmployeeModel.id)
+        )
+        row = result.one_or_none()
+        if row is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Employee not found"
             )
+        count, *versions = row
+        versions = [version for version in versions if version is not None]
+        return count, max(versions) if versions else None
 
+    @staticmethod
+    async def get_attendance_by_date(db: AsyncSession, employee_id: int, date: date_type) -> Attendance:
+        """Get attendance record for a specific employee on a specific date"""
         result = await db.execute(
-            select(AttendanceModel).where(
-                (AttendanceModel.employee_id == employee_id) & 
-                (AttendanceModel.date == date)
+            select(EmployeeModel.id, AttendanceModel)
+            .outerjoin(
+                AttendanceModel,
+                (AttendanceModel.employee_id == EmployeeModel.id) & (AttendanceModel.date == date),
             )
+            .where(EmployeeModel.id == employee_id)
         )
-        record = result.scalar_one_or_none()
+        row = result.one_or_none()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Employee not found"
+            )
+        record = row[1]
         if not record:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -85,7 +293,90 @@ class AttendanceService:
         return record
 
     @staticmethod
-    async def get_all_attendance(db: AsyncSession) -> list[Attendance]:
-        """Get all attendance records across all employees"""
-        result = await db.execute(select(AttendanceModel))
-        return result.scalars().all()
+    def _apply_filters(
+        query,
+        employee_id: int | None = None,
+        status: str | None = None,
+        date_from: date_type | None = None,
+        date_to: date_type | None = None,
+        department: str | None = None,
+        join_employee: bool = False,
+    ):
+        """Narrow an attendance query with the optional list filters"""
+        if employee_id is not None:
+            query = query.where(AttendanceModel.employee_id == employee_id)
+        if status is not None:
+            query = query.where(AttendanceModel.status == status)
+        if date_from is not None:
+            query = query.where(AttendanceModel.date >= date_from)
+        if date_to is not None:
+            query = query.where(AttendanceModel.date <= date_to)
+        if department is not None or join_employee:
+            query = query.join(EmployeeModel, EmployeeModel.id == AttendanceModel.employee_id)
+        if department is not None:
+            query = query.where(EmployeeModel.department == department)
+        return query
+
+    @staticmethod
+    async def get_collection_version(db: AsyncSession, include_employees: bool = False) -> str:
+        """Version token of the attendance table, which changes on every write
+
+        Lists that join employees, for a department filter or embedded
+        summaries, also change when an employee does, so their token
+        includes the employee table's.
+        """
+        async def load() -> str:
+            # On a cache miss or a replica: the row count and latest row version
+            count, last_modified = (await db.execute(
+                select(func.count(), func.max(AttendanceModel.updated_at)).select_from(AttendanceModel)
+            )).one()
+            return f"{count}:{last_modified.isoformat() if last_modified else ''}"
+
+        if is_replica_session(db):
+            # A lagging replica's rows must not carry the primary's token
+            version = "replica:" + await load()
+        else:
+            version = await cache.version(ATTENDANCE_VERSION, load)
+        if include_employees:
+            version += "/" + await EmployeeService.get_collection_version(db)
+        return version
+
+    @staticmethod
+    async def get_all_attendance(
+        db: AsyncSession,
+        limit: int,
+        after: str | None = None,
+        embed_employee: bool = False,
+        **filters,
+    ) -> dict:
+        """Get a page of attendance records across all employees, ordered by (date, id)"""
+        # Embedding joins the employee row rather than resolving each
+        # record's employee separately
+        columns = (*LIST_COLUMNS, *EMBED_COLUMNS.values()) if embed_employee else LIST_COLUMNS
+        query = AttendanceService._apply_filters(select(*columns), join_employee=embed_employee, **filters)
+        query = query.order_by(AttendanceModel.date, AttendanceModel.id).limit(limit + 1)
+        if after is not None:
+            last_date, last_id = decode_cursor(after, date_type, int)
+            query = query.where(
+                tuple_(AttendanceModel.date, AttendanceModel.id) > tuple_(last_date, last_id)
+            )
+
+        result = await db.execute(query)
+        rows = result.all()
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last.date, last.id)
+        items = _embedded_rows(rows[:limit]) if embed_employee else row_dicts(rows[:limit])
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    async def stream_attendance(db: AsyncSession, **filters) -> AsyncIterator[tuple]:
+        """Stream attendance rows in (date, id) order through a server-side cursor"""
+        query = AttendanceService._apply_filters(
+            select(*(getattr(AttendanceModel, column) for column in EXPORT_COLUMNS)),
+            **filters,
+        ).order_by(AttendanceModel.date, AttendanceModel.id)
+        result = await db.stream(query.execution_options(yield_per=EXPORT_YIELD_PER))
+        async for row in result:
+            yield tuple(row)
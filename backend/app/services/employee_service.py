@@ -1,9 +1,46 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, case, func, literal, or_
 from sqlalchemy.future import select
+from datetime import datetime
+from typing import AsyncIterator, Optional
+import json
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
+from app.core.cache import cache
+from app.core.db import utcnow
+from app.core.events import broadcaster
+from app.core.replicas import is_replica_session
+from app.core.search import SEARCH_FIELDS, employee_index
 from app.models.employee import Employee as EmployeeModel
 from app.schemas.employee import EmployeeCreate, Employee
+from app.utils.fast_json import row_dicts
+from app.utils.pagination import encode_cursor, decode_cursor
+
+# Rows fetched per round trip from the server-side cursor during exports
+EXPORT_YIELD_PER = 1000
+
+EXPORT_COLUMNS = ("id", "name", "email", "department")
+
+EMPLOYEE_LIST_CACHE_PREFIX = "employees:list:"
+
+# Collection version bumped by every employee write
+EMPLOYEES_VERSION = "employees"
+
+# Columns selected for list pages, in Employee schema field order
+LIST_COLUMNS = tuple(getattr(EmployeeModel, name) for name in Employee.model_fields)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_record(employee) -> dict:
+    return {field: getattr(employee, field) for field in SEARCH_FIELDS}
+
+
+def _employee_cache_key(employee_id: int) -> str:
+    # v2 entries hold the row version next to the record
+    return f"employee:v2:{employee_id}"
 
 
 class EmployeeService:
@@ -27,27 +64,157 @@ class EmployeeService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Employee with this email already exists or invalid data."
             )
+        await cache.invalidate(prefixes=(EMPLOYEE_LIST_CACHE_PREFIX,))
+        await cache.bump_version(EMPLOYEES_VERSION)
+        employee_index.upsert(new_employee.id, _search_record(new_employee))
+        await broadcaster.publish("employee.created", Employee.model_validate(new_employee).model_dump(mode="json"))
         return new_employee
 
     @staticmethod
-    async def get_employee(db: AsyncSession, employee_id: int) -> Employee:
-        """Get a single employee by ID"""
+    async def find_employee(db: AsyncSession, employee_id: int) -> Optional[tuple[Employee, datetime]]:
+        """Get a single employee and its row version through the cache, or None if it does not exist"""
+        key = _employee_cache_key(employee_id)
+        cached = await cache.get(key)
+        if cached is not None:
+            # Cached values were validated when they were stored
+            return Employee.model_construct(**cached["employee"]), datetime.fromisoformat(cached["updated_at"])
+
         result = await db.execute(
             select(EmployeeModel).where(EmployeeModel.id == employee_id)
         )
-        employee = result.scalar_one_or_none()
-        if not employee:
+        row = result.scalar_one_or_none()
+        if row is None:
+            return None
+        employee = Employee.model_validate(row)
+        # A lagging replica's row could outlive the write that replaced it
+        if not is_replica_session(db):
+            await cache.set(key, {"employee": employee.model_dump(mode="json"), "updated_at": row.updated_at.isoformat()})
+        return employee, row.updated_at
+
+    @staticmethod
+    async def get_employee(db: AsyncSession, employee_id: int) -> tuple[Employee, datetime]:
+        """Get a single employee by ID with its row version"""
+        found = await EmployeeService.find_employee(db, employee_id)
+        if not found:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Employee not found"
             )
-        return employee
+        return found
+
+    @staticmethod
+    async def get_employees_by_ids(db: AsyncSession, ids: list[int]) -> dict:
+        """Resolve many employees with a single IN query"""
+        # dict.fromkeys drops duplicates and keeps the request order
+        ids = list(dict.fromkeys(ids))
+        result = await db.execute(select(*LIST_COLUMNS).where(EmployeeModel.id.in_(ids)))
+        found = {row.id: row._asdict() for row in result}
+        return {
+            "items": [found[employee_id] for employee_id in ids if employee_id in found],
+            "missing": [employee_id for employee_id in ids if employee_id not in found],
+        }
+
+    @staticmethod
+    async def get_collection_version(db: AsyncSession) -> str:
+        """Version token of the employee table, which changes on every write"""
+        async def load() -> str:
+            # On a cache miss or a replica: the row count and latest row version
+            count, last_modified = (await db.execute(
+                select(func.count(), func.max(EmployeeModel.updated_at)).select_from(EmployeeModel)
+            )).one()
+            return f"{count}:{last_modified.isoformat() if last_modified else ''}"
+
+        if is_replica_session(db):
+            # A lagging replica's rows must not carry the primary's token
+            return "replica:" + await load()
+        return await cache.version(EMPLOYEES_VERSION, load)
+
+    @staticmethod
+    async def get_employees(
+        db: AsyncSession,
+        limit: int,
+        after: str | None = None,
+        department: str | None = None,
+    ) -> dict:
+        """Get a page of employees ordered by ID"""
+        key = EMPLOYEE_LIST_CACHE_PREFIX + json.dumps([limit, after, department])
+        cached = await cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Plain columns in schema field order skip ORM hydration and
+        # Pydantic validation; the route encodes them directly
+        query = select(*LIST_COLUMNS).order_by(EmployeeModel.id).limit(limit + 1)
+        if department is not None:
+            query = query.where(EmployeeModel.department == department)
+        if after is not None:
+            (last_id,) = decode_cursor(after, int)
+            query = query.where(EmployeeModel.id > last_id)
+
+        result = await db.execute(query)
+        rows = result.all()
+        next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+        page = {"items": row_dicts(rows[:limit]), "next_cursor": next_cursor}
+        if not is_replica_session(db):
+            await cache.set(key, page)
+        return page
+
+    @staticmethod
+    async def search_employees(db: AsyncSession, q: str, limit: int, after: str | None = None) -> dict:
+        """Rank employees by prefix and fuzzy matches on name, email and department"""
+        # Ranked results have no stable keyset, so the cursor carries an offset
+        offset = 0
+        if after is not None:
+            (offset,) = decode_cursor(after, int)
+            if offset < 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid pagination cursor"
+                )
+        query_text = q.strip().lower()
+        if not query_text:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search query must not be blank"
+            )
+
+        if db.get_bind().dialect.name == "postgresql":
+            # Expressions match the pg_trgm and text_pattern_ops indexes
+            fields = [func.lower(getattr(EmployeeModel, field)) for field in SEARCH_FIELDS]
+            term = literal(query_text, String)
+            prefix = or_(*(field.like(_escape_like(query_text) + "%", escape="\\") for field in fields))
+            fuzzy = or_(*(term.op("<%")(field) for field in fields))
+            score = (case((prefix, 1.0), else_=0.0) + func.greatest(
+                *(func.word_similarity(term, field) for field in fields)
+            )).label("score")
+            result = await db.execute(
+                select(*LIST_COLUMNS, score)
+                .where(or_(prefix, fuzzy))
+                .order_by(score.desc(), EmployeeModel.id)
+                .offset(offset)
+                .limit(limit + 1)
+            )
+            hits = [{**row._asdict(), "score": round(row.score, 4)} for row in result]
+        else:
+            await employee_index.ensure_loaded(db, EmployeeModel)
+            hits = [
+                {**{name: record[name] for name in Employee.model_fields}, "score": score}
+                for score, record in employee_index.search(query_text, offset + limit + 1)[offset:]
+            ]
+
+        next_cursor = encode_cursor(offset + limit) if len(hits) > limit else None
+        return {"items": hits[:limit], "next_cursor": next_cursor}
 
     @staticmethod
-    async def get_employees(db: AsyncSession) -> list[Employee]:
-        """Get all employees"""
-        result = await db.execute(select(EmployeeModel))
-        return result.scalars().all()
+    async def stream_employees(db: AsyncSession, department: str | None = None) -> AsyncIterator[tuple]:
+        """Stream employee rows in id order through a server-side cursor"""
+        query = select(*(getattr(EmployeeModel, column) for column in EXPORT_COLUMNS))
+        if department is not None:
+            query = query.where(EmployeeModel.department == department)
+        query = query.order_by(EmployeeModel.id)
+        result = await db.stream(query.execution_options(yield_per=EXPORT_YIELD_PER))
+        async for row in result:
+            yield tuple(row)
 
     @staticmethod
     async def update_employee(db: AsyncSession, employee_id: int, employee_data: EmployeeCreate) -> Employee:
@@ -65,6 +232,7 @@ class EmployeeService:
         employee.name = employee_data.name
         employee.email = employee_data.email
         employee.department = employee_data.department
+        employee.updated_at = utcnow()
 
         try:
             await db.commit()
@@ -75,6 +243,10 @@ class EmployeeService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already in use or invalid data."
             )
+        await cache.invalidate(_employee_cache_key(employee_id), prefixes=(EMPLOYEE_LIST_CACHE_PREFIX,))
+        await cache.bump_version(EMPLOYEES_VERSION)
+        employee_index.upsert(employee.id, _search_record(employee))
+        await broadcaster.publish("employee.updated", Employee.model_validate(employee).model_dump(mode="json"))
         return employee
 
     @staticmethod
@@ -91,3 +263,7 @@ class EmployeeService:
             )
         await db.delete(employee)
         await db.commit()
+        await cache.invalidate(_employee_cache_key(employee_id), prefixes=(EMPLOYEE_LIST_CACHE_PREFIX,))
+        await cache.bump_version(EMPLOYEES_VERSION)
+        employee_index.remove(employee_id)
+        await broadcaster.publish("employee.deleted", {"id": employee_id})
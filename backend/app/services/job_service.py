@@ -0,0 +1,61 @@
+from datetime import date
+from pathlib import Path
+from app.core.jobs import Job, JobOutput, jobs
+from app.core.replicas import replica_set
+from app.schemas.job import AttendanceExportParams, AttendanceReportParams, EmployeeExportParams
+from app.services.attendance_service import AttendanceService, EXPORT_COLUMNS as ATTENDANCE_COLUMNS
+from app.services.employee_service import EmployeeService, EXPORT_COLUMNS as EMPLOYEE_COLUMNS
+from app.services.report_service import REPORT_COLUMNS, ReportService
+from app.utils.export import MEDIA_TYPES, write_export
+
+
+def _month(value: str) -> date:
+    """First day of a YYYY-MM month"""
+    year, month = (int(part) for part in value.split("-"))
+    return date(year, month, 1)
+
+
+class JobService:
+    """Handlers for background report and export jobs"""
+
+    @staticmethod
+    async def export_attendance(job: Job, path: Path) -> JobOutput:
+        """Write attendance records matching the filters as CSV or NDJSON"""
+        params = AttendanceExportParams.model_validate(job.params)
+        async with replica_set.reader(job.read_primary)() as db:
+            rows = AttendanceService.stream_attendance(
+                db,
+                employee_id=params.employee_id,
+                date_from=params.date_from,
+                date_to=params.date_to,
+                department=params.department,
+            )
+            await write_export(rows, ATTENDANCE_COLUMNS, params.format, path)
+        return JobOutput(f"attendance.{params.format}", MEDIA_TYPES[params.format])
+
+    @staticmethod
+    async def export_employees(job: Job, path: Path) -> JobOutput:
+        """Write employees as CSV or NDJSON"""
+        params = EmployeeExportParams.model_validate(job.params)
+        async with replica_set.reader(job.read_primary)() as db:
+            rows = EmployeeService.stream_employees(db, params.department)
+            await write_export(rows, EMPLOYEE_COLUMNS, params.format, path)
+        return JobOutput(f"employees.{params.format}", MEDIA_TYPES[params.format])
+
+    @staticmethod
+    async def attendance_report(job: Job, path: Path) -> JobOutput:
+        """Write per-employee totals and longest streaks over a range of months"""
+        params = AttendanceReportParams.model_validate(job.params)
+        async with replica_set.reader(job.read_primary)() as db:
+            rows = ReportService.stream_span_report(
+                db, _month(params.month_from), _month(params.month_to), params.department
+            )
+            await write_export(rows, REPORT_COLUMNS, params.format, path)
+        filename = f"attendance-report-{params.month_from}-to-{params.month_to}.{params.format}"
+        return JobOutput(filename, MEDIA_TYPES[params.format])
+
+
+# Aggregation is CPU-bound, so few reports run at once; exports mostly wait on the database
+jobs.register("attendance_export", JobService.export_attendance, limit=2)
+jobs.register("employee_export", JobService.export_employees, limit=2)
+jobs.register("attendance_report", JobService.attendance_report, limit=1)
@@ -0,0 +1,159 @@
+import json
+import logging
+import random
+import zlib
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.rate_limit import TokenBucketLimiter
+from app.schemas.log import FrontendLogEntry, LogIngestionResult
+
+frontend_logger = get_logger("mvphrm.frontend")
+
+LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+}
+
+# Levels subject to FRONTEND_LOG_SAMPLE_RATE; warnings and errors are always kept
+SAMPLED_LEVELS = {"debug", "info"}
+
+# Truncation lengths for /api/logs, matching FrontendLogEntry's limits
+LENIENT_MAX_LENGTHS = {"logger": 100, "message": 4096, "correlationId": 100}
+
+limiter = TokenBucketLimiter(settings.FRONTEND_LOG_RATE, settings.FRONTEND_LOG_BURST)
+
+
+class LogIngestionService:
+    """Service layer for validating and forwarding frontend logs"""
+
+    @staticmethod
+    def decode_batch(body: bytes, content_type: str, content_encoding: str) -> list:
+        """Decode a JSON array or NDJSON body, optionally gzip-compressed, into raw entries"""
+        if "gzip" in content_encoding:
+            # Bound the inflated size so a small body cannot expand without limit
+            inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            try:
+                body = inflater.decompress(body, settings.FRONTEND_LOG_MAX_BYTES + 1)
+            except zlib.error:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid gzip body"
+                )
+        if len(body) > settings.FRONTEND_LOG_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Log batch too large"
+            )
+
+        try:
+            if "ndjson" in content_type:
+                entries = [json.loads(line) for line in body.splitlines() if line.strip()]
+            else:
+                entries = json.loads(body)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Log batch must be a JSON array or NDJSON"
+            )
+        if isinstance(entries, dict):
+            entries = [entries]
+        if not isinstance(entries, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Log batch must be a JSON array or NDJSON"
+            )
+        if len(entries) > settings.FRONTEND_LOG_MAX_BATCH:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Log batch exceeds {settings.FRONTEND_LOG_MAX_BATCH} entries"
+            )
+        return entries
+
+    @staticmethod
+    def lenient_entry(raw: dict) -> dict:
+        """Coerce a single /api/logs entry the way that endpoint always accepted it
+
+        Level is case-insensitive with unknown levels logged as info, the
+        message defaults to "Frontend log", and overlong or non-string
+        fields are converted rather than rejected.
+        """
+        entry = dict(raw)
+        level = entry.get("level")
+        level = level.lower() if isinstance(level, str) else "info"
+        entry["level"] = level if level in LEVELS else "info"
+        message = entry.get("message")
+        entry["message"] = "Frontend log" if message is None else str(message)
+        for name, default in (("logger", "frontend"), ("correlationId", None), ("timestamp", None)):
+            value = entry.get(name, default)
+            entry[name] = None if value is None else str(value)
+        for name, max_length in LENIENT_MAX_LENGTHS.items():
+            if entry[name] is not None:
+                entry[name] = entry[name][:max_length]
+        return entry
+
+    @staticmethod
+    def ingest(client_key: str, raw_entries: list) -> LogIngestionResult:
+        """Validate, rate limit and sample entries, then forward them to the logging pipeline"""
+        entries = []
+        invalid = 0
+        for raw in raw_entries:
+            try:
+                entries.append(FrontendLogEntry.model_validate(raw))
+            except ValidationError:
+                invalid += 1
+
+        granted = limiter.acquire(client_key, len(entries))
+        if entries and not granted:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Log rate limit exceeded",
+                headers={"Retry-After": str(max(1, round(limiter.retry_after(client_key))))},
+            )
+        rate_limited = len(entries) - granted
+        # Keep the most severe entries when only part of the batch fits the budget
+        if rate_limited:
+            entries = sorted(entries, key=lambda entry: LEVELS[entry.level], reverse=True)[:granted]
+
+        sampled_out = 0
+        accepted = 0
+        for entry in entries:
+            if (
+                entry.level in SAMPLED_LEVELS
+                and settings.FRONTEND_LOG_SAMPLE_RATE < 1.0
+                and random.random() >= settings.FRONTEND_LOG_SAMPLE_RATE
+            ):
+                sampled_out += 1
+                continue
+            level = LEVELS[entry.level]
+            if not frontend_logger.isEnabledFor(level):
+                continue
+            record = frontend_logger.makeRecord(
+                frontend_logger.name,
+                level,
+                fn="frontend",
+                lno=0,
+                msg=f"[Frontend] {entry.message}",
+                args=None,
+                exc_info=None,
+                extra={
+                    "correlation_id": entry.correlationId,
+                    "frontend_logger": entry.logger,
+                    "frontend_timestamp": entry.timestamp,
+                    # Arbitrary client fields are namespaced so they cannot
+                    # collide with reserved LogRecord attributes
+                    "context": entry.model_extra or None,
+                },
+            )
+            frontend_logger.handle(record)
+            accepted += 1
+
+        return LogIngestionResult(
+            accepted=accepted,
+            sampled_out=sampled_out,
+            rate_limited=rate_limited,
+            invalid=invalid,
+        )
@@ -0,0 +1,299 @@
+import asyncio
+from collections import defaultdict
+from datetime import date
+from typing import AsyncIterator, Iterable, Literal, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import Date, Integer, case, cast, extract, func, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.jobs import jobs
+from app.models.attendance import Attendance as AttendanceModel, AttendanceMonthlyRollup
+from app.models.employee import Employee as EmployeeModel
+from app.schemas.report import (
+    AttendanceCalendar,
+    AttendanceCalendarMonth,
+    AttendanceCalendarStats,
+    AttendanceSummary,
+    AttendanceSummaryRow,
+)
+from app.utils.bitmap import full_mask, longest_run, month_days, span_stats, year_mask
+from app.utils.upsert import upsert_insert
+
+REPORT_COLUMNS = (
+    "employee_id",
+    "name",
+    "department",
+    "present",
+    "absent",
+    "attendance_rate",
+    "longest_present_streak",
+    "longest_absent_streak",
+)
+
+# Rollup rows fetched per round trip while building a report
+REPORT_YIELD_PER = 5000
+
+# Employees summarized per process pool task; large enough that pickling
+# does not dominate, small enough that fetching overlaps the aggregation
+REPORT_CHUNK_EMPLOYEES = 2000
+
+
+def _next_month(month: date) -> date:
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def _rate(present: int, absent: int) -> float:
+    total = present + absent
+    return round(present / total, 4) if total else 0.0
+
+
+def _report_row(stats: tuple) -> tuple:
+    (employee_id, name, department), present, absent, longest_present, longest_absent = stats
+    return (
+        employee_id,
+        name,
+        department,
+        present,
+        absent,
+        _rate(present, absent),
+        longest_present,
+        longest_absent,
+    )
+
+
+class ReportService:
+    """Service layer for attendance reporting backed by the monthly rollup"""
+
+    @staticmethod
+    async def refresh_rollup(db: AsyncSession, keys: Iterable[tuple[int, date]]) -> None:
+        """Recompute the rollup rows touched by the given (employee_id, date) pairs
+
+        Runs inside the caller's transaction so the rollup commits atomically
+        with the attendance write that changed it.
+        """
+        employees_by_month: dict[date, set[int]] = defaultdict(set)
+        for employee_id, day in keys:
+            employees_by_month[day.replace(day=1)].add(employee_id)
+
+        # Each (employee, day) has at most one mark, so summing the day bits
+        # of a month equals OR-ing them and works on every dialect
+        day_bit = literal(1).op("<<")(cast(extract("day", AttendanceModel.date), Integer) - 1)
+
+        insert = upsert_insert(db)
+        for month, employee_ids in employees_by_month.items():
+            source = (
+                select(
+                    AttendanceModel.employee_id,
+                    literal(month, Date),
+                    func.sum(case((AttendanceModel.status == "Present", 1), else_=0)),
+                    func.sum(case((AttendanceModel.status == "Absent", 1), else_=0)),
+                    func.sum(case((AttendanceModel.status == "Present", day_bit), else_=0)),
+                    func.sum(case((AttendanceModel.status == "Absent", day_bit), else_=0)),
+                )
+                .where(
+                    AttendanceModel.employee_id.in_(employee_ids),
+                    AttendanceModel.date >= month,
+                    AttendanceModel.date < _next_month(month),
+                )
+                .group_by(AttendanceModel.employee_id)
+            )
+            stmt = insert(AttendanceMonthlyRollup).from_select(
+                ["employee_id", "month", "present_count", "absent_count", "present_mask", "absent_mask"],
+                source,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["employee_id", "month"],
+                set_={
+                    "present_count": stmt.excluded.present_count,
+                    "absent_count": stmt.excluded.absent_count,
+                    "present_mask": stmt.excluded.present_mask,
+                    "absent_mask": stmt.excluded.absent_mask,
+                },
+            )
+            await db.execute(stmt)
+
+    @staticmethod
+    async def get_summary(
+        db: AsyncSession,
+        month: date,
+        group_by: Literal["employee", "department"],
+    ) -> AttendanceSummary:
+        """Summarize a month's attendance per employee or per department"""
+        if group_by == "employee":
+            query = (
+                select(
+                    EmployeeModel.id,
+                    EmployeeModel.name,
+                    EmployeeModel.department,
+                    AttendanceMonthlyRollup.present_count,
+                    AttendanceMonthlyRollup.absent_count,
+                )
+                .join(AttendanceMonthlyRollup, AttendanceMonthlyRollup.employee_id == EmployeeModel.id)
+                .where(AttendanceMonthlyRollup.month == month)
+                .order_by(EmployeeModel.id)
+            )
+        else:
+            query = (
+                select(
+                    EmployeeModel.department,
+                    func.sum(AttendanceMonthlyRollup.present_count),
+                    func.sum(AttendanceMonthlyRollup.absent_count),
+                )
+                .join(AttendanceMonthlyRollup, AttendanceMonthlyRollup.employee_id == EmployeeModel.id)
+                .where(AttendanceMonthlyRollup.month == month)
+                .group_by(EmployeeModel.department)
+                .order_by(EmployeeModel.department)
+            )
+
+        result = await db.execute(query)
+        rows = []
+        for row in result:
+            if group_by == "employee":
+                employee_id, name, department, present, absent = row
+            else:
+                employee_id, name = None, None
+                department, present, absent = row
+            rows.append(AttendanceSummaryRow(
+                employee_id=employee_id,
+                name=name,
+                department=department,
+                present=present,
+                absent=absent,
+                attendance_rate=_rate(present, absent),
+            ))
+
+        present = sum(row.present for row in rows)
+        absent = sum(row.absent for row in rows)
+        return AttendanceSummary(
+            month=month.strftime("%Y-%m"),
+            group_by=group_by,
+            rows=rows,
+            present=present,
+            absent=absent,
+            attendance_rate=_rate(present, absent),
+        )
+
+    @staticmethod
+    async def get_calendar(db: AsyncSession, employee_id: int, year: int) -> AttendanceCalendar:
+        """Get an employee's attendance for a year as per-month day bitsets"""
+        # Outer join from the employee so a missing employee is told apart
+        # from one without marks in the same statement
+        result = await db.execute(
+            select(
+                EmployeeModel.id,
+                AttendanceMonthlyRollup.month,
+                AttendanceMonthlyRollup.present_mask,
+                AttendanceMonthlyRollup.absent_mask,
+            )
+            .outerjoin(
+                AttendanceMonthlyRollup,
+                (AttendanceMonthlyRollup.employee_id == EmployeeModel.id)
+                & (AttendanceMonthlyRollup.month >= date(year, 1, 1))
+                & (AttendanceMonthlyRollup.month < date(year + 1, 1, 1)),
+            )
+            .where(EmployeeModel.id == employee_id)
+            .order_by(AttendanceMonthlyRollup.month)
+        )
+        rows = result.all()
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Employee not found"
+            )
+
+        months = []
+        present_by_month = []
+        absent_by_month = []
+        for _, month, present_mask, absent_mask in rows:
+            if month is None or not (present_mask or absent_mask):
+                continue
+            days = month_days(month)
+            months.append(AttendanceCalendarMonth(
+                month=month.strftime("%Y-%m"),
+                days=days,
+                present=present_mask,
+                absent=absent_mask,
+                unmarked=full_mask(days) & ~(present_mask | absent_mask),
+            ))
+            present_by_month.append((month, present_mask))
+            absent_by_month.append((month, absent_mask))
+
+        # Streaks carry across months, and only a day of the opposite status
+        # ends one: unmarked days such as weekends are skipped
+        present_days = year_mask(present_by_month)
+        absent_days = year_mask(absent_by_month)
+        present = present_days.bit_count()
+        absent = absent_days.bit_count()
+        return AttendanceCalendar(
+            employee_id=employee_id,
+            year=year,
+            months=months,
+            stats=AttendanceCalendarStats(
+                present=present,
+                absent=absent,
+                attendance_rate=_rate(present, absent),
+                longest_present_streak=longest_run(present_days, absent_days),
+                longest_absent_streak=longest_run(absent_days, present_days),
+            ),
+        )
+
+    @staticmethod
+    async def stream_span_report(
+        db: AsyncSession,
+        first_month: date,
+        last_month: date,
+        department: Optional[str] = None,
+    ) -> AsyncIterator[tuple]:
+        """Stream per-employee totals and longest streaks from first_month through last_month
+
+        Streaks run across month boundaries and skip unmarked days. The
+        bitset aggregation is CPU-bound, so it runs in the job process pool
+        a chunk of employees at a time while the next chunk is fetched.
+        """
+        query = (
+            select(
+                EmployeeModel.id,
+                EmployeeModel.name,
+                EmployeeModel.department,
+                AttendanceMonthlyRollup.month,
+                AttendanceMonthlyRollup.present_mask,
+                AttendanceMonthlyRollup.absent_mask,
+            )
+            .join(AttendanceMonthlyRollup, AttendanceMonthlyRollup.employee_id == EmployeeModel.id)
+            .where(
+                AttendanceMonthlyRollup.month >= first_month,
+                AttendanceMonthlyRollup.month <= last_month,
+            )
+            .order_by(EmployeeModel.id, AttendanceMonthlyRollup.month)
+        )
+        if department is not None:
+            query = query.where(EmployeeModel.department == department)
+
+        async def chunks() -> AsyncIterator[list]:
+            chunk: list = []
+            key = None
+            result = await db.stream(query.execution_options(yield_per=REPORT_YIELD_PER))
+            async for employee_id, name, employee_department, month, present_mask, absent_mask in result:
+                if key is None or key[0] != employee_id:
+                    if len(chunk) >= REPORT_CHUNK_EMPLOYEES:
+                        yield chunk
+                        chunk = []
+                    key = (employee_id, name, employee_department)
+                    chunk.append((key, []))
+                chunk[-1][1].append((month, present_mask, absent_mask))
+            if chunk:
+                yield chunk
+
+        pending = None
+        async for chunk in chunks():
+            task = asyncio.ensure_future(jobs.run_cpu(span_stats, chunk, first_month))
+            if pending is not None:
+                for row in await pending:
+                    yield _report_row(row)
+            pending = task
+        if pending is not None:
+            for row in await pending:
+                yield _report_row(row)
+
@@ -0,0 +1,81 @@
+"""
+Day bitsets for attendance calendars
+
+Bit ``d - 1`` of a month mask is set when day ``d`` is marked. A year (or any
+span of months) is handled as one integer with bit ``n`` for its day
+``n + 1``, so counts and streaks are computed with whole-integer
+operations instead of per-day loops. Streaks count days of one status up
+to the next day of the other, skipping unmarked days.
+"""
+import calendar
+from datetime import date
+from typing import Any, Iterable
+
+
+def month_days(month: date) -> int:
+    return calendar.monthrange(month.year, month.month)[1]
+
+
+def full_mask(days: int) -> int:
+    """Mask with the first ``days`` bits set"""
+    return (1 << days) - 1
+
+
+def year_mask(months: Iterable[tuple[date, int]]) -> int:
+    """Concatenate (first day of month, month mask) pairs of one year into a day-of-year mask"""
+    mask = 0
+    for month, bits in months:
+        offset = month.timetuple().tm_yday - 1
+        mask |= bits << offset
+    return mask
+
+
+def span_mask(months: Iterable[tuple[date, int]], start: date) -> int:
+    """Concatenate (first day of month, month mask) pairs into a mask with bit n for day ``start + n``"""
+    mask = 0
+    for month, bits in months:
+        mask |= bits << (month - start).days
+    return mask
+
+
+def span_stats(items: list[tuple[Any, list[tuple[date, int, int]]]], start: date) -> list[tuple]:
+    """(key, present, absent, longest present run, longest absent run) per (key, months) item
+
+    Months are (first day of month, present mask, absent mask) triples. Takes
+    and returns plain picklable values so report jobs can run it in a
+    worker process.
+    """
+    stats = []
+    for key, months in items:
+        present = span_mask(((month, bits) for month, bits, _ in months), start)
+        absent = span_mask(((month, bits) for month, _, bits in months), start)
+        stats.append((
+            key,
+            present.bit_count(),
+            absent.bit_count(),
+            longest_run(present, absent),
+            longest_run(absent, present),
+        ))
+    return stats
+
+
+def longest_run(mask: int, breaks: int) -> int:
+    """Most set bits of ``mask`` with no bit of ``breaks`` between them
+
+    Streaks count marked days up to the next day of the opposite status:
+    a present streak is the most present days between two absences, and
+    unmarked days (weekends, holidays, days not yet recorded) neither
+    count towards a streak nor end it. ``mask`` and ``breaks`` must not
+    share bits.
+    """
+    # One step per streak rather than per day: each step counts the set
+    # bits from the lowest remaining one up to the next break, then drops them
+    longest = 0
+    while mask:
+        following = breaks & -(mask & -mask)
+        if not following:
+            return max(longest, mask.bit_count())
+        stop = following & -following
+        longest = max(longest, (mask & (stop - 1)).bit_count())
+        mask &= -stop
+    return longest
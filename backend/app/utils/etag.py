@@ -0,0 +1,55 @@
+"""
+Validators for conditional GET requests
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands timestamps back naive; they are written in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag derived from the values that determine a representation"""
+    key = repr(tuple(_utc(part).isoformat() if isinstance(part, datetime) else part for part in parts))
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+def is_not_modified(headers: Headers, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match, or If-Modified-Since when no ETag was sent"""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match uses weak comparison, so W/ prefixes are ignored
+        return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+    if_modified_since = headers.get("if-modified-since")
+    if last_modified is None or if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return _utc(last_modified).replace(microsecond=0) <= _utc(since)
+
+
+def set_validators(headers: MutableHeaders, etag: str, last_modified: Optional[datetime] = None) -> None:
+    headers["ETag"] = etag
+    # Clients may keep the representation but must revalidate before reuse
+    headers["Cache-Control"] = "no-cache"
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    response = Response(status_code=304)
+    set_validators(response.headers, etag, last_modified)
+    return response
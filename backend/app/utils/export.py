@@ -0,0 +1,80 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import date
+from pathlib import Path
+from typing import AsyncIterator, Literal, Sequence
+from starlette.responses import StreamingResponse
+
+ExportFormat = Literal["csv", "ndjson"]
+
+# Rows encoded per chunk handed to the ASGI server
+EXPORT_CHUNK_ROWS = 500
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _json_default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def encode_rows(
+    rows: AsyncIterator[Sequence],
+    columns: Sequence[str],
+    fmt: ExportFormat,
+) -> AsyncIterator[str]:
+    """Encode an async stream of rows as CSV or NDJSON text chunks"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(columns)
+
+    pending = 0
+    async for row in rows:
+        if writer:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(dict(zip(columns, row)), default=_json_default))
+            buffer.write("\n")
+        pending += 1
+        if pending >= EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_response(
+    rows: AsyncIterator[Sequence],
+    columns: Sequence[str],
+    fmt: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Build a streaming download response for an export"""
+    extension = "csv" if fmt == "csv" else "ndjson"
+    return StreamingResponse(
+        encode_rows(rows, columns, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'},
+    )
+
+
+async def write_export(
+    rows: AsyncIterator[Sequence],
+    columns: Sequence[str],
+    fmt: ExportFormat,
+    path: Path,
+) -> None:
+    """Encode an export into a file, e.g. a background job's result"""
+    with path.open("w", encoding="utf-8", newline="") as file:
+        async for chunk in encode_rows(rows, columns, fmt):
+            await asyncio.to_thread(file.write, chunk)
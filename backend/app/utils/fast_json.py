@@ -0,0 +1,17 @@
+from typing import Any
+import orjson
+from starlette.responses import Response
+
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    """Encode plain column data with orjson, bypassing response_model validation
+
+    Only for payloads built from database columns that already match the
+    route's response_model; dates are written as ISO strings.
+    """
+    return Response(orjson.dumps(content), status_code=status_code, media_type="application/json")
+
+
+def row_dicts(rows) -> list[dict]:
+    """Plain dicts from SQLAlchemy rows of selected columns"""
+    return [row._asdict() for row in rows]
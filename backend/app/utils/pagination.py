@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import date
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(*values) -> str:
+    """Encode the keyset values of the last row of a page as an opaque cursor"""
+    raw = json.dumps([v.isoformat() if isinstance(v, date) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _cursor_value(value, expected: type):
+    # Values go straight into keyset comparisons, so a wrong type must not
+    # reach the database, where PostgreSQL rejects it with a server error
+    if expected is int and isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if expected is date and isinstance(value, str):
+        return date.fromisoformat(value)
+    raise ValueError("unexpected cursor value")
+
+
+def decode_cursor(cursor: str, *types: type) -> list:
+    """Decode an opaque cursor back into its keyset values, one of each given type"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("unexpected cursor shape")
+        return [_cursor_value(value, expected) for value, expected in zip(values, types)]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
@@ -0,0 +1,216 @@
+"""
+Drive the backend routes with concurrent clients and report latency
+
+Runs against the app in-process (default) or a running server
+(--base-url). Each scenario is executed by --concurrency clients for
+--requests requests; the report lists throughput, latency percentiles and
+SQL statements per request (taken from the /metrics endpoint).
+
+Usage (from backend/, after benchmarks.seed):
+    DATABASE_URL=sqlite+aiosqlite:///./bench.db python -m benchmarks.loadtest --concurrency 16
+    python -m benchmarks.loadtest --base-url http://localhost:8000 --output results.json
+    python -m benchmarks.loadtest --baseline results.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import httpx
+
+
+@dataclass
+class Scenario:
+    name: str
+    route: str  # route template, used to read per-route SQL metrics
+    method: str
+    build: Callable[[random.Random, dict], tuple[str, Optional[dict]]]
+
+
+def _employee_id(rng: random.Random, ctx: dict) -> int:
+    return rng.randint(1, ctx["employees"])
+
+
+SCENARIOS = [
+    Scenario("list employees", "/employees/", "GET",
+             lambda rng, ctx: ("/employees/?limit=100", None)),
+    Scenario("get employee", "/employees/{id}", "GET",
+             lambda rng, ctx: (f"/employees/{_employee_id(rng, ctx)}", None)),
+    Scenario("list attendance", "/attendance/", "GET",
+             lambda rng, ctx: ("/attendance/?limit=100", None)),
+    Scenario("employee attendance history", "/attendance/{employee_id}", "GET",
+             lambda rng, ctx: (f"/attendance/{_employee_id(rng, ctx)}", None)),
+    Scenario("attendance by date", "/attendance/{employee_id}/{date}", "GET",
+             lambda rng, ctx: (f"/attendance/{_employee_id(rng, ctx)}/{rng.choice(ctx['dates'])}", None)),
+    Scenario("frontend log", "/api/logs", "POST",
+             lambda rng, ctx: ("/api/logs", {"level": "info", "message": "benchmark", "logger": "bench"})),
+]
+
+_METRIC_LINE = re.compile(r'^db_queries_per_request_(sum|count)\{route="([^"]*)"\} ([0-9.e+-]+)$')
+
+
+async def _sql_counters(client: httpx.AsyncClient) -> dict[str, dict[str, float]]:
+    """Read cumulative db_queries_per_request sum/count per route from /metrics"""
+    counters: dict[str, dict[str, float]] = {}
+    response = await client.get("/metrics")
+    for line in response.text.splitlines():
+        match = _METRIC_LINE.match(line)
+        if match:
+            kind, route, value = match.groups()
+            counters.setdefault(route, {})[kind] = float(value)
+    return counters
+
+
+async def _discover(client: httpx.AsyncClient) -> dict:
+    """Find the seeded id range and some attendance dates"""
+    employees = 0
+    after = None
+    while True:
+        page = (await client.get("/employees/", params={"limit": 1000, **({"after": after} if after else {})})).json()
+        if page["items"]:
+            employees = max(employees, page["items"][-1]["id"])
+        after = page["next_cursor"]
+        if not after:
+            break
+    attendance = (await client.get("/attendance/", params={"limit": 1000})).json()["items"]
+    dates = sorted({record["date"] for record in attendance}) or ["2026-01-01"]
+    if not employees:
+        sys.exit("No employees found; run benchmarks.seed first")
+    return {"employees": employees, "dates": dates}
+
+
+@dataclass
+class Result:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+
+async def run_scenario(client, scenario: Scenario, ctx: dict, requests: int, concurrency: int, seed: int) -> Result:
+    result = Result()
+    remaining = requests
+
+    async def worker(worker_id: int) -> None:
+        nonlocal remaining
+        rng = random.Random(seed + worker_id)
+        while remaining > 0:
+            remaining -= 1
+            url, body = scenario.build(rng, ctx)
+            start = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, url, json=body)
+                if response.status_code >= 500 or response.status_code == 429:
+                    result.errors += 1
+            except httpx.HTTPError:
+                result.errors += 1
+            result.latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def main_async(args) -> dict:
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+    else:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=30)
+
+    report = {}
+    async with client:
+        ctx = await _discover(client)
+        selected = [s for s in SCENARIOS if not args.only or s.name in args.only]
+        for scenario in selected:
+            # Warm caches and connections so the first requests do not skew results
+            await run_scenario(client, scenario, ctx, min(50, args.requests), args.concurrency, args.seed)
+            before = await _sql_counters(client)
+            result = await run_scenario(client, scenario, ctx, args.requests, args.concurrency, args.seed)
+            after = await _sql_counters(client)
+
+            route_before = before.get(scenario.route, {})
+            route_after = after.get(scenario.route, {})
+            observed = route_after.get("count", 0) - route_before.get("count", 0)
+            queries = route_after.get("sum", 0) - route_before.get("sum", 0)
+            report[scenario.name] = {
+                "requests": len(result.latencies),
+                "errors": result.errors,
+                "throughput_rps": round(len(result.latencies) / result.elapsed, 1),
+                "p50_ms": round(_percentile(result.latencies, 50) * 1000, 2),
+                "p95_ms": round(_percentile(result.latencies, 95) * 1000, 2),
+                "p99_ms": round(_percentile(result.latencies, 99) * 1000, 2),
+                "mean_ms": round(statistics.fmean(result.latencies) * 1000, 2),
+                "db_queries_per_request": round(queries / observed, 2) if observed else None,
+            }
+    return report
+
+
+def _print_report(report: dict) -> None:
+    header = f"{'scenario':<30}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'q/req':>7}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, row in report.items():
+        queries = "-" if row["db_queries_per_request"] is None else f"{row['db_queries_per_request']:.1f}"
+        print(
+            f"{name:<30}{row['throughput_rps']:>9.1f}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+            f"{row['p99_ms']:>9.2f}{queries:>7}{row['errors']:>8}"
+        )
+
+
+def _regressions(report: dict, baseline: dict, max_regression: float) -> list[str]:
+    failures = []
+    for name, row in report.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if row["p95_ms"] > previous["p95_ms"] * (1 + max_regression):
+            failures.append(f"{name}: p95 {previous['p95_ms']}ms -> {row['p95_ms']}ms")
+        before_q, after_q = previous.get("db_queries_per_request"), row["db_queries_per_request"]
+        # Cache hit rates make the average noisy; flag structural changes only
+        if before_q is not None and after_q is not None and after_q - before_q >= 0.5:
+            failures.append(f"{name}: queries/request {before_q} -> {after_q}")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent load test for the MVPHRM backend")
+    parser.add_argument("--base-url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", nargs="*", help="Scenario names to run")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write the report as JSON")
+    parser.add_argument("--baseline", help="Compare against a previous JSON report")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed relative p95 increase")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+    if args.baseline:
+        with open(args.baseline) as handle:
+            failures = _regressions(report, json.load(handle), args.max_regression)
+        if failures:
+            print("\nRegressions against baseline:")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
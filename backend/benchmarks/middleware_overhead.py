@@ -0,0 +1,125 @@
+"""
+Measure the per-request overhead of the request logging middleware
+
+Compares a bare Starlette app, the previous BaseHTTPMiddleware-based
+logger (reproduced below for reference) and the current pure ASGI
+LoggingMiddleware. Log output is discarded so only the middleware
+mechanics and record formatting are measured.
+
+Usage (from backend/):
+    python -m benchmarks.middleware_overhead --requests 5000
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+import uuid
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from app.core.logging import api_logger
+from app.core.middleware import LoggingMiddleware
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware implementation LoggingMiddleware replaced"""
+
+    async def dispatch(self, request: Request, call_next):
+        correlation_id = request.headers.get("X-Correlation-ID", str(uuid.uuid4()))
+        request.state.correlation_id = correlation_id
+        start_time = time.time()
+
+        if request.method in ["POST", "PUT", "PATCH"]:
+            request_body = await request.body()
+
+            async def receive():
+                return {"type": "http.request", "body": request_body}
+            request._receive = receive
+
+        api_logger.info("Request started", extra={
+            "correlation_id": correlation_id,
+            "method": request.method,
+            "path": request.url.path,
+            "query_params": dict(request.query_params),
+            "client": request.client.host if request.client else None,
+            "user_agent": request.headers.get("user-agent"),
+        })
+        response = await call_next(request)
+        response.headers["X-Correlation-ID"] = correlation_id
+        api_logger.info("Request completed", extra={
+            "correlation_id": correlation_id,
+            "method": request.method,
+            "path": request.url.path,
+            "status_code": response.status_code,
+            "duration_ms": (time.time() - start_time) * 1000,
+            "response_size": response.headers.get("content-length", "unknown"),
+        })
+        return response
+
+
+async def echo(request: Request):
+    payload = await request.json() if request.method == "POST" else {"status": "ok"}
+    return JSONResponse(payload)
+
+
+def build_app(middleware_class=None) -> Starlette:
+    middleware = [Middleware(middleware_class)] if middleware_class else []
+    return Starlette(
+        routes=[Route("/echo", echo, methods=["GET", "POST"])],
+        middleware=middleware,
+    )
+
+
+async def measure(app: Starlette, requests: int, method: str) -> list[float]:
+    transport = httpx.ASGITransport(app=app)
+    body = {"employee_id": 1, "date": "2026-10-01", "status": "Present"}
+    timings = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):  # warm-up
+            await client.request(method, "/echo", json=body if method == "POST" else None)
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.request(method, "/echo", json=body if method == "POST" else None)
+            timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    # Discard log output; formatting still happens
+    devnull = open(os.devnull, "w")
+    for handler in api_logger.handlers:
+        if isinstance(handler, logging.StreamHandler):
+            handler.setStream(devnull)
+
+    variants = [
+        ("no middleware", None),
+        ("BaseHTTPMiddleware (legacy)", LegacyLoggingMiddleware),
+        ("pure ASGI LoggingMiddleware", LoggingMiddleware),
+    ]
+    for method in ("GET", "POST"):
+        print(f"\n{method} /echo, {args.requests} sequential requests")
+        baseline = None
+        for name, middleware_class in variants:
+            timings = asyncio.run(measure(build_app(middleware_class), args.requests, method))
+            median = statistics.median(timings)
+            p99 = statistics.quantiles(timings, n=100)[98]
+            if baseline is None:
+                baseline = median
+            print(
+                f"  {name:<30} median {median:8.1f} us  p99 {p99:8.1f} us  "
+                f"overhead {median - baseline:+8.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
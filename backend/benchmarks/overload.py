@@ -0,0 +1,110 @@
+"""
+Compare behaviour under a burst of heavy requests with and without admission control
+
+Starts uvicorn twice, with ADMISSION_ENABLED=false and true, and in each
+fires --heavy-concurrency clients looping on a heavy route while
+--light-concurrency clients fetch single employees. Prints status counts
+and latency percentiles per class: with admission control, light reads
+should keep low latency and heavy requests should be shed with 503
+instead of every request slowing down together.
+
+Usage (from backend/, after benchmarks.seed):
+    python -m benchmarks.overload --duration 20 --heavy-concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+import httpx
+from benchmarks.workers import _free_port, _wait_ready
+
+DEFAULT_HEAVY_PATH = "/attendance/?limit=1000&embed=employee"
+
+
+def _percentile(values: list[float], share: float) -> float:
+    if not values:
+        return 0.0
+    return sorted(values)[min(int(len(values) * share), len(values) - 1)]
+
+
+async def _client(client: httpx.AsyncClient, paths, deadline: float, statuses: Counter, latencies: list) -> None:
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(paths())
+            status = response.status_code
+        except httpx.HTTPError as exc:
+            status = type(exc).__name__
+        elapsed = (time.perf_counter() - start) * 1000
+        statuses[status] += 1
+        if status == 200:
+            latencies.append(elapsed)
+        elif status == 503:
+            # Honour Retry-After loosely, as a well-behaved client would
+            await asyncio.sleep(0.5)
+
+
+async def run_load(base_url: str, args) -> dict:
+    deadline = time.monotonic() + args.duration
+    limits = httpx.Limits(max_connections=args.heavy_concurrency + args.light_concurrency)
+    results = {name: (Counter(), []) for name in ("heavy", "light")}
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        heavy = [
+            _client(client, lambda: args.heavy_path, deadline, *results["heavy"])
+            for _ in range(args.heavy_concurrency)
+        ]
+        light = [
+            _client(client, lambda: f"/employees/{random.randint(1, args.employees)}", deadline, *results["light"])
+            for _ in range(args.light_concurrency)
+        ]
+        await asyncio.gather(*heavy, *light)
+    return results
+
+
+def _print_results(name: str, results: dict) -> None:
+    print(f"\n{name}")
+    print(f"{'class':<8}{'ok':>8}{'503':>8}{'other':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route_class, (statuses, latencies) in results.items():
+        other = sum(count for status, count in statuses.items() if status not in (200, 503))
+        print(
+            f"{route_class:<8}{statuses[200]:>8}{statuses[503]:>8}{other:>8}"
+            f"{statistics.median(latencies) if latencies else 0:>10.1f}"
+            f"{_percentile(latencies, 0.95):>10.1f}{_percentile(latencies, 0.99):>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of load per server")
+    parser.add_argument("--heavy-concurrency", type=int, default=200)
+    parser.add_argument("--light-concurrency", type=int, default=8)
+    parser.add_argument("--heavy-path", default=DEFAULT_HEAVY_PATH)
+    parser.add_argument("--employees", type=int, default=10000, help="Light reads pick ids up to this")
+    args = parser.parse_args()
+
+    for enabled in ("false", "true"):
+        port = _free_port()
+        env = {**os.environ, "ADMISSION_ENABLED": enabled, "ENABLE_REQUEST_LOGGING": "false"}
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            _wait_ready(base_url)
+            results = asyncio.run(run_load(base_url, args))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+        _print_results(f"ADMISSION_ENABLED={enabled}", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Seed synthetic employees and attendance history for benchmarks
+
+Creates the schema if needed and writes deterministic data: `--employees`
+employees spread over departments and `--days` days of weekday attendance
+per employee, plus the matching monthly rollup rows and day bitsets.
+
+Usage (from backend/):
+    DATABASE_URL=sqlite+aiosqlite:///./bench.db python -m benchmarks.seed --employees 2000 --days 730
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from sqlalchemy import delete, insert, text
+from app.core.db import Base, engine
+from app.models.attendance import Attendance, AttendanceMonthlyRollup
+from app.models.employee import Employee
+
+DEPARTMENTS = ["Engineering", "Sales", "Support", "Finance", "HR", "Operations", "Legal", "Marketing"]
+
+# Rows per INSERT; keeps SQLite under its bind parameter limit
+CHUNK_ROWS = 5000 // 4
+
+
+async def _insert_chunks(conn, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), CHUNK_ROWS):
+        await conn.execute(insert(table), rows[start:start + CHUNK_ROWS])
+
+
+async def seed(employees: int, days: int, end: date, absence_rate: float, seed_value: int) -> dict:
+    rng = random.Random(seed_value)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for table in (AttendanceMonthlyRollup, Attendance, Employee):
+            await conn.execute(delete(table))
+
+        await _insert_chunks(conn, Employee, [
+            {
+                "id": employee_id,
+                "name": f"Employee {employee_id:06d}",
+                "email": f"employee{employee_id:06d}@example.com",
+                "department": DEPARTMENTS[employee_id % len(DEPARTMENTS)],
+            }
+            for employee_id in range(1, employees + 1)
+        ])
+
+        workdays = [
+            end - timedelta(days=offset)
+            for offset in range(days)
+            if (end - timedelta(days=offset)).weekday() < 5
+        ]
+        rows = []
+        # present_count, absent_count, present_mask, absent_mask
+        rollup: dict[tuple, list[int]] = defaultdict(lambda: [0, 0, 0, 0])
+        attendance_id = 0
+        for day in sorted(workdays):
+            for employee_id in range(1, employees + 1):
+                attendance_id += 1
+                present = rng.random() >= absence_rate
+                rows.append({
+                    "id": attendance_id,
+                    "employee_id": employee_id,
+                    "date": day,
+                    "status": "Present" if present else "Absent",
+                })
+                month_rollup = rollup[(employee_id, day.replace(day=1))]
+                month_rollup[0 if present else 1] += 1
+                month_rollup[2 if present else 3] |= 1 << (day.day - 1)
+            if len(rows) >= 50_000:
+                await _insert_chunks(conn, Attendance, rows)
+                rows.clear()
+        await _insert_chunks(conn, Attendance, rows)
+
+        await _insert_chunks(conn, AttendanceMonthlyRollup, [
+            {
+                "employee_id": employee_id,
+                "month": month,
+                "present_count": present,
+                "absent_count": absent,
+                "present_mask": present_mask,
+                "absent_mask": absent_mask,
+            }
+            for (employee_id, month), (present, absent, present_mask, absent_mask) in rollup.items()
+        ])
+
+        if conn.dialect.name == "postgresql":
+            # Explicit ids bypass the serial sequences; move them past the seeded rows
+            for table in ("employees", "attendance"):
+                await conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"COALESCE((SELECT max(id) FROM {table}), 1))"
+                ))
+
+    await engine.dispose()
+    return {"employees": employees, "workdays": len(workdays), "attendance_rows": attendance_id}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed synthetic MVPHRM data")
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=365, help="Calendar days of history ending at --end")
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--absence-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = asyncio.run(seed(args.employees, args.days, args.end, args.absence_rate, args.seed))
+    print(f"Seeded {summary} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
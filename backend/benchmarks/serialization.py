@@ -0,0 +1,139 @@
+"""
+Measure the list endpoints' read path: ORM hydration versus plain columns
+
+Pages through the whole employee and attendance collections with the
+current routes (column rows encoded with orjson) and with the previous
+implementation, which loaded ORM instances and validated them through the
+Pydantic response models (reproduced below for reference). Both run in
+one bare FastAPI app, without middleware, so only the read path differs.
+The employee list cache is cleared before every request.
+
+Usage (from backend/):
+    python -m benchmarks.seed --employees 100000 --days 1 --end 2026-10-14
+    python -m benchmarks.serialization --limit 1000 --rounds 3
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date
+import httpx
+from fastapi import Depends, FastAPI, Query
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.api import attendance, employees
+from app.core.cache import cache
+from app.core.db import dispose_engine, get_db
+from app.models.attendance import Attendance as AttendanceModel
+from app.models.employee import Employee as EmployeeModel
+from app.schemas.attendance import Attendance, AttendancePage
+from app.schemas.employee import Employee, EmployeePage
+from app.services.employee_service import EMPLOYEE_LIST_CACHE_PREFIX
+from app.utils.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+
+
+async def legacy_list_employees(
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """The ORM-based employee page the column read path replaced"""
+    query = select(EmployeeModel).order_by(EmployeeModel.id).limit(limit + 1)
+    if after is not None:
+        (last_id,) = decode_cursor(after, int)
+        query = query.where(EmployeeModel.id > last_id)
+    rows = (await db.execute(query)).scalars().all()
+    return EmployeePage(
+        items=[Employee.model_validate(row) for row in rows[:limit]],
+        next_cursor=encode_cursor(rows[limit - 1].id) if len(rows) > limit else None,
+    )
+
+
+async def legacy_list_attendance(
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """The ORM-based attendance page the column read path replaced"""
+    query = select(AttendanceModel).order_by(AttendanceModel.date, AttendanceModel.id).limit(limit + 1)
+    if after is not None:
+        last_date, last_id = decode_cursor(after, date, int)
+        query = query.where(
+            tuple_(AttendanceModel.date, AttendanceModel.id) > tuple_(last_date, last_id)
+        )
+    rows = (await db.execute(query)).scalars().all()
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(rows[limit - 1].date, rows[limit - 1].id)
+    return AttendancePage(
+        items=[Attendance.model_validate(row) for row in rows[:limit]],
+        next_cursor=next_cursor,
+    )
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(employees.router)
+    app.include_router(attendance.router)
+    app.add_api_route("/legacy/employees/", legacy_list_employees, response_model=EmployeePage)
+    app.add_api_route("/legacy/attendance/", legacy_list_attendance, response_model=AttendancePage)
+    return app
+
+
+async def walk(client: httpx.AsyncClient, path: str, limit: int) -> tuple[int, int, list[float]]:
+    """Follow next_cursor through a collection; returns (rows, bytes, per-page ms)"""
+    rows = size = 0
+    timings = []
+    after = None
+    while True:
+        params = {"limit": limit}
+        if after:
+            params["after"] = after
+        await cache.invalidate(prefixes=(EMPLOYEE_LIST_CACHE_PREFIX,))
+        start = time.perf_counter()
+        response = await client.get(path, params=params)
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        page = response.json()
+        rows += len(page["items"])
+        size += len(response.content)
+        after = page["next_cursor"]
+        if after is None:
+            return rows, size, timings
+
+
+async def run(limit: int, rounds: int) -> None:
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for collection in ("employees", "attendance"):
+            print(f"\nGET /{collection}/ with limit={limit}, {rounds} full walk(s)")
+            results = {}
+            for name, path in (("ORM + Pydantic (legacy)", f"/legacy/{collection}/"), ("columns + orjson", f"/{collection}/")):
+                await walk(client, path, limit)  # warm-up
+                totals, pages = [], []
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    rows, size, timings = await walk(client, path, limit)
+                    totals.append(time.perf_counter() - start)
+                    pages.extend(timings)
+                results[name] = statistics.median(totals)
+                print(
+                    f"  {name:<24} {rows} rows, {size / 1e6:.1f} MB  total {results[name]:6.2f} s  "
+                    f"page median {statistics.median(pages):6.1f} ms"
+                )
+            legacy, current = results.values()
+            print(f"  speed-up {legacy / current:.2f}x")
+    await dispose_engine()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limit", type=int, default=MAX_PAGE_SIZE)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.limit, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Profile cold start: import cost of app.main and time to the first response
+
+Imports the app in fresh interpreters with -X importtime and reports the
+median total and a breakdown of self time by top-level package and by the
+slowest app modules. It then starts uvicorn repeatedly and measures the
+time from process launch until /health answers, plus the latency of the
+first and second request to a few routes, which includes work deferred
+to first use.
+
+Pass --max-import-ms and --max-ready-ms to fail (exit status 1) when the
+medians exceed a budget. The import budget is also enforced by
+tests/test_startup.py, which runs with the rest of the test suite.
+
+Usage (from backend/, with DATABASE_URL set):
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --max-import-ms 1200 --max-ready-ms 2500
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+import httpx
+
+FIRST_REQUEST_PATHS = ("/employees/?limit=1", "/employees/1", "/attendance/?limit=1", "/employees/search?q=a")
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_profile() -> tuple[float, dict[str, float]]:
+    """Total import time of app.main and self time per module, in ms"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0.0
+    modules: dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = int(self_us) / 1000
+        if name == "app.main" and not indent:
+            total = int(cumulative_us) / 1000
+    return total, modules
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def ready_profile() -> tuple[float, dict[str, tuple[float, float]]]:
+    """Launch-to-ready time and first/second request latency per path, in ms"""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        env={**os.environ, "ENABLE_REQUEST_LOGGING": "false"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=base_url, timeout=10) as client:
+            while True:
+                if process.poll() is not None:
+                    sys.exit("Server exited during startup")
+                try:
+                    if client.get("/health").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.005)
+            ready = (time.perf_counter() - start) * 1000
+
+            latencies = {}
+            for path in FIRST_REQUEST_PATHS:
+                timings = []
+                for _ in range(2):
+                    request_start = time.perf_counter()
+                    client.get(path)
+                    timings.append((time.perf_counter() - request_start) * 1000)
+                latencies[path] = (timings[0], timings[1])
+            return ready, latencies
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def _package(module: str) -> str:
+    # app modules are reported individually below; group the rest by distribution
+    return "app" if module.startswith("app.") or module == "app" else module.split(".")[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12, help="Rows in each breakdown")
+    parser.add_argument("--max-import-ms", type=float, help="Fail when the median import time exceeds this")
+    parser.add_argument("--max-ready-ms", type=float, help="Fail when the median launch-to-ready time exceeds this")
+    args = parser.parse_args()
+
+    totals = []
+    self_times: dict[str, list[float]] = defaultdict(list)
+    for _ in range(args.runs):
+        total, modules = import_profile()
+        totals.append(total)
+        for name, self_ms in modules.items():
+            self_times[name].append(self_ms)
+    medians = {name: statistics.median(values) for name, values in self_times.items()}
+    import_ms = statistics.median(totals)
+
+    packages: dict[str, float] = defaultdict(float)
+    for name, self_ms in medians.items():
+        packages[_package(name)] += self_ms
+    print(f"import app.main: {import_ms:.0f} ms (median of {args.runs})\n")
+    print(f"{'package':<32}{'self ms':>9}")
+    for name, self_ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<32}{self_ms:>9.1f}")
+    print(f"\n{'app module':<48}{'self ms':>9}")
+    app_modules = [(name, ms) for name, ms in medians.items() if _package(name) == "app"]
+    for name, self_ms in sorted(app_modules, key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<48}{self_ms:>9.1f}")
+
+    readies = []
+    latencies: dict[str, list[tuple[float, float]]] = defaultdict(list)
+    for _ in range(args.runs):
+        ready, first_requests = ready_profile()
+        readies.append(ready)
+        for path, timings in first_requests.items():
+            latencies[path].append(timings)
+    ready_ms = statistics.median(readies)
+    print(f"\nlaunch to /health ready: {ready_ms:.0f} ms (median of {args.runs})\n")
+    print(f"{'first requests':<32}{'1st ms':>9}{'2nd ms':>9}")
+    for path, timings in latencies.items():
+        first = statistics.median(timing[0] for timing in timings)
+        second = statistics.median(timing[1] for timing in timings)
+        print(f"{path:<32}{first:>9.1f}{second:>9.1f}")
+
+    failures = []
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        failures.append(f"import {import_ms:.0f} ms > budget {args.max_import_ms:.0f} ms")
+    if args.max_ready_ms is not None and ready_ms > args.max_ready_ms:
+        failures.append(f"launch to ready {ready_ms:.0f} ms > budget {args.max_ready_ms:.0f} ms")
+    if failures:
+        print("\nStartup budget exceeded:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
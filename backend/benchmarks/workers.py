@@ -0,0 +1,100 @@
+"""
+Compare throughput of the single uvicorn process with the gunicorn profile
+
+Starts each server as a subprocess on a free port, runs the load test
+scenarios against it over HTTP, and prints requests per second side by
+side. The load generator runs in this process and competes for the same
+CPUs, so run it on a machine with more cores than --workers, or point
+separate load generators at each server with benchmarks.loadtest.
+
+Usage (from backend/, after benchmarks.seed):
+    python -m benchmarks.workers --workers 4 --concurrency 64 --requests 4000
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import httpx
+from benchmarks.loadtest import _print_report, main_async
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start(command: list[str], env: dict) -> subprocess.Popen:
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    sys.exit(f"Server at {base_url} did not become ready")
+
+
+def run_server(name: str, command: list[str], port: int, env: dict, args) -> dict:
+    base_url = f"http://127.0.0.1:{port}"
+    process = _start(command, env)
+    try:
+        _wait_ready(base_url)
+        print(f"\n{name}")
+        report = asyncio.run(main_async(argparse.Namespace(
+            base_url=base_url,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            only=args.only,
+            seed=args.seed,
+        )))
+        _print_report(report)
+        return report
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--only", nargs="*", help="Scenario names to run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # Request logging would dominate both profiles' CPU time
+    env = {**os.environ, "ENABLE_REQUEST_LOGGING": "false"}
+    single_port, multi_port = _free_port(), _free_port()
+    single = run_server(
+        "uvicorn, 1 process (previous Dockerfile CMD)",
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(single_port)],
+        single_port,
+        env,
+        args,
+    )
+    multi = run_server(
+        f"gunicorn.conf.py, {args.workers} workers",
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "-b", f"127.0.0.1:{multi_port}", "app.main:app"],
+        multi_port,
+        {**env, "WEB_CONCURRENCY": str(args.workers)},
+        args,
+    )
+
+    print(f"\n{'scenario':<30}{'1 process rps':>15}{'gunicorn rps':>15}{'speed-up':>10}")
+    for name, row in single.items():
+        other = multi[name]["throughput_rps"]
+        print(f"{name:<30}{row['throughput_rps']:>15.1f}{other:>15.1f}{other / row['throughput_rps']:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
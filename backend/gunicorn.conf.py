@@ -0,0 +1,93 @@
+"""
+Gunicorn configuration for production
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Runs one uvicorn worker (uvloop event loop, httptools parser) per CPU
+available to the container; WEB_CONCURRENCY overrides the count. The app
+is imported once in the master and forked, so workers start quickly and
+share imported code; anything holding connections or threads is re-created
+per worker in post_fork.
+
+State kept in worker memory is not shared between workers: use
+CACHE_BACKEND=redis and EVENTS_BACKEND=postgres when running more than one.
+"""
+import glob
+import os
+import shutil
+import tempfile
+
+
+def _available_cpus() -> int:
+    # Honours CPU affinity (e.g. docker --cpuset-cpus), unlike os.cpu_count()
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY") or _available_cpus())
+worker_class = "app.core.workers.UvicornWorker"
+preload_app = True
+
+# Idle keep-alive, kept above the 60s idle timeout of common load balancers
+# so they never reuse a connection the worker has just closed
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "75"))
+# A worker that fails to heartbeat for this long (a blocked event loop) is restarted
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+# Time to finish in-flight requests on restart or shutdown before SIGKILL
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# Recycle workers after this many requests (0 disables), staggered by the jitter
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+
+# Requests are logged by the app's LoggingMiddleware
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+
+_metrics_dir = None
+if workers > 1 and "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    # Must be set before prometheus_client is imported with the app
+    _metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="mvphrm-metrics-")
+
+
+def on_starting(server):
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        # Files left by a previous run would be summed into the new one
+        for path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(path)
+
+
+def when_ready(server):
+    from app.core.config import settings
+
+    if server.cfg.workers > 1:
+        if settings.CACHE_BACKEND == "local":
+            server.log.warning("CACHE_BACKEND=local: cache invalidations do not reach other workers")
+        if settings.EVENTS_BACKEND == "local":
+            server.log.warning("EVENTS_BACKEND=local: change feed clients only see their own worker's writes")
+
+
+def post_fork(server, worker):
+    from app.core.db import reset_engine_after_fork
+    from app.core.logging import reinit_logging_after_fork
+    from app.core.replicas import replica_set
+
+    reset_engine_after_fork()
+    replica_set.reset_after_fork()
+    reinit_logging_after_fork()
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def on_exit(server):
+    if _metrics_dir:
+        shutil.rmtree(_metrics_dir, ignore_errors=True)
@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+# Settings are read at import, so the test database is chosen before the app loads
+_DATABASE = os.path.join(tempfile.mkdtemp(prefix="mvphrm-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DATABASE}"
+os.environ["DATABASE_READ_REPLICA_URLS"] = ""
+os.environ["CACHE_BACKEND"] = "local"
+os.environ["ENABLE_REQUEST_LOGGING"] = "false"
+
+import httpx
+import pytest
+from app.core.db import Base, engine
+from app.main import app
+from app.models import attendance, employee  # noqa: F401  registers the tables
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def database():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(database):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+from app.core import admission as admission_module
+from app.core.admission import (
+    HEAVY,
+    LIGHT,
+    RETRY_AFTER,
+    WRITE,
+    AdmissionController,
+    AdmissionRejected,
+    route_class,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def _controller(limit=1, queue_size=10, timeout=5.0) -> AdmissionController:
+    return AdmissionController(limit, {}, queue_size, timeout)
+
+
+async def _waiting(controller: AdmissionController, name: str) -> asyncio.Task:
+    """Start an acquire that has to queue, and let it reach the queue"""
+    task = asyncio.create_task(controller.acquire(name))
+    await asyncio.sleep(0)
+    assert not task.done()
+    return task
+
+
+def test_route_classes():
+    assert route_class("GET", "/employees/7") == LIGHT
+    assert route_class("GET", "/attendance/7/calendar") == LIGHT
+    assert route_class("GET", "/attendance/7/2026-09-01") == LIGHT
+    assert route_class("GET", "/attendance/7") == HEAVY
+    assert route_class("GET", "/employees/") == HEAVY
+    assert route_class("PUT", "/employees/7") == WRITE
+
+
+async def test_waiters_are_woken_light_then_write_then_heavy():
+    controller = _controller()
+    await controller.acquire(WRITE)
+    tasks = {name: await _waiting(controller, name) for name in (HEAVY, WRITE, LIGHT)}
+
+    admitted = []
+    holder = WRITE
+    for _ in tasks:
+        controller.release(holder)
+        await asyncio.sleep(0)
+        (holder,) = [name for name, task in tasks.items() if task.done() and name not in admitted]
+        admitted.append(holder)
+
+    assert admitted == [LIGHT, WRITE, HEAVY]
+
+
+async def test_full_queue_is_rejected():
+    controller = _controller(queue_size=1)
+    await controller.acquire(HEAVY)
+    waiter = await _waiting(controller, HEAVY)
+
+    with pytest.raises(AdmissionRejected) as exc:
+        await controller.acquire(HEAVY)
+
+    assert exc.value.reason == "queue_full"
+    controller.release(HEAVY)
+    await waiter
+    assert controller.running[HEAVY] == 1
+
+
+async def test_wait_times_out():
+    controller = _controller(timeout=0.01)
+    await controller.acquire(HEAVY)
+
+    with pytest.raises(AdmissionRejected) as exc:
+        await controller.acquire(HEAVY)
+
+    assert exc.value.reason == "timeout"
+    assert controller.stats()["heavy_waiting"] == 0
+    assert controller.rejected["timeout"] == 1
+
+
+async def test_slot_granted_to_a_disconnected_client_is_handed_on():
+    controller = _controller()
+    await controller.acquire(HEAVY)
+    gone = await _waiting(controller, HEAVY)
+    next_in_line = await _waiting(controller, HEAVY)
+
+    controller.release(HEAVY)  # grants the slot to the first waiter
+    gone.cancel()  # which disconnects before it runs
+    with pytest.raises(asyncio.CancelledError):
+        await gone
+
+    await asyncio.wait_for(next_in_line, 1)
+    assert controller.active == 1
+    assert controller.running[HEAVY] == 1
+
+
+async def test_overload_answers_503_with_retry_after(client, monkeypatch):
+    monkeypatch.setattr(admission_module, "admission", _controller(limit=0, queue_size=0))
+
+    response = await client.get("/employees/")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == RETRY_AFTER
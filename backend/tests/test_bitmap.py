@@ -0,0 +1,60 @@
+import random
+from datetime import date, timedelta
+from app.utils.bitmap import longest_run, span_stats
+
+WEEKDAYS = sum(1 << day for day in range(28) if day % 7 < 5)  # four weeks starting on a Monday
+
+
+def _reference_run(mask: int, breaks: int, days: int) -> int:
+    longest = run = 0
+    for day in range(days):
+        if breaks >> day & 1:
+            run = 0
+        elif mask >> day & 1:
+            run += 1
+            longest = max(longest, run)
+    return longest
+
+
+def test_unmarked_weekends_do_not_break_a_streak():
+    assert longest_run(WEEKDAYS, 0) == 20
+
+
+def test_opposite_status_ends_a_streak():
+    absent = 1 << 9  # Wednesday of the second week
+    present = WEEKDAYS & ~absent
+    assert longest_run(present, absent) == 12
+    assert longest_run(absent, present) == 1
+
+
+def test_runs_of_breaks_are_skipped_whole():
+    present = 0b1100000111
+    absent = 0b0011111000
+    assert longest_run(present, absent) == 3
+    assert longest_run(absent, present) == 5
+
+
+def test_matches_day_by_day_count():
+    rng = random.Random(7)
+    for _ in range(500):
+        days = rng.randint(1, 400)
+        present = absent = 0
+        for day in range(days):
+            status = rng.choice("pau")
+            if status == "p":
+                present |= 1 << day
+            elif status == "a":
+                absent |= 1 << day
+        assert longest_run(present, absent) == _reference_run(present, absent, days)
+        assert longest_run(absent, present) == _reference_run(absent, present, days)
+
+
+def test_span_stats_streaks_carry_across_months():
+    # Weekdays of the last week of January and the first week of February 2024
+    january = sum(1 << (day - 1) for day in range(29, 32))
+    february = sum(1 << (day - 1) for day in (1, 2, 5, 6, 7, 8, 9))
+    start = date(2024, 1, 1)
+    [(key, present, absent, present_run, absent_run)] = span_stats(
+        [("ada", [(start, january, 0), (start + timedelta(days=31), february, 0)])], start
+    )
+    assert (key, present, absent, present_run, absent_run) == ("ada", 10, 0, 10, 0)
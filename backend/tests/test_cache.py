@@ -0,0 +1,148 @@
+import pytest
+from app.core.cache import VERSION_PREFIX, Cache, CacheBackend, LocalCacheBackend
+from app.services import employee_service
+
+pytestmark = pytest.mark.anyio
+
+
+class FailingBackend(CacheBackend):
+    """Backend that is down, as an unreachable Redis would be"""
+
+    async def get(self, key):
+        raise ConnectionError("cache is down")
+
+    async def set(self, key, value, ttl):
+        raise ConnectionError("cache is down")
+
+    async def add(self, key, value, ttl):
+        raise ConnectionError("cache is down")
+
+    async def delete(self, *keys):
+        raise ConnectionError("cache is down")
+
+    async def delete_prefix(self, prefix):
+        raise ConnectionError("cache is down")
+
+
+@pytest.fixture
+def employee_cache(monkeypatch):
+    """A fresh cache in front of the employee service"""
+    fresh = Cache(LocalCacheBackend(max_entries=100), ttl=60)
+    monkeypatch.setattr(employee_service, "cache", fresh)
+    return fresh
+
+
+def _cached_records(cache: Cache) -> list[str]:
+    """Cached employee records and list pages, leaving out version tokens"""
+    return [key for key in cache.backend._entries if not key.startswith(VERSION_PREFIX)]
+
+
+async def _create_employee(client, name: str, email: str) -> dict:
+    response = await client.post("/employees/", json={"name": name, "email": email, "department": "Ops"})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def test_entry_expires_after_ttl():
+    backend = LocalCacheBackend(max_entries=10)
+    await backend.set("fresh", 1, ttl=60)
+    await backend.set("stale", 2, ttl=0)
+
+    assert await backend.get("fresh") == 1
+    assert await backend.get("stale") is None
+    assert "stale" not in backend._entries
+
+
+async def test_least_recently_used_entry_is_evicted():
+    backend = LocalCacheBackend(max_entries=2)
+    await backend.set("a", 1, ttl=60)
+    await backend.set("b", 2, ttl=60)
+    await backend.get("a")
+    await backend.set("c", 3, ttl=60)
+
+    assert await backend.get("a") == 1
+    assert await backend.get("b") is None
+    assert await backend.get("c") == 3
+
+
+async def test_delete_prefix_leaves_other_keys():
+    backend = LocalCacheBackend(max_entries=10)
+    await backend.set("employees:list:1", [], ttl=60)
+    await backend.set("employees:list:2", [], ttl=60)
+    await backend.set("employee:1", {}, ttl=60)
+    await backend.delete_prefix("employees:list:")
+
+    assert await backend.get("employees:list:1") is None
+    assert await backend.get("employees:list:2") is None
+    assert await backend.get("employee:1") == {}
+
+
+async def test_hits_and_misses_are_counted():
+    cache = Cache(LocalCacheBackend(max_entries=10), ttl=60)
+    assert await cache.get("key") is None
+    await cache.set("key", {"id": 1})
+    assert await cache.get("key") == {"id": 1}
+    assert await cache.get("key") == {"id": 1}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["errors"]) == (2, 1, 0)
+    assert stats["hit_ratio"] == pytest.approx(2 / 3, abs=1e-4)
+
+
+async def test_backend_failures_degrade_to_misses():
+    cache = Cache(FailingBackend(), ttl=60)
+    await cache.set("key", 1)
+    assert await cache.get("key") is None
+    await cache.invalidate("key", prefixes=("prefix",))
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["errors"]) == (0, 1, 3)
+
+
+async def test_single_employee_read_is_cached(client, employee_cache):
+    employee = await _create_employee(client, "Ada", "ada@example.com")
+
+    first = await client.get(f"/employees/{employee['id']}")
+    second = await client.get(f"/employees/{employee['id']}")
+
+    assert first.json() == second.json() == employee
+    assert (employee_cache.hits, employee_cache.misses) == (1, 1)
+
+
+async def test_update_invalidates_record_and_lists(client, employee_cache):
+    employee = await _create_employee(client, "Ada", "ada@example.com")
+    await client.get(f"/employees/{employee['id']}")
+    await client.get("/employees/")
+    assert len(_cached_records(employee_cache)) == 2
+
+    response = await client.put(
+        f"/employees/{employee['id']}",
+        json={"name": "Ada Lovelace", "email": "ada@example.com", "department": "Ops"},
+    )
+    assert response.status_code == 200, response.text
+    assert _cached_records(employee_cache) == []
+
+    assert (await client.get(f"/employees/{employee['id']}")).json()["name"] == "Ada Lovelace"
+    assert (await client.get("/employees/")).json()["items"][0]["name"] == "Ada Lovelace"
+
+
+async def test_create_invalidates_lists(client, employee_cache):
+    await _create_employee(client, "Ada", "ada@example.com")
+    assert len((await client.get("/employees/")).json()["items"]) == 1
+
+    await _create_employee(client, "Grace", "grace@example.com")
+    assert len((await client.get("/employees/")).json()["items"]) == 2
+
+
+async def test_delete_invalidates_record_and_lists(client, employee_cache):
+    employee = await _create_employee(client, "Ada", "ada@example.com")
+    await client.get(f"/employees/{employee['id']}")
+    await client.get("/employees/")
+    assert len(_cached_records(employee_cache)) == 2
+
+    response = await client.delete(f"/employees/{employee['id']}")
+    assert response.status_code == 204, response.text
+    assert _cached_records(employee_cache) == []
+
+    assert (await client.get(f"/employees/{employee['id']}")).status_code == 404
+    assert (await client.get("/employees/")).json()["items"] == []
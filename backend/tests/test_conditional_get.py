@@ -0,0 +1,168 @@
+import os
+import tempfile
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.cache import Cache, LocalCacheBackend
+from app.core.db import Base
+from app.core.replicas import get_read_db
+from app.main import app
+from app.services import attendance_service, employee_service
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    fresh = Cache(LocalCacheBackend(max_entries=100), ttl=60)
+    monkeypatch.setattr(employee_service, "cache", fresh)
+    monkeypatch.setattr(attendance_service, "cache", fresh)
+    return fresh
+
+
+@pytest.fixture
+def statements(database):
+    """SQL statements run while the test executes"""
+    seen: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        seen.append(statement)
+
+    event.listen(database.sync_engine, "before_cursor_execute", record)
+    yield seen
+    event.remove(database.sync_engine, "before_cursor_execute", record)
+
+
+async def _seed(client) -> dict:
+    response = await client.post("/employees/", json={"name": "Ada", "email": "ada@example.com", "department": "Ops"})
+    employee = response.json()
+    response = await client.post(
+        "/attendance/", json={"employee_id": employee["id"], "date": "2026-09-01", "status": "Present"}
+    )
+    assert response.status_code == 201, response.text
+    return employee
+
+
+async def test_cached_list_runs_no_queries(client, fresh_cache, statements):
+    await _seed(client)
+    first = await client.get("/employees/")
+    statements.clear()
+
+    second = await client.get("/employees/")
+    revalidated = await client.get("/employees/", headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.json() == first.json()
+    assert revalidated.status_code == 304
+    assert statements == []
+
+
+async def test_cached_record_runs_no_queries(client, fresh_cache, statements):
+    employee = await _seed(client)
+    first = await client.get(f"/employees/{employee['id']}")
+    statements.clear()
+
+    second = await client.get(f"/employees/{employee['id']}")
+    revalidated = await client.get(f"/employees/{employee['id']}", headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.json() == employee
+    assert second.headers["etag"] == first.headers["etag"]
+    assert revalidated.status_code == 304
+    assert statements == []
+
+
+async def test_attendance_list_version_is_not_recomputed(client, fresh_cache, statements):
+    await _seed(client)
+    await client.get("/attendance/")
+    statements.clear()
+
+    await client.get("/attendance/", params={"limit": 1})
+    await client.get("/attendance/", params={"department": "Ops"})
+
+    assert not any("count(" in statement.lower() for statement in statements)
+
+
+async def test_writes_change_list_etags(client, fresh_cache):
+    employee = await _seed(client)
+    employees = await client.get("/employees/")
+    attendance = await client.get("/attendance/")
+    by_department = await client.get("/attendance/", params={"department": "Ops"})
+
+    await client.put(
+        f"/employees/{employee['id']}",
+        json={"name": "Ada Lovelace", "email": "ada@example.com", "department": "Ops"},
+    )
+
+    response = await client.get("/employees/", headers={"If-None-Match": employees.headers["etag"]})
+    assert response.status_code == 200
+    assert response.json()["items"][0]["name"] == "Ada Lovelace"
+    # Plain attendance lists do not depend on employees; joined ones do
+    response = await client.get("/attendance/", headers={"If-None-Match": attendance.headers["etag"]})
+    assert response.status_code == 304
+    response = await client.get(
+        "/attendance/", params={"department": "Ops"}, headers={"If-None-Match": by_department.headers["etag"]}
+    )
+    assert response.status_code == 200
+
+    await client.post("/attendance/", json={"employee_id": employee["id"], "date": "2026-09-02", "status": "Absent"})
+    response = await client.get("/attendance/", headers={"If-None-Match": attendance.headers["etag"]})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
+
+
+async def test_update_changes_record_etag(client, fresh_cache):
+    employee = await _seed(client)
+    first = await client.get(f"/employees/{employee['id']}")
+
+    await client.put(
+        f"/employees/{employee['id']}",
+        json={"name": "Ada Lovelace", "email": "ada@example.com", "department": "Ops"},
+    )
+    response = await client.get(f"/employees/{employee['id']}", headers={"If-None-Match": first.headers["etag"]})
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Ada Lovelace"
+
+
+async def test_version_load_does_not_replace_a_concurrent_bump(fresh_cache):
+    async def load():
+        # A write commits and bumps the token while the count runs
+        await fresh_cache.bump_version("employees")
+        return "pre-write"
+
+    assert await fresh_cache.version("employees", load) == "pre-write"
+
+    async def unused():
+        raise AssertionError("token should be cached")
+
+    assert await fresh_cache.version("employees", unused) != "pre-write"
+
+
+@pytest.fixture
+async def lagging_replica(database):
+    """Route reads to an empty replica database that has not caught up with the primary"""
+    replica = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'replica.db')}")
+    async with replica.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = sessionmaker(replica, class_=AsyncSession, expire_on_commit=False, info={"replica": True})
+
+    async def replica_db():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_read_db] = replica_db
+    yield
+    app.dependency_overrides.pop(get_read_db, None)
+    await replica.dispose()
+
+
+async def test_replica_reads_do_not_share_the_primary_etag(client, fresh_cache, lagging_replica):
+    await _seed(client)  # the writes leave the primary's token in the cache
+
+    stale = await client.get("/employees/")
+    assert stale.json()["items"] == []
+    app.dependency_overrides.pop(get_read_db)
+
+    response = await client.get("/employees/", headers={"If-None-Match": stale.headers["etag"]})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
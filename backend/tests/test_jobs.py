@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import deque
+import pytest
+from app.core import jobs as jobs_module
+from app.core.config import settings
+from app.core.jobs import Job, JobManager, JobOutput, JobQueueFull, jobs
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = JobManager()
+    manager.result_dir = tmp_path
+    manager.process_workers = 0
+    return manager
+
+
+@pytest.fixture
+def job_dir(tmp_path, monkeypatch):
+    """The app's job manager with its jobs and files in a throwaway directory"""
+    monkeypatch.setattr(jobs, "result_dir", tmp_path)
+    monkeypatch.setattr(jobs, "_jobs", {})
+    monkeypatch.setattr(jobs, "_pending", deque())
+    return tmp_path
+
+
+def _blocking_handler(release: asyncio.Event):
+    async def handler(job: Job, path) -> JobOutput:
+        await release.wait()
+        path.write_text("done")
+        return JobOutput(f"{job.id}.txt", "text/plain")
+    return handler
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_dispatch_respects_type_limits(manager):
+    release = asyncio.Event()
+    manager.register("report", _blocking_handler(release), limit=1)
+    manager.register("export", _blocking_handler(release), limit=2)
+
+    first = manager.submit("report", {})
+    second = manager.submit("report", {})
+    export = manager.submit("export", {})
+    await _settle()
+
+    # The second report waits for the first without holding up the export
+    assert (first.state, second.state, export.state) == ("running", "queued", "running")
+
+    release.set()
+    while manager.stats()["succeeded"] < 3:
+        await asyncio.sleep(0.01)
+    assert manager.result_path(second).read_text() == "done"
+
+
+async def test_full_queue_is_rejected(manager):
+    manager.workers = 0
+    manager.queue_size = 1
+    manager.register("report", _blocking_handler(asyncio.Event()), limit=1)
+    manager.submit("report", {})
+
+    with pytest.raises(JobQueueFull):
+        manager.submit("report", {})
+    assert manager.stats()["rejected"] == 1
+
+
+async def test_job_past_its_timeout_fails(manager, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_TIMEOUT_SECONDS", 0.01)
+    manager.register("report", _blocking_handler(asyncio.Event()), limit=1)
+
+    job = manager.submit("report", {})
+    while job.state != "failed":
+        await asyncio.sleep(0.01)
+
+    assert job.error.startswith("Timed out")
+    assert not manager.result_path(job).exists()
+
+
+def test_sweep_fails_jobs_of_a_previous_process(manager):
+    # Same PID as this process, e.g. PID 1 again after a container restart
+    orphan = Job("a" * 32, "report", {}, created_at=time.time(), state="running", started_at=time.time())
+    manager._save(orphan)
+
+    manager._sweep(time.time())
+
+    assert manager.get(orphan.id).state == "failed"
+
+
+def test_sweep_fails_running_jobs_past_their_timeout(manager, monkeypatch):
+    # The recorded owner looks alive, as a reused PID would
+    monkeypatch.setattr(jobs_module, "_process_alive", lambda pid: True)
+    now = time.time()
+    started = now - settings.JOB_TIMEOUT_SECONDS - settings.JOB_CLEANUP_INTERVAL - 1
+    stuck = Job("b" * 32, "report", {}, created_at=started, state="running", started_at=started, owner=-1)
+    recent = Job("c" * 32, "report", {}, created_at=now, state="running", started_at=now, owner=-1)
+    manager._save(stuck)
+    manager._save(recent)
+
+    manager._sweep(now)
+
+    assert manager.get(stuck.id).state == "failed"
+    assert manager.get(recent.id).state == "running"
+
+
+async def test_submit_answers_503_when_the_queue_is_full(client, job_dir, monkeypatch):
+    monkeypatch.setattr(jobs, "queue_size", 0)
+
+    response = await client.post("/jobs/", json={"type": "employee_export"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "30"
+
+
+async def test_result_states(client, job_dir, monkeypatch):
+    monkeypatch.setattr(jobs, "workers", 0)  # keeps submitted jobs queued
+    queued = (await client.post("/jobs/", json={"type": "employee_export"})).json()
+
+    response = await client.get(f"/jobs/{queued['id']}/result")
+    assert response.status_code == 409
+
+    # Succeeded, but the result file has already been swept away
+    job = jobs.get(queued["id"])
+    job.state = "succeeded"
+    job.expires_at = time.time() + 60
+    response = await client.get(f"/jobs/{queued['id']}/result")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Job result has expired"
+
+    job.expires_at = time.time() - 1
+    response = await client.get(f"/jobs/{queued['id']}")
+    assert response.status_code == 404
@@ -0,0 +1,25 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [
+        {"level": "INFO", "message": "hi"},
+        {"level": "info"},
+        {"level": "Verbose", "message": "unknown levels are logged as info"},
+        {"message": "no level"},
+        {"level": 3, "message": 42, "correlationId": 7},
+        {"level": "error", "message": "x" * 10000},
+    ],
+)
+async def test_single_log_endpoint_accepts_loose_entries(client, entry):
+    response = await client.post("/api/logs", json=entry)
+    assert response.json() == {"success": True}
+
+
+async def test_batch_endpoint_validates_strictly(client):
+    response = await client.post("/api/logs/batch", json=[{"level": "INFO", "message": "hi"}, {"level": "info"}])
+    assert response.status_code == 200
+    assert response.json()["invalid"] == 2
@@ -0,0 +1,19 @@
+import pytest
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_profiles_are_closed_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", "")
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.5)
+    for path in ("/api/profiles", "/api/profiles/abc", "/api/profiles/abc/pstats"):
+        assert (await client.get(path)).status_code == 403
+        assert (await client.get(path, headers={"X-Profile": ""})).status_code == 403
+
+
+async def test_profiles_need_the_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", "s3cret")
+    assert (await client.get("/api/profiles")).status_code == 403
+    assert (await client.get("/api/profiles", headers={"X-Profile": "wrong"})).status_code == 403
+    assert (await client.get("/api/profiles", headers={"X-Profile": "s3cret"})).status_code == 200
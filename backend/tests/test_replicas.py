@@ -0,0 +1,39 @@
+import time
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from app.core.replicas import LAST_WRITE_HEADER, ReadYourWritesMiddleware, wrote_recently
+
+pytestmark = pytest.mark.anyio
+
+
+async def _endpoint(request: Request):
+    return JSONResponse({"sticky": wrote_recently(request)})
+
+
+@pytest.fixture
+async def sticky_client():
+    app = Starlette(routes=[Route("/items", _endpoint, methods=["GET", "POST"])])
+    transport = httpx.ASGITransport(app=ReadYourWritesMiddleware(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        yield client
+
+
+async def test_write_stamp_makes_later_reads_sticky(sticky_client):
+    write = await sticky_client.post("/items")
+    assert LAST_WRITE_HEADER in write.headers
+    assert "set-cookie" not in write.headers
+
+    read = await sticky_client.get("/items", headers={LAST_WRITE_HEADER: write.headers[LAST_WRITE_HEADER]})
+    assert read.json() == {"sticky": True}
+    assert LAST_WRITE_HEADER not in read.headers
+
+
+async def test_reads_without_a_recent_write_are_not_sticky(sticky_client):
+    assert (await sticky_client.get("/items")).json() == {"sticky": False}
+    stale = f"{time.time() - 3600:.3f}"
+    assert (await sticky_client.get("/items", headers={LAST_WRITE_HEADER: stale})).json() == {"sticky": False}
+    assert (await sticky_client.get("/items", headers={LAST_WRITE_HEADER: "soon"})).json() == {"sticky": False}
@@ -0,0 +1,73 @@
+"""
+Cold-start budget
+
+Imports the app in fresh interpreters with -X importtime. Drivers that
+load on first use must stay out of the import on every run. Wall-clock
+times depend on the machine, so the budget check only runs when
+STARTUP_BUDGET_APP_MS or STARTUP_BUDGET_TOTAL_MS is set, e.g. in CI on
+known hardware; it fails when the median self time of app modules, or of
+the whole import, exceeds its budget (measured: about 110 ms of app self
+time and 900 ms in total on one CPU). benchmarks/startup.py gives the
+full breakdown.
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+BUDGET_SET = "STARTUP_BUDGET_APP_MS" in os.environ or "STARTUP_BUDGET_TOTAL_MS" in os.environ
+APP_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_APP_MS", "300"))
+TOTAL_BUDGET_MS = float(os.getenv("STARTUP_BUDGET_TOTAL_MS", "2500"))
+RUNS = 3
+
+# Loaded on first use or only for other configurations; tests run on SQLite.
+# python-dotenv is left out: it loads whenever a developer has a .env file.
+DEFERRED_MODULES = ("asyncpg", "psycopg2", "redis", "sqlalchemy.dialects.postgresql")
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def _import_profile() -> tuple[float, dict[str, float]]:
+    """Total import time of app.main and self time per module, in ms"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=BACKEND_DIR,
+    )
+    total = 0.0
+    modules: dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        modules[name] = int(self_us) / 1000
+        if name == "app.main" and not indent:
+            total = int(cumulative_us) / 1000
+    return total, modules
+
+
+@pytest.mark.skipif(not BUDGET_SET, reason="set STARTUP_BUDGET_APP_MS or STARTUP_BUDGET_TOTAL_MS to check it")
+def test_import_stays_within_budget():
+    profiles = [_import_profile() for _ in range(RUNS)]
+    total_ms = statistics.median(total for total, _ in profiles)
+    app_ms = statistics.median(
+        sum(ms for name, ms in modules.items() if name == "app" or name.startswith("app."))
+        for _, modules in profiles
+    )
+
+    assert app_ms <= APP_BUDGET_MS, f"app modules took {app_ms:.0f} ms to import, budget {APP_BUDGET_MS:.0f} ms"
+    assert total_ms <= TOTAL_BUDGET_MS, f"import app.main took {total_ms:.0f} ms, budget {TOTAL_BUDGET_MS:.0f} ms"
+
+
+def test_deferred_modules_are_not_imported():
+    _, modules = _import_profile()
+    loaded = [name for name in modules if name.startswith(DEFERRED_MODULES)]
+    assert loaded == []
@@ -9,5 +9,6 @@ CREATE TABLE IF NOT EXISTS attendance (
     id SERIAL PRIMARY KEY,
     employee_id INT NOT NULL REFERENCES employees(id) ON DELETE CASCADE,
     date DATE NOT NULL,
-    status VARCHAR(20) NOT NULL CHECK (status IN ('Present', 'Absent'))
+    status VARCHAR(20) NOT NULL CHECK (status IN ('Present', 'Absent')),
+    CONSTRAINT unique_employee_date UNIQUE (employee_id, date)
 );
@@ -1,6 +1,8 @@
 import { AttendanceResponse } from "@/types";
 import { Employee } from "@/types";
+import { EmployeeBatch } from "@/types";
 import { AttendanceRecord } from "@/types";
+import { Page } from "@/types";
 import { apiLogger } from "./logger";
 
 // Get BASE_URL at function call time (runtime) instead of module load time
@@ -17,6 +19,11 @@ function getBaseUrl(): string {
   return url;
 }
 
+// Time of this client's last write, as stamped by the backend. Sent back on
+// every request so reads shortly after a write skip lagging read replicas;
+// a header because cross-site cookies are not sent to the API.
+let lastWrite: string | null = null;
+
 async function request<T>(endpoint: string, options: RequestInit = {}): Promise<T> {
   const BASE_URL = getBaseUrl();
   const correlationId = apiLogger.getCorrelationId();
@@ -34,9 +41,11 @@ async function request<T>(endpoint: string, options: RequestInit = {}): Promise<
       headers: {
         "Content-Type": "application/json",
         "X-Correlation-ID": correlationId,
+        ...(lastWrite ? { "X-Last-Write": lastWrite } : {}),
       },
       ...options,
     });
+    lastWrite = res.headers.get("X-Last-Write") ?? lastWrite;
 
     const duration = performance.now() - startTime;
 
@@ -102,13 +111,33 @@ export async function createEmployee(data: Omit<Employee, "id">): Promise<Employ
 }
 
 export async function listEmployees(): Promise<Employee[]> {
-  return request<Employee[]>("/employees/", { method: "GET" });
+  // Follow the keyset cursors so callers still receive the full list
+  const employees: Employee[] = [];
+  let cursor: string | null = null;
+  do {
+    const query: string = cursor ? `&after=${encodeURIComponent(cursor)}` : "";
+    const page: Page<Employee> = await request<Page<Employee>>(
+      `/employees/?limit=1000${query}`,
+      { method: "GET" }
+    );
+    employees.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return employees;
 }
 
 export async function getEmployee(id: number): Promise<Employee> {
   return request<Employee>(`/employees/${id}`, { method: "GET" });
 }
 
+// Resolves many employees in one request instead of one getEmployee per id
+export async function getEmployeesByIds(ids: number[]): Promise<EmployeeBatch> {
+  return request<EmployeeBatch>("/employees/batch", {
+    method: "POST",
+    body: JSON.stringify({ ids }),
+  });
+}
+
 export async function updateEmployee(id: number, data: Omit<Employee, "id">): Promise<Employee> {
   return request<Employee>(`/employees/${id}`, {
     method: "PUT",
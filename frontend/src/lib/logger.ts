@@ -26,6 +26,37 @@ const LOG_LEVEL_PRIORITY: Record<LogLevel, number> = {
   error: 3,
 };
 
+const LOG_BATCH_SIZE = 50;
+const LOG_FLUSH_INTERVAL_MS = 2000;
+
+let logBuffer: LogEntry[] = [];
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+
+function flushLogs(): void {
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = null;
+  }
+  if (logBuffer.length === 0) {
+    return;
+  }
+  const body = logBuffer.map((entry) => JSON.stringify(entry)).join("\n");
+  logBuffer = [];
+  fetch("/api/logs/batch", {
+    method: "POST",
+    headers: { "Content-Type": "application/x-ndjson" },
+    body,
+    keepalive: true,
+  }).catch(() => {
+    // Fail silently to not impact application
+  });
+}
+
+if (typeof window !== "undefined") {
+  // Ship whatever is buffered when the page is hidden or closed
+  window.addEventListener("pagehide", flushLogs);
+}
+
 class StructuredLogger {
   private name: string;
   private minLevel: LogLevel;
@@ -89,14 +120,13 @@ class StructuredLogger {
   }
 
   private sendToBackend(entry: LogEntry): void {
-    // Send logs asynchronously without blocking the application
-    fetch("/api/logs", {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify(entry),
-    }).catch(() => {
-      // Fail silently to not impact application
-    });
+    // Buffer logs and ship them in batches without blocking the application
+    logBuffer.push(entry);
+    if (logBuffer.length >= LOG_BATCH_SIZE) {
+      flushLogs();
+    } else if (!flushTimer) {
+      flushTimer = setTimeout(flushLogs, LOG_FLUSH_INTERVAL_MS);
+    }
   }
 
   debug(message: string, context?: Record<string, any>): void {
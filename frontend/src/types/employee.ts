@@ -4,3 +4,8 @@ export interface Employee {
   email: string;
   department: string;
 }
+
+export interface EmployeeBatch {
+  items: Employee[];
+  missing: number[];
+}
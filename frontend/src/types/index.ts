@@ -1,2 +1,3 @@
 export * from "./employee";
 export * from "./attendance";
+export * from "./common";
@@ -7,7 +7,7 @@ COMMAND=$1
 SERVICE=$2
 
 show_help() {
-  echo "Usage: ./run.sh {start|stop|restart|rebuild [service]|logs|status|help}"
+  echo "Usage: ./run.sh {start|stop|restart|rebuild [service]|logs|status|test|help}"
   echo
   echo "Commands:"
   echo "  start             Start all services in detached mode (build only if needed)"
@@ -16,6 +16,7 @@ show_help() {
   echo "  rebuild [service] Rebuild all services (or a specific service) without using cache"
   echo "  logs              Show and follow logs for all services"
   echo "  status            Show running containers and their status"
+  echo "  test              Run the backend test suite"
   echo "  help              Show this help message"
 }
 
@@ -51,6 +52,10 @@ case "$COMMAND" in
     echo "Showing container status..."
     docker-compose ps
     ;;
+  test)
+    echo "Running backend tests..."
+    (cd backend && python -m pytest)
+    ;;
   help)
     show_help
     ;;